@@ -0,0 +1,89 @@
+# anomalies.py
+import math
+import argparse
+
+# Lab values followed per user: metric (assessment_history column) ->
+# (input key, smallest change worth flagging, floor on the user's std dev).
+# The floors keep a user with near-identical past results from being flagged
+# for ordinary measurement noise.
+LAB_METRICS = {
+    'tsh_level': ('TSH_Level', 2.0, 0.5),
+    'blood_sugar': ('Blood_Sugar', 40.0, 10.0),
+}
+LAB_LABELS = {'tsh_level': 'TSH Level', 'blood_sugar': 'Blood Sugar'}
+
+EWMA_ALPHA = 0.3
+Z_THRESHOLD = 3.0
+# Past results needed before the z-score is trusted; before that any change
+# of at least the metric's minimum is flagged
+MIN_HISTORY = 3
+
+
+class LabStats:
+    """Running statistics of one user's lab metric, updated one value at a time.
+
+    Welford's algorithm keeps the mean and sum of squared deviations (m2) in
+    O(1) space; ewma tracks recent level and last_value the previous result.
+    """
+
+    __slots__ = ('n', 'mean', 'm2', 'ewma', 'last_value')
+
+    def __init__(self, n=0, mean=0.0, m2=0.0, ewma=None, last_value=None):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+        self.ewma = ewma
+        self.last_value = last_value
+
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def check(self, metric, value):
+        """An anomaly dict if value is a sharp change from this history, else None"""
+        if self.last_value is None:
+            return None
+        _, min_change, std_floor = LAB_METRICS[metric]
+        change = value - self.last_value
+        if abs(change) < min_change:
+            return None
+        zscore = (value - self.ewma) / max(self.std(), std_floor)
+        if self.n >= MIN_HISTORY and abs(zscore) < Z_THRESHOLD:
+            return None
+        return {'metric': metric, 'value': value, 'previous': self.last_value, 'change': change,
+                'expected': self.ewma, 'zscore': zscore}
+
+    def update(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        self.ewma = value if self.ewma is None else EWMA_ALPHA * value + (1 - EWMA_ALPHA) * self.ewma
+        self.last_value = value
+
+    def row(self):
+        return (self.n, self.mean, self.m2, self.ewma, self.last_value)
+
+
+def describe(anomaly):
+    """One-line description of an anomaly row or dict"""
+    direction = "up" if anomaly['change'] > 0 else "down"
+    return (f"{LAB_LABELS.get(anomaly['metric'], anomaly['metric'])} {direction} "
+            f"{abs(anomaly['change']):.1f} to {anomaly['value']:g} (usual ~{anomaly['expected']:.1f})")
+
+
+if __name__ == "__main__":
+    from database import get_db
+
+    parser = argparse.ArgumentParser(description="Per-user lab value statistics and change alerts")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Rebuild running statistics and alerts from the full assessment history")
+    parser.add_argument("--recent", type=int, default=20, help="Print this many recent alerts")
+    args = parser.parse_args()
+
+    db = get_db()
+    if args.backfill:
+        summary = db.rebuild_lab_stats()
+        print(f"Replayed {sum(s['assessments'] for s in summary)} assessment(s): "
+              f"{sum(s['users'] for s in summary)} user(s), {sum(s['anomalies'] for s in summary)} alert(s)")
+    for anomaly in db.get_recent_anomalies(args.recent):
+        print(f"{anomaly['created_at']}  {anomaly['username']:<16} {describe(anomaly)}")
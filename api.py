@@ -0,0 +1,278 @@
+# api.py
+import asyncio
+import argparse
+import contextlib
+import uuid
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from utils.model import HealthPredictor
+from utils.assessment import build_assessment, get_recommended_specialists
+from utils.explanations import explain_batch, top_factors
+from database import get_db
+
+REQUIRED_FIELDS = ['Age', 'BMI', 'TSH_Level', 'Blood_Sugar']
+SYMPTOM_FIELDS = [
+    'Irregular_Periods', 'Excess_Hair_Growth', 'Acne', 'Tiredness',
+    'Hair_Fall', 'Frequent_Urination', 'Family_Diabetes'
+]
+MAX_BATCH_RECORDS = 10000
+# The API is unauthenticated, so persisted rows are never attributed to a
+# caller-chosen account; they all go under this service user
+API_USERNAME = 'api'
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-record requests into one vectorised scoring call"""
+
+    def __init__(self, score_fn, max_batch_size=256, max_wait_ms=2):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.records = 0
+
+    async def submit(self, record):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            # Under load the queue already holds more work; otherwise wait
+            # briefly for stragglers before scoring a small batch
+            while len(batch) < self.max_batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            records = [record for record, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.score_fn, records)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.records += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class AssessmentWriter:
+    """Persists scored assessments to assessment_history, coalescing concurrent requests into one write"""
+
+    def __init__(self, database, max_batch_size=500):
+        self.db = database
+        self.max_batch_size = max_batch_size
+        self.queue = asyncio.Queue()
+
+    def enqueue(self, username, assessment):
+        """Queue one assessment; the returned future resolves to its (id, created)"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((username, assessment, future))
+        return future
+
+    async def write(self, batch):
+        loop = asyncio.get_running_loop()
+        items = [(username, assessment) for username, assessment, _ in batch]
+        results = await loop.run_in_executor(None, self.db.save_assessments, items)
+        for index, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if results is None:
+                future.set_exception(RuntimeError("Could not save assessments"))
+            else:
+                future.set_result(results[index])
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            await self.write(batch)
+
+    async def drain(self):
+        batch = []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        if batch:
+            await self.write(batch)
+
+
+def validate_record(record):
+    """Normalise one JSON record into predictor input; raises ValueError if invalid"""
+    if not isinstance(record, dict):
+        raise ValueError("Each record must be a JSON object")
+
+    missing = [field for field in REQUIRED_FIELDS if field not in record]
+    if missing:
+        raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+
+    try:
+        input_data = {field: float(record[field]) for field in REQUIRED_FIELDS}
+        input_data['Age'] = int(record['Age'])
+        for field in SYMPTOM_FIELDS:
+            input_data[field] = int(bool(record.get(field, 0)))
+    except (TypeError, ValueError):
+        raise ValueError("Age, BMI, TSH_Level and Blood_Sugar must be numeric")
+
+    return input_data
+
+
+def record_id(record):
+    """The client's optional record_id, which makes a retried record idempotent"""
+    value = record.get('record_id')
+    return str(value) if value not in (None, '') else None
+
+
+class ScoringService:
+    def __init__(self, persist=False, database=None, max_batch_size=256, max_wait_ms=2, service_user=API_USERNAME):
+        self.service_user = service_user
+        self.predictor = HealthPredictor()
+        self.batcher = MicroBatcher(self.score_records, max_batch_size, max_wait_ms)
+        self.writer = AssessmentWriter(database or get_db()) if persist else None
+
+    def score_records(self, records, explain=False):
+        """Score already-validated records in one vectorised predictor call"""
+        inputs = [input_data for _, input_data in records]
+        predictions = self.predictor.predict_batch(inputs)
+        explanation = explain_batch(self.predictor, inputs) if explain else None
+
+        results = []
+        for i, (name, input_data) in enumerate(records):
+            row_predictions = {key: float(values[i]) for key, values in predictions.items()}
+            assessment = build_assessment(name, input_data, row_predictions)
+            assessment['specialists'] = get_recommended_specialists(row_predictions)
+            if explanation:
+                assessment['explanation'] = {
+                    risk: dict(factors) for risk, factors in top_factors(explanation, i).items()
+                }
+            results.append(assessment)
+        return results
+
+    async def persist(self, results, record_ids):
+        """Save results under the service user and mark each with its assessment_id and duplicate flag.
+
+        Every API row shares the service user, so an assessment is keyed on the
+        client's record_id (or a fresh id) rather than on its inputs: identical
+        vitals from different patients are both kept, and only a retried
+        record_id comes back as a duplicate.
+        """
+        if not self.writer:
+            return
+        futures = [
+            self.writer.enqueue(self.service_user, dict(assessment, submission_id=client_id or uuid.uuid4().hex))
+            for assessment, client_id in zip(results, record_ids)
+        ]
+        for assessment, (assessment_id, created) in zip(results, await asyncio.gather(*futures)):
+            assessment['assessment_id'] = assessment_id
+            assessment['duplicate'] = not created
+
+    async def assess(self, request):
+        try:
+            body = await request.json()
+            input_data = validate_record(body)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+
+        result = await self.batcher.submit((body.get('name', ''), input_data))
+        try:
+            await self.persist([result], [record_id(body)])
+        except RuntimeError as e:
+            return JSONResponse({'error': str(e)}, status_code=500)
+        return JSONResponse(result)
+
+    async def assess_batch(self, request):
+        try:
+            body = await request.json()
+            records = body.get('records') if isinstance(body, dict) else body
+            if not isinstance(records, list) or not records:
+                raise ValueError("Expected a non-empty list of records")
+            if len(records) > MAX_BATCH_RECORDS:
+                raise ValueError(f"At most {MAX_BATCH_RECORDS} records per batch")
+            validated = [validate_record(record) for record in records]
+            inputs = [(record.get('name', ''), input_data) for record, input_data in zip(records, validated)]
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+
+        loop = asyncio.get_running_loop()
+        explain = isinstance(body, dict) and bool(body.get('explain', False))
+        results = await loop.run_in_executor(None, self.score_records, inputs, explain)
+        try:
+            await self.persist(results, [record_id(record) for record in records])
+        except RuntimeError as e:
+            return JSONResponse({'error': str(e)}, status_code=500)
+
+        response = {'count': len(results), 'results': results}
+        if self.writer:
+            response['duplicates'] = sum(result['duplicate'] for result in results)
+        return JSONResponse(response)
+
+    async def health(self, request):
+        batches = self.batcher.batches
+        return JSONResponse({
+            'status': 'ok',
+            'micro_batches': batches,
+            'mean_batch_size': round(self.batcher.records / batches, 2) if batches else 0,
+            'pending_writes': self.writer.queue.qsize() if self.writer else 0,
+        })
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        tasks = [asyncio.create_task(self.batcher.run())]
+        if self.writer:
+            tasks.append(asyncio.create_task(self.writer.run()))
+        try:
+            yield
+        finally:
+            for task in tasks:
+                task.cancel()
+            if self.writer:
+                await self.writer.drain()
+
+
+def create_app(persist=False, database=None, max_batch_size=256, max_wait_ms=2, service_user=API_USERNAME):
+    service = ScoringService(persist, database, max_batch_size, max_wait_ms, service_user)
+    return Starlette(
+        routes=[
+            Route('/assess', service.assess, methods=['POST']),
+            Route('/assess/batch', service.assess_batch, methods=['POST']),
+            Route('/health', service.health, methods=['GET']),
+        ],
+        lifespan=service.lifespan,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Medwise-Women batch scoring API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--persist", action="store_true",
+                        help="Save scored assessments to assessment_history")
+    parser.add_argument("--service-user", default=API_USERNAME,
+                        help="Account that persisted assessments are saved under")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2)
+    args = parser.parse_args()
+
+    app = create_app(args.persist, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+                     service_user=args.service_user)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,72 @@
+# benchmarks/active_users_benchmark.py
+"""Active-user counts: merged daily HyperLogLog sketches vs exact COUNT(DISTINCT) over login rows.
+
+    python benchmarks/active_users_benchmark.py --users 50000 --logins-per-day 20000 --days 90
+
+Fills a scratch database with synthetic logins spread over the last
+--days days, builds the daily sketches from them, then times 1/7/30/90-day
+active-user counts both ways and reports the estimate's error.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase, ACTIVE_WINDOWS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--logins-per-day", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    workdir = tempfile.mkdtemp()
+    db = UserDatabase(os.path.join(workdir, "bench.db"))
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    conn = db.connect()
+    for day in range(args.days):
+        # Zipf-like activity: a few heavy users, a long tail
+        users = np.minimum(rng.zipf(1.3, args.logins_per_day), args.users) - 1
+        seconds = rng.integers(0, 86400, args.logins_per_day)
+        conn.executemany(
+            "INSERT INTO login_history (username, login_time) VALUES (?, ?)",
+            [(f"user{u}", (today - timedelta(days=day) + timedelta(seconds=int(s))).strftime("%Y-%m-%d %H:%M:%S"))
+             for u, s in zip(users, seconds)]
+        )
+    conn.commit()
+    conn.close()
+    start = time.perf_counter()
+    db.rebuild_login_sketches()
+    print(f"{args.days * args.logins_per_day:,} logins; built daily sketches in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    for i in range(500):
+        db.log_login(f"user{i}")
+    print(f"log_login incl. sketch update: {(time.perf_counter() - start) / 500 * 1000:.2f} ms")
+
+    print(f"{'window':>8} {'exact':>9} {'estimate':>9} {'error':>7} {'exact time':>11} {'sketch time':>12}")
+    for days in ACTIVE_WINDOWS:
+        start = time.perf_counter()
+        exact = db.get_active_users(days, exact=True)
+        exact_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        estimate = db.get_active_users(days)
+        sketch_ms = (time.perf_counter() - start) * 1000
+        print(f"{days:>6} d {exact:>9,} {estimate:>9,} {(estimate / exact - 1) * 100:6.2f}% "
+              f"{exact_ms:8.1f} ms {sketch_ms:9.1f} ms")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/api_load_test.py
+"""Local load test for the scoring API.
+
+Start the API first (``python api.py``), then run::
+
+    python benchmarks/api_load_test.py --concurrency 32 --requests 20000
+"""
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+import numpy as np
+
+
+def random_record():
+    return {
+        'name': 'Load Test',
+        'Age': random.randint(16, 70),
+        'BMI': round(random.uniform(15, 40), 1),
+        'TSH_Level': round(random.uniform(0.1, 8), 2),
+        'Blood_Sugar': random.randint(60, 250),
+        'Irregular_Periods': random.randint(0, 1),
+        'Excess_Hair_Growth': random.randint(0, 1),
+        'Acne': random.randint(0, 1),
+        'Tiredness': random.randint(0, 1),
+        'Hair_Fall': random.randint(0, 1),
+        'Frequent_Urination': random.randint(0, 1),
+        'Family_Diabetes': random.randint(0, 1),
+    }
+
+
+def worker(host, port, path, payloads, latencies, errors):
+    conn = http.client.HTTPConnection(host, port)
+    headers = {'Content-Type': 'application/json'}
+    for payload in payloads:
+        start = time.perf_counter()
+        try:
+            conn.request('POST', path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (http.client.HTTPException, OSError) as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(host, port)
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="Records per request against /assess/batch; 0 uses single /assess")
+    args = parser.parse_args()
+
+    if args.batch_size:
+        path = '/assess/batch'
+        make_payload = lambda: json.dumps({'records': [random_record() for _ in range(args.batch_size)]})
+    else:
+        path = '/assess'
+        make_payload = lambda: json.dumps(random_record())
+
+    per_worker = args.requests // args.concurrency
+    payloads = [[make_payload() for _ in range(per_worker)] for _ in range(args.concurrency)]
+    latencies, errors = [], []
+
+    threads = [
+        threading.Thread(target=worker, args=(args.host, args.port, path, chunk, latencies, errors))
+        for chunk in payloads
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.array(latencies) * 1000
+    total = len(latencies)
+    print(f"{path}: {total} requests, concurrency {args.concurrency}, {len(errors)} error(s)")
+    print(f"  throughput: {total / elapsed:,.0f} requests/s", end="")
+    if args.batch_size:
+        print(f" ({total * args.batch_size / elapsed:,.0f} records/s)")
+    else:
+        print()
+    print(f"  latency ms: p50 {np.percentile(lat_ms, 50):.2f}  p90 {np.percentile(lat_ms, 90):.2f}  "
+          f"p99 {np.percentile(lat_ms, 99):.2f}  max {lat_ms.max():.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/assessment_record_benchmark.py
+"""Memory and construction time of assessment rows as nested dicts vs Assessment records.
+
+    python benchmarks/assessment_record_benchmark.py --records 1000000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from records import ASSESSMENT_COLUMNS, Assessment, assessment_row_factory
+
+
+def make_rows(count):
+    rng = random.Random(7)
+    diseases = ['PCOS', 'Thyroid', 'Diabetes']
+    risks = ['Low', 'Medium', 'High']
+    return [
+        (i, 'bench', 'bench', rng.randint(18, 60), round(rng.uniform(16, 40), 1),
+         round(rng.uniform(0.1, 10), 2), float(rng.randint(70, 250)),
+         *(rng.randint(0, 1) for _ in range(7)),
+         rng.random(), rng.random(), rng.random(),
+         rng.choice(risks), rng.choice(diseases), rng.uniform(0, 100), '2025-01-01 00:00:00')
+        for i in range(count)
+    ]
+
+
+def legacy_row(row):
+    """The previous get_user_assessments shape: flat columns plus nested copies"""
+    a = dict(zip(ASSESSMENT_COLUMNS, row))
+    a['input_data'] = {
+        'Age': a['age'], 'BMI': a['bmi'], 'TSH_Level': a['tsh_level'], 'Blood_Sugar': a['blood_sugar'],
+        'Irregular_Periods': a['irregular_periods'], 'Excess_Hair_Growth': a['excess_hair_growth'],
+        'Acne': a['acne'], 'Tiredness': a['tiredness'], 'Hair_Fall': a['hair_fall'],
+        'Frequent_Urination': a['frequent_urination'], 'Family_Diabetes': a['family_diabetes']
+    }
+    a['predictions'] = {'pcos_risk': a['pcos_risk'], 'thyroid_risk': a['thyroid_risk'],
+                        'diabetes_risk': a['diabetes_risk']}
+    a['disease_diagnosis'] = {'primary_disease': a['primary_disease'], 'confidence': a['confidence']}
+    return a
+
+
+def measure(label, build, rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = [build(row) for row in rows]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {elapsed:8.2f} s  {size / 1e6:10.1f} MB  {size / len(rows):8.0f} B/record")
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1000000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.records)
+    print(f"{args.records} records (row tuples themselves excluded)")
+    legacy = measure("nested dict", legacy_row, rows)
+    del legacy
+    records = measure("Assessment", lambda row: assessment_row_factory(None, row), rows)
+
+    assert isinstance(records[0], Assessment)
+    assert records[-1].predictions['pcos_risk'] == rows[-1][14]
+
+
+if __name__ == "__main__":
+    main()
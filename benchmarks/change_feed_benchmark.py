@@ -0,0 +1,86 @@
+# benchmarks/change_feed_benchmark.py
+"""Finding new assessments: change-feed poll vs a full-table scan, as the table grows.
+
+    python benchmarks/change_feed_benchmark.py --sizes 10000 100000 500000 --new 100
+
+Each round adds rows to a scratch database, then 'new' fresh assessments,
+and times how long a reporting consumer takes to find just those.
+"""
+import os
+import sys
+import time
+import shutil
+import itertools
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase
+from utils.change_feed import ChangeFeedConsumer
+
+INPUT = {
+    'Age': 30, 'BMI': 27.0, 'TSH_Level': 4.2, 'Blood_Sugar': 118.0, 'Irregular_Periods': 1,
+    'Excess_Hair_Growth': 0, 'Acne': 1, 'Tiredness': 1, 'Hair_Fall': 0,
+    'Frequent_Urination': 0, 'Family_Diabetes': 1
+}
+ASSESSMENT = {
+    'name': 'bench', 'input_data': INPUT, 'overall_risk': 'Medium',
+    'predictions': {'pcos_risk': 0.7, 'thyroid_risk': 0.3, 'diabetes_risk': 0.4},
+    'disease_diagnosis': {'primary_disease': 'PCOS', 'confidence': 70.0},
+}
+
+# Saves are idempotent per (user, inputs, time bucket), so every benchmark row gets distinct inputs
+SEQUENCE = itertools.count()
+
+
+def assessment():
+    return dict(ASSESSMENT, input_data=dict(INPUT, BMI=18.0 + next(SEQUENCE) * 1e-5))
+
+
+def full_scan_new_ids(db, seen):
+    """What polling without a feed does: read every id and diff against those already seen"""
+    conn = db.connect()
+    ids = {row[0] for row in conn.execute("SELECT id FROM assessment_history")}
+    conn.close()
+    return ids - seen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs='+', default=[10000, 100000, 500000])
+    parser.add_argument("--new", type=int, default=100)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    db = UserDatabase(os.path.join(workdir, "bench.db"))
+    consumer = ChangeFeedConsumer("benchmark", db, batch_size=args.new)
+    seen = set()
+
+    print(f"{'table rows':>12} {'full scan':>12} {'feed poll':>12}")
+    for size in args.sizes:
+        existing = len(seen)
+        db.save_assessments([(f"user{i % 500}", assessment()) for i in range(size - existing)])
+        seen = full_scan_new_ids(db, set())
+        consumer.run(lambda events: None, once=True)
+
+        db.save_assessments([(f"user{i}", assessment()) for i in range(args.new)])
+
+        start = time.perf_counter()
+        new_ids = full_scan_new_ids(db, seen)
+        scan_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        events = consumer.poll()
+        consumer.commit()
+        poll_ms = (time.perf_counter() - start) * 1000
+
+        assert {event['assessment_id'] for event in events} == new_ids
+        seen |= new_ids
+        print(f"{size + args.new:>12,} {scan_ms:9.2f} ms {poll_ms:9.2f} ms")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
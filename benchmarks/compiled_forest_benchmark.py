@@ -0,0 +1,79 @@
+# benchmarks/compiled_forest_benchmark.py
+"""Forest scoring: sklearn predict_proba vs compiled flat node arrays.
+
+    python benchmarks/compiled_forest_benchmark.py --n-estimators 100 --max-depth 10
+
+Fits TrainedHealthPredictor on the bundled labelled data, compiles it, checks
+the two agree within 1e-9 on random inputs (some with missing values) and
+times both, per single-patient predict() and per batch.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from utils.model import TrainedHealthPredictor
+from utils.evaluation import load_labelled_data
+
+TOLERANCE = 1e-9
+
+
+def random_inputs(features, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    ranges = {'Age': (16, 80), 'BMI': (15, 45), 'TSH_Level': (0.1, 10), 'Blood_Sugar': (60, 300)}
+    return np.column_stack([
+        rng.uniform(*ranges[feature], rows) if feature in ranges else rng.integers(0, 2, rows)
+        for feature in features
+    ]).astype(float)
+
+
+def median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    trained = TrainedHealthPredictor(n_estimators=args.n_estimators, max_depth=args.max_depth, n_jobs=1)
+    trained.fit(load_labelled_data(os.path.join(ROOT, "data", "doctor_patient.csv")))
+    compiled = trained.compile()
+
+    X = random_inputs(trained.features, 50000)
+    # Rows with missing values must take the same branches sklearn learned for them
+    with_missing = X[:1000].copy()
+    with_missing[np.random.default_rng(1).random(with_missing.shape) < 0.2] = np.nan
+    checked = np.vstack([X, with_missing, np.full((1, X.shape[1]), np.nan)])
+    expected, actual = trained.predict_matrix(checked), compiled.predict_matrix(checked)
+    max_error = max(np.abs(expected[key] - actual[key]).max() for key in expected)
+    print(f"{args.n_estimators} trees, depth {args.max_depth}: max |sklearn - compiled| = {max_error:.2e}")
+    if max_error > TOLERANCE:
+        raise SystemExit(f"Compiled forest differs from sklearn by more than {TOLERANCE}")
+
+    row = dict(zip(trained.features, X[0]))
+    print(f"\n{'case':<22} {'sklearn':>12} {'compiled':>12} {'speedup':>9}")
+    cases = [('single patient', lambda p: p.predict(row), args.repeats)]
+    for size in (100, 10000):
+        cases.append((f'batch of {size:,}', lambda p, batch=X[:size]: p.predict_matrix(batch),
+                      max(args.repeats // 20, 3)))
+    for name, call, repeats in cases:
+        slow = median_ms(lambda: call(trained), repeats)
+        fast = median_ms(lambda: call(compiled), repeats)
+        print(f"{name:<22} {slow:9.3f} ms {fast:9.3f} ms {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/doctor_loader_benchmark.py
+"""Bulk doctor-directory loads: a first import, an unchanged re-import and a partial refresh.
+
+    python benchmarks/doctor_loader_benchmark.py --doctors 100000 --changed 0.1
+
+Writes a synthetic CSV in the doctor_patient.csv layout (DoctorName,
+HospitalName, HospitalLocation, Recommended_Specialist) plus rating and
+contact, with some rows repeated, and loads it into a scratch database.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase
+from utils.doctor_loader import load_doctors
+
+SPECIALTIES = ['General Physician', 'Gynecologist', 'Endocrinologist', 'Diabetologist', 'Dermatologist']
+CITIES = ['Chennai', 'Madurai', 'Coimbatore', 'Tiruchirappalli', 'Salem', 'Vellore', 'Erode', 'Tirunelveli']
+
+
+def synthetic_directory(count, rng):
+    ids = np.arange(count)
+    return pd.DataFrame({
+        'DoctorName': [f"Dr. Doctor {i}" for i in ids],
+        'Recommended_Specialist': np.array(SPECIALTIES)[ids % len(SPECIALTIES)],
+        'HospitalName': [f"Hospital {i % 2000}" for i in ids],
+        'HospitalLocation': np.array(CITIES)[ids % len(CITIES)],
+        'Rating': rng.uniform(3.5, 5.0, count).round(1),
+        'Contact': [f"+91-{9000000000 + i}" for i in ids],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--doctors", type=int, default=100000)
+    parser.add_argument("--repeats", type=float, default=0.05, help="Share of rows repeated in the file")
+    parser.add_argument("--changed", type=float, default=0.1, help="Share of ratings changed for the refresh")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    workdir = tempfile.mkdtemp()
+    db = UserDatabase(os.path.join(workdir, "bench.db"))
+    directory = synthetic_directory(args.doctors, rng)
+    repeated = directory.sample(frac=args.repeats, random_state=0)
+    csv_path = os.path.join(workdir, "doctors.csv")
+    pd.concat([directory, repeated]).to_csv(csv_path, index=False)
+
+    refreshed = directory.copy()
+    changed = refreshed.sample(frac=args.changed, random_state=1).index
+    refreshed.loc[changed, 'Rating'] = (refreshed.loc[changed, 'Rating'] - 0.1).round(1)
+    refresh_path = os.path.join(workdir, "refresh.csv")
+    refreshed.to_csv(refresh_path, index=False)
+
+    print(f"{'load':<12} {'rows':>9} {'inserted':>9} {'updated':>9} {'skipped':>9} {'seconds':>9}")
+    for label, path in [('first', csv_path), ('unchanged', csv_path), ('refresh', refresh_path)]:
+        start = time.perf_counter()
+        summary = load_doctors(path, db)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {summary['rows']:>9,} {summary['inserted']:>9,} {summary['updated']:>9,} "
+              f"{summary['skipped']:>9,} {elapsed:>9.2f}")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
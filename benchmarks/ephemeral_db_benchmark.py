@@ -0,0 +1,85 @@
+# benchmarks/ephemeral_db_benchmark.py
+"""Setting up a throwaway database: fresh file, copied file, in-memory, and in-memory seeded from a snapshot.
+
+    python benchmarks/ephemeral_db_benchmark.py --setups 20 --assessments 5000
+
+Times how long each kind of scratch database takes to become usable, then
+save_assessment throughput on a file against memory. The seed snapshot is
+built once with --assessments rows of history.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase, open_database
+
+INPUT = {
+    'Age': 30, 'BMI': 27.0, 'TSH_Level': 4.2, 'Blood_Sugar': 118.0, 'Irregular_Periods': 1,
+    'Excess_Hair_Growth': 0, 'Acne': 1, 'Tiredness': 1, 'Hair_Fall': 0,
+    'Frequent_Urination': 0, 'Family_Diabetes': 1
+}
+ASSESSMENT = {
+    'name': 'bench', 'input_data': INPUT, 'overall_risk': 'Medium',
+    'predictions': {'pcos_risk': 0.7, 'thyroid_risk': 0.3, 'diabetes_risk': 0.4},
+    'disease_diagnosis': {'primary_disease': 'PCOS', 'confidence': 70.0},
+}
+
+
+def assessment(i):
+    # Saves are idempotent per (user, inputs, time bucket), so each row gets distinct inputs
+    return dict(ASSESSMENT, input_data=dict(INPUT, BMI=18.0 + i * 1e-5))
+
+
+def timed(setup, setups):
+    times = []
+    for i in range(setups):
+        start = time.perf_counter()
+        setup(i)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--setups", type=int, default=20)
+    parser.add_argument("--assessments", type=int, default=5000, help="History rows in the seed snapshot")
+    parser.add_argument("--writes", type=int, default=1000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    seed = os.path.join(workdir, "seed.db")
+    UserDatabase(seed).save_assessments([(f"user{i % 200}", assessment(i)) for i in range(args.assessments)])
+
+    def copied_file(i):
+        path = os.path.join(workdir, f"copy-{i}.db")
+        shutil.copy(seed, path)
+        UserDatabase(path)
+
+    print(f"{'setup':<34} {'median':>10}")
+    for label, setup in [
+        ("fresh file (schema + seed data)", lambda i: UserDatabase(os.path.join(workdir, f"fresh-{i}.db"))),
+        (f"copied snapshot file ({args.assessments} rows)", copied_file),
+        ("fresh :memory:", lambda i: open_database(":memory:")),
+        (f"seeded :memory: ({args.assessments} rows)", lambda i: open_database(":memory:", seed=seed)),
+    ]:
+        print(f"{label:<34} {timed(setup, args.setups):7.2f} ms")
+
+    print(f"\n{'save_assessment':<34} {'per write':>10}")
+    for label, db in [("file", UserDatabase(os.path.join(workdir, "writes.db"))),
+                      ("memory", open_database(":memory:"))]:
+        start = time.perf_counter()
+        for i in range(args.writes):
+            db.save_assessment(f"user{i % 200}", assessment(i))
+        print(f"{label:<34} {(time.perf_counter() - start) / args.writes * 1000:7.3f} ms")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
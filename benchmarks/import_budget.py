@@ -0,0 +1,101 @@
+# benchmarks/import_budget.py
+"""Cold-start import budget, measured with ``python -X importtime``.
+
+    python benchmarks/import_budget.py --runs 5
+
+Each entry point is imported in a fresh interpreter from an empty working
+directory, and the interpreter's own startup imports (``python -c pass``) are
+subtracted. The check fails (exit status 1) if an import is over its time
+budget, pulls in a module it should load lazily, or leaves files behind.
+tests/test_import_budget.py runs the same check under pytest.
+"""
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# module -> (budget in ms above interpreter startup, modules that must not be
+# imported eagerly). Budgets leave two to four times the measured time, so
+# machine noise does not fail the check but a new heavy dependency does.
+# Streamlit itself loads numpy and plotly.graph_objects (whose figure classes
+# are lazy), so the app only forbids plotly.express
+BUDGETS = {
+    'database': (100, ['streamlit', 'pandas', 'numpy']),
+    'utils.assessment': (50, ['pandas', 'numpy']),
+    'utils.model': (150, ['sklearn', 'pandas']),
+    'api': (400, ['sklearn', 'streamlit', 'pandas']),
+    'app': (1000, ['sklearn', 'pandas', 'plotly.express', 'streamlit_option_menu',
+                  'utils.model', 'utils.cohort', 'utils.snapshots']),
+}
+
+
+def import_profile(module, workdir):
+    """Total import time in ms and the set of modules loaded by `import module` (None: startup only)"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    code = f"import {module}" if module else "pass"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    total_us = 0
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        loaded.add(name.strip())
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, loaded
+
+
+def check_budgets(runs=5, report=print):
+    """Measure every entry point against its budget; returns the list of failures"""
+    with tempfile.TemporaryDirectory() as workdir:
+        startup_ms = min(import_profile(None, workdir)[0] for _ in range(runs))
+
+    failures = []
+    report(f"{'module':<18} {'import':>10} {'budget':>10}   (interpreter startup {startup_ms:.0f} ms excluded)")
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        with tempfile.TemporaryDirectory() as workdir:
+            profiles = [import_profile(module, workdir) for _ in range(runs)]
+            leftovers = os.listdir(workdir)
+
+        best_ms = max(min(ms for ms, _ in profiles) - startup_ms, 0)
+        loaded = profiles[0][1]
+        eager = [name for name in forbidden if name in loaded]
+
+        problems = []
+        if best_ms > budget_ms:
+            problems.append(f"{best_ms:.0f} ms > {budget_ms} ms")
+        if eager:
+            problems.append(f"imports {', '.join(eager)} at module load")
+        if leftovers:
+            problems.append(f"created {', '.join(sorted(leftovers))} on import")
+        failures.extend(f"{module}: {problem}" for problem in problems)
+        status = "ok" if not problems else "FAIL"
+        report(f"{module:<18} {best_ms:7.0f} ms {budget_ms:7d} ms  {status}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Best of N fresh interpreters")
+    args = parser.parse_args()
+
+    failures = check_budgets(args.runs)
+    if failures:
+        print("\nImport budget exceeded:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
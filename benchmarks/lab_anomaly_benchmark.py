@@ -0,0 +1,86 @@
+# benchmarks/lab_anomaly_benchmark.py
+"""Lab-value change alerts: running per-user stats at write time vs re-reading the user's history.
+
+    python benchmarks/lab_anomaly_benchmark.py --users 2000 --per-user 50
+
+Fills a scratch database with users whose TSH and blood sugar drift with
+occasional jumps, backfills the running statistics, then times saving one
+more assessment with the O(1) stats update against the query a history-based
+check would need on each save.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase
+from anomalies import LAB_METRICS
+
+
+def assessment(tsh, blood_sugar):
+    return {
+        'name': 'bench',
+        'input_data': {
+            'Age': 30, 'BMI': 25.0, 'TSH_Level': float(tsh), 'Blood_Sugar': float(blood_sugar),
+            'Irregular_Periods': 0, 'Excess_Hair_Growth': 0, 'Acne': 0, 'Tiredness': 0, 'Hair_Fall': 0,
+            'Frequent_Urination': 0, 'Family_Diabetes': 0
+        },
+        'overall_risk': 'Low',
+        'predictions': {'pcos_risk': 0.1, 'thyroid_risk': 0.1, 'diabetes_risk': 0.1},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--per-user", type=int, default=50)
+    parser.add_argument("--jump-rate", type=float, default=0.01, help="Chance a result jumps sharply")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    workdir = tempfile.mkdtemp()
+    db = UserDatabase(os.path.join(workdir, "bench.db"))
+
+    items, jumps = [], 0
+    for user in range(args.users):
+        tsh_jumps = rng.random(args.per_user) < args.jump_rate
+        sugar_jumps = rng.random(args.per_user) < args.jump_rate
+        jumps += int(tsh_jumps[1:].sum() + sugar_jumps[1:].sum())
+        tsh = rng.normal(2.5, 0.4, args.per_user) + tsh_jumps * 5
+        sugar = rng.normal(100, 8, args.per_user) + sugar_jumps * 90
+        items.extend((f"user{user}", assessment(t, s)) for t, s in zip(tsh.round(2), sugar.round()))
+    db.save_assessments(items)
+
+    start = time.perf_counter()
+    summary = db.rebuild_lab_stats()[0]
+    print(f"Backfilled {summary['assessments']:,} assessments for {summary['users']:,} users in "
+          f"{time.perf_counter() - start:.2f} s; {summary['anomalies']:,} alert(s) "
+          f"for {jumps:,} injected jumps")
+
+    probes = [f"user{i}" for i in rng.choice(args.users, 200)]
+    start = time.perf_counter()
+    for i, username in enumerate(probes):
+        db.save_assessment(username, assessment(2.5 + i * 1e-3, 100))
+    save_ms = (time.perf_counter() - start) / len(probes) * 1000
+
+    conn = db.connect()
+    start = time.perf_counter()
+    for username in probes:
+        conn.execute(f"SELECT {', '.join(LAB_METRICS)} FROM assessment_history WHERE username = ? ORDER BY id",
+                     (username,)).fetchall()
+    history_ms = (time.perf_counter() - start) / len(probes) * 1000
+    conn.close()
+
+    print(f"save_assessment incl. stats update and check: {save_ms:.2f} ms")
+    print(f"re-reading the user's history instead (query only, no index on username): {history_ms:.2f} ms")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
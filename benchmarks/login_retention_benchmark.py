@@ -0,0 +1,93 @@
+# benchmarks/login_retention_benchmark.py
+"""Database size and analytics latency before and after login retention.
+
+Generates a synthetic login history spread over two years, then runs the
+retention job::
+
+    python benchmarks/login_retention_benchmark.py --users 500 --logins 1000000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase
+from utils.retention import LoginRetention, database_size
+
+LEGACY_LAST_LOGIN = "SELECT username, (SELECT MAX(login_time) FROM login_history h WHERE h.username = u.username) FROM users u"
+LEGACY_ACTIVE_USERS = "SELECT COUNT(DISTINCT username) FROM login_history WHERE login_time >= datetime('now','-30 days')"
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def populate(database, users, logins, days):
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    usernames = [f"user{i}" for i in range(users)]
+
+    conn = database.connect()
+    conn.executemany("INSERT INTO users (username, password_hash) VALUES (?, 'x')", [(u,) for u in usernames])
+    conn.commit()
+    conn.close()
+
+    rows = [
+        (rng.choice(usernames), (now - timedelta(seconds=rng.uniform(0, days * 86400))).strftime("%Y-%m-%d %H:%M:%S"))
+        for _ in range(logins)
+    ]
+    rows.sort(key=lambda row: row[1])
+    conn = database.connect()
+    conn.executemany("INSERT INTO login_history (username, login_time) VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def legacy_analytics(conn):
+    conn.execute("SELECT COUNT(*) FROM login_history").fetchone()
+    conn.execute(LEGACY_ACTIVE_USERS).fetchone()
+    conn.execute(LEGACY_LAST_LOGIN).fetchall()
+
+
+def report(label, database, legacy):
+    conn = database.connect()
+    size = database_size(conn)
+    raw_rows = conn.execute("SELECT COUNT(*) FROM login_history").fetchone()[0]
+    if legacy:
+        # What get_analytics ran before: full count, distinct scan and a per-user MAX subquery
+        latency = timed(lambda: legacy_analytics(conn), repeat=1)
+    else:
+        latency = timed(database.get_analytics)
+    conn.close()
+    print(f"{label:>7}: {size / 1e6:7.2f} MB, {raw_rows:>9,} raw login rows, login analytics {latency:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--logins", type=int, default=1000000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--retention-days", type=int, default=90)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = UserDatabase(os.path.join(directory, "retention.db"))
+        populate(database, args.users, args.logins, args.days)
+        report("before", database, legacy=True)
+
+        start = time.perf_counter()
+        summary = LoginRetention(database, retention_days=args.retention_days, pause_seconds=0).run()
+        elapsed = time.perf_counter() - start
+        print(f"retention: folded {summary['folded']:,} rows and released {summary['pages_released']:,} pages in {elapsed:.1f}s")
+
+        report("after", database, legacy=False)
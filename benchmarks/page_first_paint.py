@@ -0,0 +1,102 @@
+# benchmarks/page_first_paint.py
+"""Per-page time to first paint, cold (fresh process) and warm (rerun).
+
+    python benchmarks/page_first_paint.py --reruns 5
+
+Each page runs in its own interpreter through AppTest. First paint is the
+time from the start of the script run until the page sends its first element;
+cold runs include importing the page module and whatever it pulls in.
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from views import PAGES
+
+SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+marks = {{}}
+ctx = get_script_run_ctx()
+send = ctx._enqueue
+
+def enqueue(msg):
+    if 'page' in marks and 'first_paint' not in marks and msg.HasField('delta'):
+        marks['first_paint'] = time.perf_counter()
+    send(msg)
+
+ctx._enqueue = enqueue
+
+from app import MedwiseApp
+from views import render_page
+
+st.session_state.authenticated = True
+st.session_state.current_user = 'admin'
+app = MedwiseApp()
+app.sidebar()
+marks['page'] = time.perf_counter()
+render_page({page!r}, app)
+end = time.perf_counter()
+st.session_state.setdefault('_runs', []).append(
+    {{'first_paint': marks.get('first_paint', end) - start, 'render': end - start}})
+"""
+
+RUNNER = """
+import sys
+import json
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_string(sys.argv[1], default_timeout=120)
+for _ in range(int(sys.argv[2]) + 1):
+    at.run()
+    if at.exception:
+        raise SystemExit(at.exception[0].value)
+print(json.dumps(at.session_state['_runs']))
+"""
+
+
+def measure(page, reruns, workdir):
+    script = SCRIPT.format(root=ROOT, page=page)
+    result = subprocess.run([sys.executable, "-c", RUNNER, script, str(reruns)],
+                            cwd=workdir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{page}: {result.stderr.strip().splitlines()[-1]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    # An in-memory database seeded from the tracked file, which is only read
+    os.environ["MEDWISE_DB"] = ":memory:"
+    os.environ["MEDWISE_DB_SEED"] = os.path.join(ROOT, "feminine.db")
+    workdir = tempfile.mkdtemp()
+    shutil.copytree(os.path.join(ROOT, "assets"), os.path.join(workdir, "assets"))
+
+    print(f"{'Page':<24} {'cold paint':>12} {'cold render':>12} {'warm paint':>12} {'warm render':>12}")
+    for page in PAGES:
+        cold, *warm = measure(page, args.reruns, workdir)
+        warm_paint = statistics.median(run['first_paint'] for run in warm) * 1000
+        warm_render = statistics.median(run['render'] for run in warm) * 1000
+        print(f"{page:<24} {cold['first_paint'] * 1000:9.1f} ms {cold['render'] * 1000:9.1f} ms "
+              f"{warm_paint:9.1f} ms {warm_render:9.1f} ms")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
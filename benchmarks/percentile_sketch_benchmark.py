@@ -0,0 +1,91 @@
+# benchmarks/percentile_sketch_benchmark.py
+"""Population percentiles: sketch lookups vs exact SQL counts, with the sketch's rank error.
+
+    python benchmarks/percentile_sketch_benchmark.py --rows 200000 --queries 500
+
+Saves synthetic assessments (blood sugar, TSH, BMI and risk scores drawn
+from skewed distributions) to a scratch database, so the sketches are
+maintained by save_assessments. Then ranks random values both ways.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase
+from sketches import METRICS, RANK_ERROR
+
+
+def synthetic_assessments(count, rng):
+    blood_sugar = rng.lognormal(np.log(100), 0.25, count).round()
+    tsh = rng.gamma(2.0, 1.3, count).round(2)
+    bmi = rng.normal(25, 4.5, count).round(1)
+    risks = rng.beta([2, 1.5, 1.2], [3, 4, 5], (count, 3)).round(3)
+    for i in range(count):
+        yield (f"user{i % 1000}", {
+            'name': 'bench',
+            'input_data': {
+                'Age': 30, 'BMI': float(bmi[i]), 'TSH_Level': float(tsh[i]), 'Blood_Sugar': float(blood_sugar[i]),
+                'Irregular_Periods': 0, 'Excess_Hair_Growth': 0, 'Acne': 0, 'Tiredness': 0, 'Hair_Fall': 0,
+                'Frequent_Urination': 0, 'Family_Diabetes': 0
+            },
+            'overall_risk': 'Low',
+            'predictions': {'pcos_risk': float(risks[i, 0]), 'thyroid_risk': float(risks[i, 1]),
+                            'diabetes_risk': float(risks[i, 2])},
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=5000, help="Assessments per save_assessments call")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    workdir = tempfile.mkdtemp()
+    db = UserDatabase(os.path.join(workdir, "bench.db"))
+    items = list(synthetic_assessments(args.rows, rng))
+    start = time.perf_counter()
+    for i in range(0, len(items), args.batch):
+        db.save_assessments(items[i:i + args.batch])
+    print(f"Saved {args.rows:,} assessments in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    for username, assessment in synthetic_assessments(200, rng):
+        db.save_assessment(username, assessment)
+    print(f"Single save_assessment incl. sketch update: {(time.perf_counter() - start) / 200 * 1000:.2f} ms")
+
+    conn = db.connect()
+    print(f"{'metric':<14} {'exact SQL':>11} {'sketch':>11} {'mean err':>9} {'max err':>9}")
+    sketches = db.get_metric_sketches()
+    for metric in METRICS:
+        column = np.sort(np.array([row[0] for row in conn.execute(f"SELECT {metric} FROM assessment_history")]))
+        probes = rng.choice(column, args.queries)
+
+        start = time.perf_counter()
+        exact = [conn.execute(f"SELECT AVG(({metric} < ?) + ({metric} <= ?)) / 2.0 FROM assessment_history",
+                              (float(value), float(value))).fetchone()[0] for value in probes[:20]]
+        sql_ms = (time.perf_counter() - start) / 20 * 1000
+
+        start = time.perf_counter()
+        estimated = [sketches[metric].rank(float(value)) for value in probes]
+        sketch_ms = (time.perf_counter() - start) / len(probes) * 1000
+
+        truth = (np.searchsorted(column, probes, 'left') + np.searchsorted(column, probes, 'right')) / 2 / len(column)
+        assert np.allclose(truth[:20], exact)
+        errors = np.abs(np.array(estimated) - truth)
+        print(f"{metric:<14} {sql_ms:8.2f} ms {sketch_ms:8.4f} ms {errors.mean() * 100:7.2f} pt {errors.max() * 100:7.2f} pt")
+    conn.close()
+    print(f"Documented bound: {RANK_ERROR * 100:.2f} percentile points (99% confidence)")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/replica_write_benchmark.py
+"""Write latency while admins refresh analytics, with and without the snapshot replica.
+
+    python benchmarks/replica_write_benchmark.py --rows 200000 --admins 2 --admin-rate 4 --seconds 10
+
+A writer process saves assessments and logs logins in a loop, timing each
+write. Admin processes call get_analytics at a fixed rate, first
+against the primary file and then against a replica that one refresher
+process copies every --interval seconds.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase
+from replica import SnapshotReplica
+
+INPUT = {
+    'Age': 30, 'BMI': 27.0, 'TSH_Level': 4.2, 'Blood_Sugar': 118.0, 'Irregular_Periods': 1,
+    'Excess_Hair_Growth': 0, 'Acne': 1, 'Tiredness': 1, 'Hair_Fall': 0,
+    'Frequent_Urination': 0, 'Family_Diabetes': 1
+}
+ASSESSMENT = {
+    'name': 'bench', 'input_data': INPUT, 'overall_risk': 'Medium',
+    'predictions': {'pcos_risk': 0.7, 'thyroid_risk': 0.3, 'diabetes_risk': 0.4},
+    'disease_diagnosis': {'primary_disease': 'PCOS', 'confidence': 70.0},
+}
+
+
+def assessment(i):
+    # Saves are idempotent per (user, inputs, time bucket), so each row gets distinct inputs
+    return dict(ASSESSMENT, input_data=dict(INPUT, BMI=18.0 + i * 1e-5))
+
+
+def writer(db_path, seconds, results):
+    db = UserDatabase(db_path)
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        db.save_assessment(f"user{i % 500}", assessment(i))
+        db.log_login(f"user{i % 500}")
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    results.put(latencies)
+
+
+def admin(db_path, replica_dir, seconds, period, results):
+    db = UserDatabase(db_path)
+    if replica_dir:
+        # Refreshed by the separate refresher process
+        db = SnapshotReplica(db, replica_dir, interval=0).database
+    queries = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        db.get_analytics()
+        queries += 1
+        # Same query rate in both runs, so only lock contention differs
+        time.sleep(max(period - (time.perf_counter() - start), 0))
+    results.put(queries)
+
+
+def refresher(db_path, replica_dir, interval, seconds):
+    replica = SnapshotReplica(UserDatabase(db_path), replica_dir, interval).start()
+    time.sleep(seconds)
+    replica.stop()
+
+
+def run(db_path, replica_dir, args):
+    results = mp.Queue()
+    processes = [mp.Process(target=admin, args=(db_path, replica_dir, args.seconds, 1 / args.admin_rate, results))
+                 for _ in range(args.admins)]
+    if replica_dir:
+        SnapshotReplica(UserDatabase(db_path), replica_dir).refresh()
+        processes.append(mp.Process(target=refresher, args=(db_path, replica_dir, args.interval, args.seconds)))
+    for process in processes:
+        process.start()
+    time.sleep(1)
+    write = mp.Process(target=writer, args=(db_path, args.seconds - 1, results))
+    write.start()
+
+    outputs = [results.get() for _ in range(args.admins + 1)]
+    for process in processes + [write]:
+        process.join()
+    latencies = next(output for output in outputs if isinstance(output, list))
+    queries = sum(output for output in outputs if isinstance(output, int))
+    return sorted(latencies), queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--admin-rate", type=float, default=4, help="Analytics refreshes per second per admin")
+    parser.add_argument("--interval", type=float, default=5, help="Replica refresh interval")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, "bench.db")
+    db = UserDatabase(db_path)
+    # Offset so the writer's rows never repeat these
+    db.save_assessments([(f"user{i % 500}", assessment(-1 - i)) for i in range(args.rows)])
+
+    print(f"{'admin reads from':<18} {'writes':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'admin queries':>14}")
+    for label, replica_dir in [('primary', None), ('replica', os.path.join(workdir, "replica"))]:
+        latencies, queries = run(db_path, replica_dir, args)
+        pct = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+        print(f"{label:<18} {len(latencies):>8} {statistics.median(latencies) * 1000:6.2f} ms "
+              f"{pct(0.95):6.2f} ms {pct(0.99):6.2f} ms {latencies[-1] * 1000:6.1f} ms {queries:>14}")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/rerun_latency.py
+"""Rerun latency of a widget interaction: whole script vs the fragment it lives in.
+
+    python benchmarks/rerun_latency.py --runs 20
+
+AppTest always executes the full script, so each interaction is timed twice
+in the same run: the whole app (init, CSS, sidebar, page) and the fragment
+body alone, which is all a fragment-scoped rerun executes in a live session.
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+SCRIPT = """
+import sys
+import time
+sys.path.insert(0, {root!r})
+import streamlit as st
+
+start = time.perf_counter()
+from app import MedwiseApp
+from views import load_page, render_page
+
+timings = st.session_state.setdefault('_timings', {{'full': [], 'fragment': []}})
+
+module = load_page({page!r})
+fragment = getattr(module, {fragment!r})
+
+def timed(*args, **kwargs):
+    fragment_start = time.perf_counter()
+    fragment(*args, **kwargs)
+    timings['fragment'].append(time.perf_counter() - fragment_start)
+
+st.session_state.authenticated = True
+st.session_state.current_user = {user!r}
+setattr(module, {fragment!r}, timed)
+try:
+    app = MedwiseApp()
+    app.sidebar()
+    render_page({page!r}, app)
+finally:
+    setattr(module, {fragment!r}, fragment)
+timings['full'].append(time.perf_counter() - start)
+"""
+
+
+def interact_bmi(at, run):
+    at.number_input(key="weight_kg").set_value(55.0 + run)
+    at.button[0].click()
+
+
+def interact_doctors(at, run):
+    at.selectbox[0].set_value(at.selectbox[0].options[1 + run % (len(at.selectbox[0].options) - 1)])
+
+
+def interact_history(at, run):
+    at.button(key=f"view_{run % 2}").click()
+
+
+def interact_admin(at, run):
+    options = at.selectbox[0].options
+    at.selectbox[0].set_value(options[run % len(options)])
+
+
+SCENARIOS = [
+    ("BMI gauge", "BMI Calculator", "bmi_calculator", "demo", interact_bmi),
+    ("Doctor search", "Doctor Recommendations", "doctor_search", "demo", interact_doctors),
+    ("History item", "Health History", "history_item", "shreemathi", interact_history),
+    ("Admin cohort tab", "Admin Panel", "cohort_analytics_tab", "admin", interact_admin),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    # An in-memory database seeded from the tracked file, which is only read
+    os.environ["MEDWISE_DB"] = ":memory:"
+    os.environ["MEDWISE_DB_SEED"] = os.path.join(ROOT, "feminine.db")
+    workdir = tempfile.mkdtemp()
+    shutil.copytree(os.path.join(ROOT, "assets"), os.path.join(workdir, "assets"))
+    os.chdir(workdir)
+
+    print(f"{'Interaction':<18} {'full rerun':>12} {'fragment':>12} {'speedup':>9}")
+    for label, page, fragment, user, interact in SCENARIOS:
+        at = AppTest.from_string(SCRIPT.format(root=ROOT, page=page, fragment=fragment, user=user),
+                                 default_timeout=120)
+        at.run()
+        for run in range(args.runs):
+            interact(at, run)
+            at.run()
+            if at.exception:
+                raise RuntimeError(at.exception[0].value)
+
+        timings = at.session_state['_timings']
+        # Skip the first (cold) run; history renders one fragment per item and
+        # only the clicked one (the slowest) reruns
+        full = statistics.median(timings['full'][1:]) * 1000
+        per_run = len(timings['fragment']) // len(timings['full'])
+        fragment_times = [max(timings['fragment'][i:i + per_run])
+                          for i in range(per_run, len(timings['fragment']), per_run)]
+        fragment_ms = statistics.median(fragment_times) * 1000
+        print(f"{label:<18} {full:10.1f} ms {fragment_ms:10.1f} ms {full / fragment_ms:8.1f}x")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
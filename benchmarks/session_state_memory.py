@@ -0,0 +1,77 @@
+# benchmarks/session_state_memory.py
+"""Per-session memory of the assessment and doctor state, before and after compaction.
+
+    python benchmarks/session_state_memory.py --assessments 50 --sessions 5000
+"""
+import os
+import sys
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase
+from utils.model import HealthPredictor
+from utils.assessment import build_assessment
+from utils.session_cache import new_history, SESSION_HISTORY_LIMIT
+
+
+def deep_sizeof(obj, seen=None):
+    """Bytes held by an object graph, counting shared objects once"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)) or type(obj).__name__ == 'deque':
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assessments", type=int, default=50, help="Assessments per user")
+    parser.add_argument("--sessions", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = UserDatabase(os.path.join(directory, "sessions.db"))
+        predictor = HealthPredictor()
+        input_data = {
+            'Age': 29, 'BMI': 26.3, 'TSH_Level': 4.6, 'Blood_Sugar': 118,
+            'Irregular_Periods': 1, 'Excess_Hair_Growth': 1, 'Acne': 0, 'Tiredness': 1,
+            'Hair_Fall': 1, 'Frequent_Urination': 0, 'Family_Diabetes': 1
+        }
+        new_assessments = []
+        for i in range(args.assessments):
+            # Distinct inputs per assessment: saves are idempotent per (user, inputs, time bucket)
+            inputs = dict(input_data, BMI=input_data['BMI'] + i * 0.1)
+            assessment = build_assessment("Benchmark User", inputs, predictor.predict(inputs))
+            database.save_assessment("bench", assessment)
+            new_assessments.append(assessment)
+
+        # Before: full rows loaded at login, every new assessment appended, doctor dicts cached
+        before = {
+            'assessment_history': [a.to_dict() for a in database.get_user_assessments("bench")] + new_assessments[-5:],
+            'last_assessment': new_assessments[-1],
+            'doctors': database.get_doctors_by_specialty(),
+        }
+        # After: ids only, bounded
+        ids = database.get_recent_assessment_ids("bench", SESSION_HISTORY_LIMIT)
+        after = {
+            'assessment_history': new_history(reversed(ids)),
+            'last_assessment': ids[0],
+            'doctors': [doctor['id'] for doctor in database.get_doctors_by_specialty()],
+        }
+
+    before_bytes, after_bytes = deep_sizeof(before), deep_sizeof(after)
+    print(f"per session: {before_bytes / 1024:8.1f} KiB before, {after_bytes / 1024:6.1f} KiB after "
+          f"({before_bytes / after_bytes:.0f}x smaller)")
+    print(f"{args.sessions} sessions: {before_bytes * args.sessions / 2**20:8.1f} MiB before, "
+          f"{after_bytes * args.sessions / 2**20:6.1f} MiB after")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/sharded_write_benchmark.py
+"""Multi-process write throughput: one SQLite file vs sharded storage.
+
+Each worker process mimics a Streamlit server writing logins and
+assessments for random users::
+
+    python benchmarks/sharded_write_benchmark.py --processes 8 --writes 500 --shards 8
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import UserDatabase
+from storage import SingleFileStorage, ShardedStorage
+
+ASSESSMENT = {
+    'name': 'Benchmark',
+    'input_data': {
+        'Age': 30, 'BMI': 24.5, 'TSH_Level': 2.1, 'Blood_Sugar': 95,
+        'Irregular_Periods': 1, 'Excess_Hair_Growth': 0, 'Acne': 1, 'Tiredness': 0,
+        'Hair_Fall': 0, 'Frequent_Urination': 0, 'Family_Diabetes': 1
+    },
+    'predictions': {'pcos_risk': 0.6, 'thyroid_risk': 0.0, 'diabetes_risk': 0.2},
+    'overall_risk': 'Medium',
+    'disease_diagnosis': {'primary_disease': 'PCOS', 'confidence': 69.2},
+}
+
+
+def make_storage(kind, directory, shards):
+    if kind == 'single':
+        return SingleFileStorage(os.path.join(directory, 'single.db'))
+    return ShardedStorage(os.path.join(directory, 'sharded'), shards)
+
+
+def worker(args):
+    kind, directory, shards, writes, seed = args
+    database = UserDatabase(storage=make_storage(kind, directory, shards))
+    rng = random.Random(seed)
+    failures = 0
+    for i in range(writes):
+        username = f"user{rng.randrange(10000)}"
+        # Distinct inputs per write: saves are idempotent per (user, inputs, time bucket)
+        assessment = dict(ASSESSMENT, input_data=dict(ASSESSMENT['input_data'], BMI=18.0 + (seed * writes + i) * 1e-5))
+        if not database.save_assessment(username, assessment):
+            failures += 1
+        try:
+            database.log_login(username)
+        except Exception:
+            failures += 1
+    return failures
+
+
+def run(kind, processes, writes, shards):
+    with tempfile.TemporaryDirectory() as directory:
+        UserDatabase(storage=make_storage(kind, directory, shards))
+        jobs = [(kind, directory, shards, writes, seed) for seed in range(processes)]
+
+        start = time.perf_counter()
+        with multiprocessing.Pool(processes) as pool:
+            failures = sum(pool.map(worker, jobs))
+        elapsed = time.perf_counter() - start
+
+    total = processes * writes * 2
+    label = 'single file' if kind == 'single' else f'{shards} shards'
+    print(f"{label:>12}: {total / elapsed:8,.0f} writes/s  ({total} writes in {elapsed:.2f}s, {failures} failed)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=500, help="Assessments (and logins) per process")
+    parser.add_argument("--shards", type=int, default=8)
+    args = parser.parse_args()
+
+    run('single', args.processes, args.writes, args.shards)
+    run('sharded', args.processes, args.writes, args.shards)
@@ -0,0 +1,56 @@
+# benchmarks/whatif_grid_benchmark.py
+"""What-if risk surface: vectorised grid vs one predict + diagnosis call per cell.
+
+    python benchmarks/whatif_grid_benchmark.py --repeats 5
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.model import HealthPredictor
+from utils.assessment import get_disease_diagnosis
+from utils.whatif import numeric_axis, risk_surface
+
+BASE_INPUTS = {
+    'Age': 30, 'BMI': 27.0, 'TSH_Level': 4.2, 'Blood_Sugar': 118, 'Irregular_Periods': 1,
+    'Excess_Hair_Growth': 0, 'Acne': 1, 'Tiredness': 1, 'Hair_Fall': 0,
+    'Frequent_Urination': 0, 'Family_Diabetes': 1
+}
+
+
+def scalar_ms_per_cell(predictor, cells=5000):
+    start = time.perf_counter()
+    for i in range(cells):
+        inputs = dict(BASE_INPUTS, BMI=15 + i % 300 * 0.1, Blood_Sugar=60 + i // 300)
+        get_disease_diagnosis(predictor.predict(inputs), inputs)
+    return (time.perf_counter() - start) * 1000 / cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    predictor = HealthPredictor()
+    per_cell = scalar_ms_per_cell(predictor)
+
+    print(f"{'grid':>10} {'cells':>10} {'vectorised':>12} {'per-cell loop (est.)':>22}")
+    for steps in (100, 316, 1000):
+        x_axis = numeric_axis('BMI', steps)
+        y_axis = numeric_axis('Blood_Sugar', steps)
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            risk_surface(predictor, BASE_INPUTS, x_axis, y_axis)
+            timings.append((time.perf_counter() - start) * 1000)
+        cells = steps * steps
+        print(f"{steps:>4} x {steps:<4} {cells:>10,} {statistics.median(timings):9.1f} ms "
+              f"{per_cell * cells:19.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,101 @@
 # database.py
+import os
+import json
 import sqlite3
 import hashlib
-from datetime import datetime, timedelta
+import heapq
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from storage import SingleFileStorage, SHARD_ID_SPAN, USER_SCOPED_TABLES, make_storage
+from records import ASSESSMENT_SELECT, assessment_row_factory
+from sketches import METRICS, KLLSketch, HyperLogLog, HLL_REGISTERS, metric_values
+from anomalies import LAB_METRICS, LabStats
+
+DOCTOR_COLUMNS = ('name', 'specialty', 'hospital', 'location', 'rating', 'contact')
+DOCTOR_KEY = ('name', 'specialty', 'hospital', 'location')
+# Assessment inputs in content-hash order; each maps to the lower-cased assessment_history column
+HASHED_INPUTS = (
+    'Age', 'BMI', 'TSH_Level', 'Blood_Sugar', 'Irregular_Periods', 'Excess_Hair_Growth', 'Acne',
+    'Tiredness', 'Hair_Fall', 'Frequent_Urination', 'Family_Diabetes'
+)
+# Resubmissions of the same patient's inputs by the same user within one bucket are the same assessment
+DEDUP_BUCKET_SECONDS = 600
+# Active-user windows (calendar days, today included) reported by get_analytics
+ACTIVE_WINDOWS = (1, 7, 30, 90)
+
+# Compact change-feed event body, built from an assessment_history row
+CHANGE_PAYLOAD = """json_object(
+    'id', id, 'username', username, 'name', name,
+    'pcos_risk', pcos_risk, 'thyroid_risk', thyroid_risk, 'diabetes_risk', diabetes_risk,
+    'overall_risk', overall_risk, 'primary_disease', primary_disease, 'confidence', confidence,
+    'timestamp', timestamp
+)"""
+
+def doctor_row_hash(name, specialty, hospital, location, rating, contact):
+    """Stable signed 64-bit content hash of a doctor row"""
+    text = "\x1f".join("" if value is None else str(value)
+                        for value in (name, specialty, hospital, location, rating, contact))
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'big', signed=True)
+
+
+def assessment_content_hash(username, name, input_data, bucket, submission_id=None):
+    """Signed 64-bit hash of who submitted which patient's inputs in which time bucket.
+
+    A caller-supplied submission id (an API record id) identifies the assessment
+    on its own, so only a retry of that same record is a duplicate.
+    """
+    if submission_id is not None:
+        values = [username, 'submission', str(submission_id)]
+    else:
+        values = [username, name or '', str(bucket)] + [repr(float(input_data[key])) for key in HASHED_INPUTS]
+    digest = hashlib.blake2b("\x1f".join(values).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def time_bucket(timestamp=None):
+    """Dedup bucket of a 'YYYY-MM-DD HH:MM:SS' UTC timestamp (now if None)"""
+    moment = (datetime.strptime(timestamp[:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+              if timestamp else datetime.now(timezone.utc))
+    return int(moment.timestamp()) // DEDUP_BUCKET_SECONDS
+
 
 class UserDatabase:
-    def __init__(self, db_path="feminine.db"):
-        self.db_path = db_path
-        self.init_database()
+    def __init__(self, db_path="feminine.db", storage=None, read_only=False):
+        self.storage = storage or SingleFileStorage(db_path)
+        self.db_path = self.storage.catalog_path
+        self.read_only = read_only
+        if not read_only:
+            self.init_database()
+
+    def connect(self):
+        """Connection to the catalog holding users and doctors"""
+        return self.storage.connect(self.storage.catalog_path)
+
+    def connect_shard(self, username):
+        """Connection to the shard holding a user's login and assessment history"""
+        return self.storage.connect(self.storage.shard_path(username))
+
+    def fan_out(self, fn):
+        """Run fn(conn, shard_index) on every shard and return the per-shard results"""
+        def run(index):
+            conn = self.storage.connect(self.storage.shard_paths[index])
+            try:
+                return fn(conn, index)
+            finally:
+                conn.close()
+
+        if self.storage.shard_count == 1:
+            return [run(0)]
+        with ThreadPoolExecutor(max_workers=self.storage.shard_count) as pool:
+            return list(pool.map(run, range(self.storage.shard_count)))
 
     def init_database(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         c = conn.cursor()
+        # Only takes effect on a new, empty file; lets retention reclaim space in small steps
+        c.execute("PRAGMA auto_vacuum = INCREMENTAL")
 
         # Users table
         c.execute('''CREATE TABLE IF NOT EXISTS users (
@@ -21,12 +106,166 @@ class UserDatabase:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )''')
 
+        # Committed change-feed offset per consumer (a per-shard id watermark as JSON)
+        c.execute('''CREATE TABLE IF NOT EXISTS change_feed_offsets (
+            consumer TEXT PRIMARY KEY,
+            offsets TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+
+        # Counter per catalog table, bumped by the app's writers; a one-row read tells pollers it changed
+        c.execute('''CREATE TABLE IF NOT EXISTS table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )''')
+
+        # Doctors table
+        c.execute('''CREATE TABLE IF NOT EXISTS doctors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT, specialty TEXT, hospital TEXT, location TEXT,
+            rating REAL, contact TEXT
+        )''')
+
+        self.init_doctor_indexes(conn)
+
+        # Create demo accounts
+        if not self.user_exists("admin"):
+            self.create_user("admin", "admin123")
+        if not self.user_exists("demo"):
+            self.create_user("demo", "demo123")
+            
+        # Insert doctors data
+        self.insert_comprehensive_doctors()
+
+        conn.commit()
+        conn.close()
+
+        for index, path in enumerate(self.storage.shard_paths):
+            conn = self.storage.connect(path)
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            created = self.init_user_tables(conn.cursor())
+            self.storage.init_shard(conn, index)
+            if 'assessment_changes' in created:
+                self.backfill_change_feed(conn)
+            removed = self.init_assessment_dedup(conn)
+            # Derived tables are rebuilt when new, or when the dedup migration removed rows they counted
+            if 'metric_sketches' in created or removed:
+                self.build_metric_sketches(conn)
+            if 'login_day_sketches' in created:
+                self.build_login_sketches(conn)
+            if 'lab_stats' in created or removed:
+                self.build_lab_stats(conn)
+            conn.commit()
+            conn.close()
+
+    def init_assessment_dedup(self, conn):
+        """Content hashes and their unique index on a shard's assessments; returns the duplicates removed.
+
+        The first run hashes existing rows from their stored name, inputs and
+        timestamp, keeps the earliest row of each hash, and records a 'delete'
+        change-feed event for every row it removes.
+        """
+        c = conn.cursor()
+        self.ensure_column(c, 'assessment_history', 'content_hash', 'INTEGER')
+        if c.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_assessment_dedup'").fetchone():
+            return 0
+
+        # Hashes from before the patient name was part of the key are recomputed
+        if c.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_assessment_content_hash'").fetchone():
+            c.execute("DROP INDEX idx_assessment_content_hash")
+            c.execute("UPDATE assessment_history SET content_hash = NULL")
+
+        columns = [key.lower() for key in HASHED_INPUTS]
+        rows = c.execute(
+            f"SELECT id, username, name, timestamp, {', '.join(columns)} FROM assessment_history WHERE content_hash IS NULL"
+        ).fetchall()
+        c.executemany("UPDATE assessment_history SET content_hash = ? WHERE id = ?", [
+            (assessment_content_hash(username, name, dict(zip(HASHED_INPUTS, values)), time_bucket(timestamp)),
+             assessment_id)
+            for assessment_id, username, name, timestamp, *values in rows
+        ])
+
+        duplicates = "id NOT IN (SELECT MIN(id) FROM assessment_history GROUP BY content_hash)"
+        c.execute(f'''
+            INSERT INTO assessment_changes (op, assessment_id, username, payload)
+            SELECT 'delete', id, username, json_object('id', id, 'username', username, 'reason', 'duplicate')
+            FROM assessment_history WHERE {duplicates} ORDER BY id
+        ''')
+        c.execute(f"DELETE FROM lab_anomalies WHERE assessment_id IN (SELECT id FROM assessment_history WHERE {duplicates})")
+        removed = c.execute(f"DELETE FROM assessment_history WHERE {duplicates}").rowcount
+        c.execute("CREATE UNIQUE INDEX idx_assessment_dedup ON assessment_history (content_hash)")
+        conn.commit()
+        return removed
+
+    def init_doctor_indexes(self, conn):
+        """Content hashes, one row per natural key, and the indexes the bulk loader upserts on"""
+        c = conn.cursor()
+        self.ensure_column(c, 'doctors', 'row_hash', 'INTEGER')
+        if c.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_doctors_natural_key'").fetchone():
+            return
+
+        # One-off migration: drop exact natural-key repeats (keeping the first) so the unique index can be built
+        c.execute(f'''
+            DELETE FROM doctors WHERE id NOT IN (
+                SELECT MIN(id) FROM doctors GROUP BY {", ".join(DOCTOR_KEY)}
+            )
+        ''')
+        conn.create_function("doctor_row_hash", 6, doctor_row_hash, deterministic=True)
+        c.execute(f"UPDATE doctors SET row_hash = doctor_row_hash({', '.join(DOCTOR_COLUMNS)}) WHERE row_hash IS NULL")
+        self.bump_table_version(c, 'doctors')
+        c.execute(f"CREATE UNIQUE INDEX idx_doctors_natural_key ON doctors ({', '.join(DOCTOR_KEY)})")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_doctors_row_hash ON doctors (row_hash)")
+        conn.commit()
+
+    def ensure_column(self, c, table, column, definition):
+        """Add a column to an existing table if it is missing; returns True if added"""
+        columns = [row[1] for row in c.execute(f"PRAGMA table_info({table})").fetchall()]
+        if column in columns:
+            return False
+        c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+
+    def get_last_logins(self, usernames):
+        """Each user's latest login from their shard's raw and rolled-up history; {username: time or None}.
+
+        Two index seeks per user, so logins never write to the shared catalog.
+        """
+        def last_logins(conn, index):
+            own = [u for u in usernames if self.storage.shard_index(u) == index]
+            return conn.execute('''
+                SELECT value, (
+                    SELECT MAX(last_login) FROM (
+                        SELECT MAX(login_time) AS last_login FROM login_history WHERE username = value
+                        UNION ALL
+                        SELECT MAX(last_login) FROM login_daily_summary WHERE username = value
+                    )
+                ) FROM json_each(?)
+            ''', (json.dumps(own),)).fetchall()
+
+        return dict(row for shard in self.fan_out(last_logins) for row in shard)
+
+    def init_user_tables(self, c):
+        """Create the user-scoped tables that live on every shard; returns the names of tables that are new"""
+        existing = {row[0] for row in c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
         # Login history
         c.execute('''CREATE TABLE IF NOT EXISTS login_history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             username TEXT NOT NULL,
             login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_login_history_time ON login_history (login_time)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_login_history_user ON login_history (username, login_time)")
+
+        # Per-user, per-day rollup of login rows older than the retention window
+        c.execute('''CREATE TABLE IF NOT EXISTS login_daily_summary (
+            username TEXT NOT NULL,
+            day DATE NOT NULL,
+            logins INTEGER NOT NULL,
+            last_login TIMESTAMP,
+            PRIMARY KEY (username, day)
+        ) WITHOUT ROWID''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_login_daily_summary_day ON login_daily_summary (day)")
 
         # Assessment history
         c.execute('''CREATE TABLE IF NOT EXISTS assessment_history (
@@ -42,31 +281,68 @@ class UserDatabase:
             timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )''')
 
-        # Doctors table
-        c.execute('''CREATE TABLE IF NOT EXISTS doctors (
+        # Append-only change feed; an event's id is its offset
+        c.execute('''CREATE TABLE IF NOT EXISTS assessment_changes (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT, specialty TEXT, hospital TEXT, location TEXT,
-            rating REAL, contact TEXT
+            op TEXT NOT NULL,
+            assessment_id INTEGER NOT NULL,
+            username TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )''')
 
-        # Create demo accounts
-        if not self.user_exists("admin"):
-            self.create_user("admin", "admin123")
-        if not self.user_exists("demo"):
-            self.create_user("demo", "demo123")
-            
-        # Insert doctors data
-        self.insert_comprehensive_doctors()
+        # HyperLogLog registers of the distinct users who logged in each day (rowid table for in-place blob writes)
+        c.execute('''CREATE TABLE IF NOT EXISTS login_day_sketches (
+            id INTEGER PRIMARY KEY,
+            day DATE NOT NULL UNIQUE,
+            registers BLOB NOT NULL
+        )''')
 
-        conn.commit()
-        conn.close()
+        # Running per-user lab statistics (Welford mean/variance, EWMA, last value)
+        c.execute('''CREATE TABLE IF NOT EXISTS lab_stats (
+            username TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            n INTEGER NOT NULL,
+            mean REAL NOT NULL,
+            m2 REAL NOT NULL,
+            ewma REAL,
+            last_value REAL,
+            PRIMARY KEY (username, metric)
+        ) WITHOUT ROWID''')
+
+        # Sharp lab-value changes flagged when an assessment was saved
+        c.execute('''CREATE TABLE IF NOT EXISTS lab_anomalies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            assessment_id INTEGER NOT NULL,
+            username TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            value REAL, previous REAL, change REAL, expected REAL, zscore REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_lab_anomalies_user ON lab_anomalies (username, assessment_id)")
+
+        # Serialised quantile sketch of each population metric on this shard
+        c.execute('''CREATE TABLE IF NOT EXISTS metric_sketches (
+            metric TEXT PRIMARY KEY,
+            sketch BLOB NOT NULL,
+            count INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID''')
+        return {row[0] for row in c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")} - existing
+
+    def backfill_change_feed(self, conn):
+        """Seed a new change feed with an insert event for every existing assessment"""
+        conn.execute(f'''
+            INSERT INTO assessment_changes (op, assessment_id, username, payload, created_at)
+            SELECT 'insert', id, username, {CHANGE_PAYLOAD}, timestamp FROM assessment_history ORDER BY id
+        ''')
 
     def hash_password(self, pwd):
         return hashlib.sha256(pwd.encode()).hexdigest()
 
     def create_user(self, username, password, email=None):
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             c = conn.cursor()
             c.execute(
                 "INSERT INTO users (username, password_hash, email) VALUES (?, ?, ?)",
@@ -79,7 +355,7 @@ class UserDatabase:
             return False
 
     def authenticate_user(self, username, password):
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         c = conn.cursor()
         c.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
         row = c.fetchone()
@@ -89,7 +365,7 @@ class UserDatabase:
         return False
 
     def user_exists(self, username):
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         c = conn.cursor()
         c.execute("SELECT 1 FROM users WHERE username = ?", (username,))
         exists = c.fetchone() is not None
@@ -97,20 +373,148 @@ class UserDatabase:
         return exists
 
     def log_login(self, username):
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("INSERT INTO login_history (username) VALUES (?)", (username,))
+        login_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+        conn = self.connect_shard(username)
+        conn.execute("INSERT INTO login_history (username, login_time) VALUES (?, ?)", (username, login_time))
+        self.add_login_sketch(conn, login_time[:10], username)
         conn.commit()
         conn.close()
 
+    def add_login_sketch(self, conn, day, username):
+        """Record a login in the day's HyperLogLog; touches one register byte in place"""
+        index, rank = HyperLogLog.position(username)
+        conn.execute("INSERT OR IGNORE INTO login_day_sketches (day, registers) VALUES (?, zeroblob(?))",
+                     (day, HLL_REGISTERS))
+        rowid = conn.execute("SELECT id FROM login_day_sketches WHERE day = ?", (day,)).fetchone()[0]
+        with conn.blobopen('login_day_sketches', 'registers', rowid) as blob:
+            blob.seek(index)
+            if blob.read(1)[0] < rank:
+                blob.seek(index)
+                blob.write(bytes([rank]))
+
+    def build_login_sketches(self, conn):
+        """Replace a shard's daily login sketches with ones built from login history and its daily rollup"""
+        sketches = {}
+        for day, username in conn.execute('''
+            SELECT date(login_time), username FROM login_history
+            UNION
+            SELECT day, username FROM login_daily_summary
+        '''):
+            sketches.setdefault(day, HyperLogLog()).add(username)
+        conn.execute("DELETE FROM login_day_sketches")
+        conn.executemany("INSERT INTO login_day_sketches (day, registers) VALUES (?, ?)",
+                         [(day, sketch.to_bytes()) for day, sketch in sketches.items()])
+        return len(sketches)
+
+    def rebuild_login_sketches(self):
+        """Rebuild every shard's daily login sketches; returns the days built per shard"""
+        def rebuild(conn, index):
+            days = self.build_login_sketches(conn)
+            conn.commit()
+            return days
+        return self.fan_out(rebuild)
+
+    def load_login_sketches(self, days):
+        """Daily login sketches for the last `days` calendar days (today included), merged across shards"""
+        def load(conn, index):
+            return conn.execute("SELECT day, registers FROM login_day_sketches WHERE day >= date('now', ?)",
+                                (f"-{days - 1} days",)).fetchall()
+
+        sketches = {}
+        for rows in self.fan_out(load):
+            for day, registers in rows:
+                sketch = HyperLogLog(registers)
+                sketches[day] = sketches[day].merge(sketch) if day in sketches else sketch
+        return sketches
+
+    def get_active_users(self, days=30, exact=False):
+        """Distinct users who logged in over the last `days` calendar days, today included.
+
+        By default merges the daily HyperLogLog sketches (about 1% error, cost
+        independent of login volume); exact=True counts login rows for audits.
+        """
+        if exact:
+            # Users live on exactly one shard, so per-shard distinct counts add up
+            return sum(self.fan_out(lambda conn, index: conn.execute('''
+                SELECT COUNT(*) FROM (
+                    SELECT username FROM login_history WHERE login_time >= date('now', ?)
+                    UNION
+                    SELECT username FROM login_daily_summary WHERE day >= date('now', ?)
+                )
+            ''', (f"-{days - 1} days",) * 2).fetchone()[0]))
+
+        window = HyperLogLog()
+        for sketch in self.load_login_sketches(days).values():
+            window.merge(sketch)
+        return window.estimate()
+
+    def get_daily_active_users(self, days=30, exact=False):
+        """Distinct users per day over the last `days` calendar days, as [{'date', 'count'}]"""
+        if exact:
+            counts = Counter()
+            for rows in self.fan_out(lambda conn, index: conn.execute('''
+                SELECT day, COUNT(DISTINCT username) FROM (
+                    SELECT date(login_time) AS day, username FROM login_history WHERE login_time >= date('now', ?)
+                    UNION ALL
+                    SELECT day, username FROM login_daily_summary WHERE day >= date('now', ?)
+                ) GROUP BY day
+            ''', (f"-{days - 1} days",) * 2).fetchall()):
+                counts.update(dict(rows))
+        else:
+            counts = {day: sketch.estimate() for day, sketch in self.load_login_sketches(days).items()}
+        return [{'date': day, 'count': count} for day, count in sorted(counts.items())]
+
     def get_analytics(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         c = conn.cursor()
 
+        def shard_stats(conn, index):
+            c = conn.cursor()
+            return {
+                'total_logins': c.execute("SELECT COUNT(*) FROM login_history").fetchone()[0]
+                    + c.execute("SELECT COALESCE(SUM(logins), 0) FROM login_daily_summary").fetchone()[0],
+                'total_assessments': c.execute("SELECT COUNT(*) FROM assessment_history").fetchone()[0],
+                'distribution': c.execute(
+                    "SELECT COALESCE(primary_disease, 'Unknown') as disease, COUNT(*) FROM assessment_history GROUP BY primary_disease"
+                ).fetchall(),
+                'recent': c.execute(
+                    "SELECT username, timestamp, primary_disease, overall_risk FROM assessment_history ORDER BY timestamp DESC LIMIT 15"
+                ).fetchall(),
+            }
+
+        shards = self.fan_out(shard_stats)
+        distribution = Counter()
+        for shard in shards:
+            for disease, count in shard['distribution']:
+                distribution[disease] += count
+        recent = heapq.nlargest(15, (row for shard in shards for row in shard['recent']), key=lambda row: row[1] or '')
+
+        # Active users from the daily sketches: one read of the last 90 days, merged per window
+        daily = self.load_login_sketches(max(ACTIVE_WINDOWS))
+        today = datetime.now(timezone.utc).date()
+        active = {}
+        for days in ACTIVE_WINDOWS:
+            since = (today - timedelta(days=days - 1)).isoformat()
+            window = HyperLogLog()
+            for day, sketch in daily.items():
+                if day >= since:
+                    window.merge(sketch)
+            active[days] = window.estimate()
+        since = (today - timedelta(days=29)).isoformat()
+
+        users = c.execute("SELECT username, email, created_at FROM users").fetchall()
+        last_logins = self.get_last_logins([row[0] for row in users])
+
         analytics = {
             'total_users': c.execute("SELECT COUNT(*) FROM users").fetchone()[0],
-            'total_logins': c.execute("SELECT COUNT(*) FROM login_history").fetchone()[0],
-            'total_assessments': c.execute("SELECT COUNT(*) FROM assessment_history").fetchone()[0],
-            'active_users': c.execute("SELECT COUNT(DISTINCT username) FROM login_history WHERE login_time >= datetime('now','-30 days')").fetchone()[0],
+            'total_logins': sum(shard['total_logins'] for shard in shards),
+            'total_assessments': sum(shard['total_assessments'] for shard in shards),
+            'active_users': active[30],
+            'active_users_by_window': active,
+            'daily_active_users': [
+                {'date': day, 'count': sketch.estimate()} for day, sketch in sorted(daily.items()) if day >= since
+            ],
 
             'users_growth': [
                 {'date': row[0], 'count': row[1]}
@@ -118,126 +522,435 @@ class UserDatabase:
             ],
 
             'assessment_distribution': [
-                {'disease': row[0], 'count': row[1]}
-                for row in c.execute(
-                    "SELECT COALESCE(primary_disease, 'Unknown') as disease, COUNT(*) FROM assessment_history GROUP BY primary_disease"
-                ).fetchall()
+                {'disease': disease, 'count': count}
+                for disease, count in distribution.items()
             ],
 
             'recent_assessments': [
                 {'Username': row[0], 'Timestamp': row[1], 'Primary Disease': row[2], 'Overall Risk': row[3]}
-                for row in c.execute(
-                    "SELECT username, timestamp, primary_disease, overall_risk FROM assessment_history ORDER BY timestamp DESC LIMIT 15"
-                ).fetchall()
+                for row in recent
             ],
 
             'all_users': [
-                {'Username': row[0], 'Email': row[1], 'Created At': row[2], 'Last Login': row[3]}
-                for row in c.execute(
-                    "SELECT username, email, created_at, (SELECT MAX(login_time) FROM login_history h WHERE h.username = u.username) last_login FROM users u"
-                ).fetchall()
+                {'Username': row[0], 'Email': row[1], 'Created At': row[2], 'Last Login': last_logins.get(row[0])}
+                for row in users
             ],
         }
         conn.close()
         return analytics
 
     def save_assessment(self, username, assessment_data):
-        """Save assessment to database"""
+        """Save assessment to database; returns (id, created), or (None, False) on failure.
+
+        Idempotent: resubmitting the same inputs within the dedup bucket
+        returns the existing assessment's id with created False, without
+        writing anything.
+        """
         try:
-            input_data = assessment_data['input_data']
-            predictions = assessment_data['predictions']
-            diagnosis = assessment_data.get('disease_diagnosis', {})
-            
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect_shard(username)
             cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO assessment_history (
-                    username, name, age, bmi, tsh_level, blood_sugar,
-                    irregular_periods, excess_hair_growth, acne, tiredness, hair_fall,
-                    frequent_urination, family_diabetes,
-                    pcos_risk, thyroid_risk, diabetes_risk, overall_risk, primary_disease, confidence
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                username,
-                assessment_data['name'],
-                input_data['Age'],
-                input_data['BMI'],
-                input_data['TSH_Level'],
-                input_data['Blood_Sugar'],
-                input_data['Irregular_Periods'],
-                input_data['Excess_Hair_Growth'],
-                input_data['Acne'],
-                input_data['Tiredness'],
-                input_data['Hair_Fall'],
-                input_data['Frequent_Urination'],
-                input_data['Family_Diabetes'],
-                predictions['pcos_risk'],
-                predictions['thyroid_risk'],
-                predictions['diabetes_risk'],
-                assessment_data['overall_risk'],
-                diagnosis.get('primary_disease', 'Unknown'),
-                diagnosis.get('confidence', 0)
-            ))
-            
+
+            assessment_id, created = self._insert_assessment(cursor, username, assessment_data)
+            if created:
+                self.update_metric_sketches(cursor, [assessment_data])
+
             conn.commit()
             conn.close()
-            return True
+            return assessment_id, created
         except Exception as e:
             print(f"Error saving assessment: {e}")
-            return False
-    
+            return None, False
+
+    def save_assessments(self, items):
+        """Save a batch of (username, assessment_data) pairs, one transaction per shard.
+
+        Returns (id, created) for each item in order, or None on failure.
+        """
+        try:
+            by_shard = {}
+            for position, (username, assessment_data) in enumerate(items):
+                by_shard.setdefault(self.storage.shard_path(username), []).append((position, username, assessment_data))
+
+            results = [None] * len(items)
+            for path, shard_items in by_shard.items():
+                conn = self.storage.connect(path)
+                cursor = conn.cursor()
+
+                created = []
+                for position, username, assessment_data in shard_items:
+                    results[position] = self._insert_assessment(cursor, username, assessment_data)
+                    if results[position][1]:
+                        created.append(assessment_data)
+                self.update_metric_sketches(cursor, created)
+
+                conn.commit()
+                conn.close()
+            return results
+        except Exception as e:
+            print(f"Error saving assessments: {e}")
+            return None
+
+    def _insert_assessment(self, cursor, username, assessment_data):
+        """Insert one assessment with its feed event and lab stats; returns (id, created).
+
+        A duplicate (same content hash) conflicts on the unique index and is skipped, so
+        nothing else is written and the existing row's id comes back.
+        """
+        input_data = assessment_data['input_data']
+        predictions = assessment_data['predictions']
+        diagnosis = assessment_data.get('disease_diagnosis', {})
+        content_hash = assessment_content_hash(username, assessment_data['name'], input_data, time_bucket(),
+                                               assessment_data.get('submission_id'))
+
+        cursor.execute('''
+            INSERT INTO assessment_history (
+                username, name, age, bmi, tsh_level, blood_sugar,
+                irregular_periods, excess_hair_growth, acne, tiredness, hair_fall,
+                frequent_urination, family_diabetes,
+                pcos_risk, thyroid_risk, diabetes_risk, overall_risk, primary_disease, confidence, content_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (content_hash) DO NOTHING
+        ''', (
+            username,
+            assessment_data['name'],
+            input_data['Age'],
+            input_data['BMI'],
+            input_data['TSH_Level'],
+            input_data['Blood_Sugar'],
+            input_data['Irregular_Periods'],
+            input_data['Excess_Hair_Growth'],
+            input_data['Acne'],
+            input_data['Tiredness'],
+            input_data['Hair_Fall'],
+            input_data['Frequent_Urination'],
+            input_data['Family_Diabetes'],
+            predictions['pcos_risk'],
+            predictions['thyroid_risk'],
+            predictions['diabetes_risk'],
+            assessment_data['overall_risk'],
+            diagnosis.get('primary_disease', 'Unknown'),
+            diagnosis.get('confidence', 0),
+            content_hash
+        ))
+        if not cursor.rowcount:
+            existing = cursor.execute("SELECT id FROM assessment_history WHERE content_hash = ?", (content_hash,))
+            return existing.fetchone()[0], False
+        assessment_id = cursor.lastrowid
+
+        # Same transaction as the insert, so the feed never misses or invents a row
+        cursor.execute(f'''
+            INSERT INTO assessment_changes (op, assessment_id, username, payload)
+            SELECT 'insert', id, username, {CHANGE_PAYLOAD} FROM assessment_history WHERE id = ?
+        ''', (assessment_id,))
+        self.update_lab_stats(cursor, username, assessment_id, input_data)
+        return assessment_id, True
+
+    def update_lab_stats(self, cursor, username, assessment_id, input_data):
+        """Compare new lab values with the user's running stats, flag sharp changes, then fold them in"""
+        stored = {row[0]: LabStats(*row[1:]) for row in cursor.execute(
+            "SELECT metric, n, mean, m2, ewma, last_value FROM lab_stats WHERE username = ?", (username,)
+        )}
+        for metric, (key, _, _) in LAB_METRICS.items():
+            if input_data.get(key) is None:
+                continue
+            value = float(input_data[key])
+            stats = stored.get(metric) or LabStats()
+            anomaly = stats.check(metric, value)
+            if anomaly:
+                cursor.execute('''
+                    INSERT INTO lab_anomalies (assessment_id, username, metric, value, previous, change, expected, zscore)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (assessment_id, username, metric, value, anomaly['previous'], anomaly['change'],
+                      anomaly['expected'], anomaly['zscore']))
+            stats.update(value)
+            cursor.execute(
+                "INSERT OR REPLACE INTO lab_stats (username, metric, n, mean, m2, ewma, last_value) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (username, metric, *stats.row())
+            )
+
+    def build_lab_stats(self, conn):
+        """Replay a shard's assessment history into lab_stats and lab_anomalies, replacing both"""
+        stats, anomalies, assessments = {}, [], 0
+        for assessment_id, username, timestamp, *values in conn.execute(
+            f"SELECT id, username, timestamp, {', '.join(LAB_METRICS)} FROM assessment_history ORDER BY id"
+        ):
+            assessments += 1
+            for metric, value in zip(LAB_METRICS, values):
+                if value is None:
+                    continue
+                user_stats = stats.setdefault((username, metric), LabStats())
+                anomaly = user_stats.check(metric, value)
+                if anomaly:
+                    anomalies.append((assessment_id, username, metric, value, anomaly['previous'], anomaly['change'],
+                                      anomaly['expected'], anomaly['zscore'], timestamp))
+                user_stats.update(value)
+
+        conn.execute("DELETE FROM lab_stats")
+        conn.execute("DELETE FROM lab_anomalies")
+        conn.executemany(
+            "INSERT INTO lab_stats (username, metric, n, mean, m2, ewma, last_value) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(username, metric, *user_stats.row()) for (username, metric), user_stats in stats.items()]
+        )
+        conn.executemany('''
+            INSERT INTO lab_anomalies (assessment_id, username, metric, value, previous, change, expected, zscore, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ''', anomalies)
+        return {'assessments': assessments, 'users': len({username for username, _ in stats}),
+                'anomalies': len(anomalies)}
+
+    def rebuild_lab_stats(self):
+        """Backfill lab statistics and alerts on every shard; returns a summary per shard"""
+        def rebuild(conn, index):
+            summary = self.build_lab_stats(conn)
+            conn.commit()
+            return summary
+        return self.fan_out(rebuild)
+
+    def get_user_anomalies(self, username):
+        """A user's lab alerts grouped by assessment id"""
+        try:
+            conn = self.connect_shard(username)
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT * FROM lab_anomalies WHERE username = ? ORDER BY assessment_id", (username,)
+            ).fetchall()
+            conn.close()
+        except Exception as e:
+            print(f"Error getting lab alerts: {e}")
+            return {}
+        anomalies = {}
+        for row in rows:
+            anomalies.setdefault(row['assessment_id'], []).append(dict(row))
+        return anomalies
+
+    def get_recent_anomalies(self, limit=50):
+        """The newest lab alerts across all users, newest first"""
+        def recent(conn, index):
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute("SELECT * FROM lab_anomalies ORDER BY id DESC LIMIT ?", (limit,))]
+
+        rows = (row for shard in self.fan_out(recent) for row in shard)
+        return heapq.nlargest(limit, rows, key=lambda row: (row['created_at'] or '', row['id']))
+
+    def update_metric_sketches(self, cursor, assessments):
+        """Fold new assessments into the shard's population sketches (inside the caller's transaction)"""
+        stored = dict(cursor.execute("SELECT metric, sketch FROM metric_sketches").fetchall())
+        sketches = {metric: KLLSketch.from_bytes(stored[metric]) if metric in stored else KLLSketch()
+                    for metric in METRICS}
+        for assessment_data in assessments:
+            for metric, value in metric_values(assessment_data).items():
+                sketches[metric].update(value)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO metric_sketches (metric, sketch, count) VALUES (?, ?, ?)",
+            [(metric, sketch.to_bytes(), sketch.n) for metric, sketch in sketches.items()]
+        )
+
+    def build_metric_sketches(self, conn):
+        """Replace a shard's sketches with ones built from its full assessment history; returns the row count"""
+        sketches = {metric: KLLSketch() for metric in METRICS}
+        rows = 0
+        for row in conn.execute(f"SELECT {', '.join(METRICS)} FROM assessment_history"):
+            rows += 1
+            for sketch, value in zip(sketches.values(), row):
+                sketch.update(value)
+        conn.execute("DELETE FROM metric_sketches")
+        conn.executemany(
+            "INSERT INTO metric_sketches (metric, sketch, count) VALUES (?, ?, ?)",
+            [(metric, sketch.to_bytes(), sketch.n) for metric, sketch in sketches.items()]
+        )
+        return rows
+
+    def rebuild_metric_sketches(self):
+        """Rebuild every shard's sketches from history; returns the rows read per shard"""
+        def rebuild(conn, index):
+            rows = self.build_metric_sketches(conn)
+            conn.commit()
+            return rows
+        return self.fan_out(rebuild)
+
+    def get_metric_sketches(self):
+        """Population sketch per metric, merged across shards"""
+        def load(conn, index):
+            return conn.execute("SELECT metric, sketch FROM metric_sketches").fetchall()
+
+        merged = {}
+        for rows in self.fan_out(load):
+            for metric, blob in rows:
+                sketch = KLLSketch.from_bytes(blob)
+                merged[metric] = merged[metric].merge(sketch) if metric in merged else sketch
+        return merged
+
     def get_user_assessments(self, username):
-        """Get all assessments for a user"""
+        """Get all assessments for a user as Assessment records, newest first"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM assessment_history 
-                WHERE username = ? 
-                ORDER BY timestamp DESC
-            ''', (username,))
-            
-            columns = [description[0] for description in cursor.description]
-            results = cursor.fetchall()
+            conn = self.connect_shard(username)
+            conn.row_factory = assessment_row_factory
+
+            assessments = conn.execute(
+                ASSESSMENT_SELECT + " WHERE username = ? ORDER BY timestamp DESC",
+                (username,)
+            ).fetchall()
             conn.close()
-            
-            assessments = []
-            for row in results:
-                assessment = dict(zip(columns, row))
-                assessment['input_data'] = {
-                    'Age': assessment['age'],
-                    'BMI': assessment['bmi'],
-                    'TSH_Level': assessment['tsh_level'],
-                    'Blood_Sugar': assessment['blood_sugar'],
-                    'Irregular_Periods': assessment['irregular_periods'],
-                    'Excess_Hair_Growth': assessment['excess_hair_growth'],
-                    'Acne': assessment['acne'],
-                    'Tiredness': assessment['tiredness'],
-                    'Hair_Fall': assessment['hair_fall'],
-                    'Frequent_Urination': assessment['frequent_urination'],
-                    'Family_Diabetes': assessment['family_diabetes']
-                }
-                assessment['predictions'] = {
-                    'pcos_risk': assessment['pcos_risk'],
-                    'thyroid_risk': assessment['thyroid_risk'],
-                    'diabetes_risk': assessment['diabetes_risk']
-                }
-                assessment['disease_diagnosis'] = {
-                    'primary_disease': assessment['primary_disease'],
-                    'confidence': assessment['confidence']
-                }
-                assessments.append(assessment)
-            
+
             return assessments
         except Exception as e:
             print(f"Error getting assessments: {e}")
             return []
-    
+
+    def get_assessment(self, assessment_id):
+        """Get a single Assessment record by id, or None if it does not exist"""
+        try:
+            path = self.storage.shard_paths[self.storage.shard_of_id(assessment_id)]
+            conn = self.storage.connect(path)
+            conn.row_factory = assessment_row_factory
+
+            assessment = conn.execute(ASSESSMENT_SELECT + " WHERE id = ?", (assessment_id,)).fetchone()
+            conn.close()
+
+            return assessment
+        except Exception as e:
+            print(f"Error getting assessment: {e}")
+            return None
+
+    def get_recent_assessment_ids(self, username, limit=20):
+        """Get a user's most recent assessment ids, newest first"""
+        conn = self.connect_shard(username)
+        ids = [row[0] for row in conn.execute(
+            "SELECT id FROM assessment_history WHERE username = ? ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (username, limit)
+        ).fetchall()]
+        conn.close()
+        return ids
+
+    def normalize_watermark(self, watermark=0):
+        """Per-shard id watermark from an int or an existing per-shard sequence"""
+        if isinstance(watermark, (int, float)):
+            return tuple(max(int(watermark), index * SHARD_ID_SPAN) for index in range(self.storage.shard_count))
+        if len(watermark) != self.storage.shard_count:
+            raise ValueError("Watermark does not match the number of shards")
+        return tuple(int(last_id) for last_id in watermark)
+
+    def advance_watermark(self, watermark, ids):
+        """Move a per-shard watermark past the given assessment ids"""
+        watermark = list(self.normalize_watermark(watermark))
+        for row_id in ids:
+            index = self.storage.shard_of_id(int(row_id))
+            watermark[index] = max(watermark[index], int(row_id))
+        return tuple(watermark)
+
+    def get_assessment_watermark(self):
+        """Per-shard id of the most recent assessment"""
+        latest = self.fan_out(lambda conn, index: conn.execute("SELECT MAX(id) FROM assessment_history").fetchone()[0])
+        return self.normalize_watermark([
+            last_id or index * SHARD_ID_SPAN for index, last_id in enumerate(latest)
+        ])
+
+    def fetch_assessment_rows(self, after=0, limit=None):
+        """Get raw assessment rows past a watermark, in id order; limit applies per shard"""
+        watermark = self.normalize_watermark(after)
+
+        def fetch(conn, index):
+            query = "SELECT * FROM assessment_history WHERE id > ? ORDER BY id"
+            params = [watermark[index]]
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
+
+            cursor = conn.execute(query, params)
+            return [description[0] for description in cursor.description], cursor.fetchall()
+
+        shards = self.fan_out(fetch)
+        columns = shards[0][0]
+        rows = [row for _, shard_rows in shards for row in shard_rows]
+        if len(shards) > 1:
+            rows.sort(key=lambda row: row[0])
+
+        return columns, rows
+
+    def table_signature(self, table, checksum_column=None):
+        """Cheap change check for a table: max rowid per shard for the append-only
+        user-scoped tables, (row count, max rowid) for the small catalog tables.
+        A checksum column (e.g. a row hash) also catches in-place updates"""
+        if table in USER_SCOPED_TABLES:
+            return tuple(self.fan_out(lambda conn, index: conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0]))
+        checksum = f", TOTAL({checksum_column})" if checksum_column else ""
+        conn = self.connect()
+        signature = conn.execute(f"SELECT COUNT(*), MAX(rowid){checksum} FROM {table}").fetchone()
+        conn.close()
+        return signature
+
+    def bump_table_version(self, c, table):
+        """Record a change to a catalog table, in the writer's transaction"""
+        c.execute('''
+            INSERT INTO table_versions (name, version) VALUES (?, 1)
+            ON CONFLICT (name) DO UPDATE SET version = version + 1
+        ''', (table,))
+
+    def get_table_version(self, table):
+        """How many times the app has changed a catalog table: one primary-key lookup"""
+        conn = self.connect()
+        row = conn.execute("SELECT version FROM table_versions WHERE name = ?", (table,)).fetchone()
+        conn.close()
+        return row[0] if row else 0
+
+    def read_changes_since(self, offset=0, limit=500):
+        """Change-feed events past an offset, and the offset to resume from; limit applies per shard"""
+        offset = self.normalize_watermark(offset)
+
+        def read(conn, index):
+            return conn.execute('''
+                SELECT id, op, assessment_id, username, payload, created_at
+                FROM assessment_changes WHERE id > ? ORDER BY id LIMIT ?
+            ''', (offset[index], limit)).fetchall()
+
+        events = [
+            {'offset': row[0], 'op': row[1], 'assessment_id': row[2], 'username': row[3],
+             'data': json.loads(row[4]), 'created_at': row[5]}
+            for shard in self.fan_out(read) for row in shard
+        ]
+        return events, self.advance_watermark(offset, [event['offset'] for event in events])
+
+    def read_deletes_since(self, offset=0):
+        """Ids of assessments deleted past a change-feed offset, and the offset of the feed's end"""
+        offset = self.normalize_watermark(offset)
+
+        def read(conn, index):
+            deleted = conn.execute(
+                "SELECT assessment_id FROM assessment_changes WHERE id > ? AND op = 'delete'", (offset[index],)
+            ).fetchall()
+            latest = conn.execute("SELECT MAX(id) FROM assessment_changes").fetchone()[0]
+            return [row[0] for row in deleted], max(latest or 0, offset[index])
+
+        shards = self.fan_out(read)
+        return [assessment_id for deleted, _ in shards for assessment_id in deleted], tuple(end for _, end in shards)
+
+    def get_change_offset(self, consumer):
+        """A consumer's committed change-feed offset (the start of the feed if it has none)"""
+        conn = self.connect()
+        row = conn.execute("SELECT offsets FROM change_feed_offsets WHERE consumer = ?", (consumer,)).fetchone()
+        conn.close()
+        return self.normalize_watermark(json.loads(row[0]) if row else 0)
+
+    def commit_change_offset(self, consumer, offset):
+        """Record that a consumer has processed every event up to offset"""
+        conn = self.connect()
+        conn.execute('''
+            INSERT INTO change_feed_offsets (consumer, offsets, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (consumer) DO UPDATE SET offsets = excluded.offsets, updated_at = excluded.updated_at
+        ''', (consumer, json.dumps(list(self.normalize_watermark(offset)))))
+        conn.commit()
+        conn.close()
+
+    def get_change_offsets(self):
+        """Committed offset of every consumer"""
+        conn = self.connect()
+        rows = conn.execute("SELECT consumer, offsets FROM change_feed_offsets").fetchall()
+        conn.close()
+        return {consumer: self.normalize_watermark(json.loads(offsets)) for consumer, offsets in rows}
+
     def insert_comprehensive_doctors(self):
         """Insert comprehensive doctors data with all locations"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         # Check if doctors already exist
@@ -290,17 +1003,78 @@ class UserDatabase:
                 ("Dr. Preethi Shreine", "Diabetologist", "Sunrise Health", "Chennai", 4.5, "+91-9876543222"),
             ]
             
-            cursor.executemany(
-                "INSERT INTO doctors (name, specialty, hospital, location, rating, contact) VALUES (?, ?, ?, ?, ?, ?)",
-                doctors_data
-            )
+            self.upsert_doctors(doctors_data, conn)
         
         conn.commit()
         conn.close()
+
+    def upsert_doctors(self, rows, conn=None, default_rating=None):
+        """Insert or update (name, specialty, hospital, location, rating, contact) rows in bulk.
+
+        Rows are matched on the natural key. A missing rating or contact keeps
+        the stored value. A new doctor without a rating gets default_rating, or
+        is skipped when there is none, so the directory never holds NULL
+        ratings. Rows whose content hash is already stored are skipped with one
+        index lookup. Returns inserted / updated / skipped / unrated counts.
+        """
+        own_conn = conn is None
+        conn = conn or self.connect()
+        conn.create_function("doctor_row_hash", 6, doctor_row_hash, deterministic=True)
+        c = conn.cursor()
+        key_match = " AND ".join(f"d.{column} = s.{column}" for column in DOCTOR_KEY)
+        columns = ", ".join(DOCTOR_COLUMNS)
+        try:
+            c.execute(f"CREATE TEMP TABLE IF NOT EXISTS doctor_staging ({columns}, row_hash INTEGER)")
+            c.execute("DELETE FROM doctor_staging")
+            c.executemany(
+                f"INSERT INTO doctor_staging ({columns}, row_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((*row, doctor_row_hash(*row)) for row in rows)
+            )
+            staged = c.execute("SELECT COUNT(*) FROM doctor_staging").fetchone()[0]
+
+            new_unrated = f"rating IS NULL AND NOT EXISTS (SELECT 1 FROM doctors d WHERE {key_match})"
+            if default_rating is None:
+                unrated = c.execute(f"DELETE FROM doctor_staging AS s WHERE {new_unrated}").rowcount
+            else:
+                unrated = 0
+                c.execute(f'''
+                    UPDATE doctor_staging AS s SET rating = ?,
+                        row_hash = doctor_row_hash(name, specialty, hospital, location, ?, contact)
+                    WHERE {new_unrated}
+                ''', (default_rating, default_rating))
+
+            # Exact copies of stored rows: hash index lookup, nothing to write
+            c.execute("DELETE FROM doctor_staging WHERE row_hash IN (SELECT row_hash FROM doctors)")
+            inserted = c.execute(f'''
+                SELECT COUNT(*) FROM doctor_staging s
+                WHERE NOT EXISTS (SELECT 1 FROM doctors d WHERE {key_match})
+            ''').fetchone()[0]
+
+            merged = "COALESCE(excluded.rating, rating), COALESCE(excluded.contact, contact)"
+            before = conn.total_changes
+            c.execute(f'''
+                INSERT INTO doctors ({columns}, row_hash)
+                SELECT {columns}, row_hash FROM doctor_staging WHERE true
+                ON CONFLICT ({", ".join(DOCTOR_KEY)}) DO UPDATE SET
+                    rating = COALESCE(excluded.rating, rating),
+                    contact = COALESCE(excluded.contact, contact),
+                    row_hash = doctor_row_hash(name, specialty, hospital, location, {merged})
+                WHERE row_hash IS NOT doctor_row_hash(name, specialty, hospital, location, {merged})
+            ''')
+            updated = conn.total_changes - before - inserted
+            c.execute("DELETE FROM doctor_staging")
+            if inserted or updated:
+                self.bump_table_version(c, 'doctors')
+            if own_conn:
+                conn.commit()
+        finally:
+            if own_conn:
+                conn.close()
+        return {'inserted': inserted, 'updated': updated, 'skipped': staged - inserted - updated, 'unrated': unrated}
     
     def get_doctors_by_specialty(self, specialty=None, location=None):
         """Get doctors filtered by specialty and location"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         query = "SELECT * FROM doctors WHERE 1=1"
@@ -326,7 +1100,7 @@ class UserDatabase:
     
     def get_all_specialties(self):
         """Get all unique specialties"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         cursor.execute("SELECT DISTINCT specialty FROM doctors ORDER BY specialty")
@@ -337,7 +1111,7 @@ class UserDatabase:
     
     def get_all_locations(self):
         """Get all unique locations"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
         
         cursor.execute("SELECT DISTINCT location FROM doctors ORDER BY location")
@@ -346,4 +1120,89 @@ class UserDatabase:
         
         return locations
 
-db = UserDatabase()
\ No newline at end of file
+def open_database(target=None, seed=None, num_shards=None):
+    """A UserDatabase for a file path, ':memory:' or 'memory:<name>'.
+
+    Arguments default to MEDWISE_DB, MEDWISE_DB_SEED and MEDWISE_DB_SHARDS.
+    An in-memory database is filled from the seed snapshot (a SQLite file, or
+    a shard directory) with the backup API before the usual idempotent
+    schema checks run. A seed that does not exist yet is built once.
+    """
+    storage = make_storage(
+        target or os.environ.get("MEDWISE_DB") or "feminine.db",
+        int(os.environ.get("MEDWISE_DB_SHARDS", "0") or 0) if num_shards is None else num_shards,
+        os.environ.get("MEDWISE_DB_DIR", "shards"),
+    )
+
+    seed = seed if seed is not None else os.environ.get("MEDWISE_DB_SEED")
+    if seed and hasattr(storage, 'load'):
+        seed_storage = make_storage(seed, storage.shard_count if storage.shard_count > 1 else 0, seed)
+        if not os.path.exists(seed):
+            UserDatabase(storage=seed_storage)
+        storage.load(seed_storage)
+    return UserDatabase(storage=storage)
+
+
+_default_db = None
+_default_db_lock = threading.Lock()
+
+
+def get_db():
+    """The process-wide UserDatabase, opened and initialised on first use"""
+    global _default_db
+    with _default_db_lock:
+        if _default_db is None:
+            _default_db = open_database()
+        return _default_db
+
+
+def set_db(database):
+    """Install the process-wide UserDatabase (e.g. a fresh in-memory one per test).
+
+    Pages, precompute jobs and the analytics replica all read through get_db().
+    Replacing an installed database also resets what was built from the old
+    one: the precompute scheduler with its published results, and the shared
+    assessment cache.
+    """
+    global _default_db, _replica, _replica_checked
+    with _default_db_lock:
+        previous = _default_db
+        _default_db = database
+    with _replica_lock:
+        _replica, _replica_checked = None, False
+
+    if previous is not None and previous is not database:
+        from utils.precompute import reset_precomputer
+        from utils.session_cache import clear_assessments
+        reset_precomputer()
+        clear_assessments()
+
+
+_replica = None
+_replica_checked = False
+_replica_lock = threading.Lock()
+
+
+def get_replica():
+    """The process-wide SnapshotReplica, or None unless MEDWISE_REPLICA_DIR is set"""
+    global _replica, _replica_checked
+    with _replica_lock:
+        if not _replica_checked:
+            from replica import replica_from_env
+            _replica = replica_from_env(get_db())
+            _replica_checked = True
+        return _replica
+
+
+def get_analytics_db():
+    """Database for admin analytics, cohorts and exports: the replica when one is configured"""
+    replica = get_replica()
+    return replica.database if replica else get_db()
+
+
+def __getattr__(name):
+    # `database.db` keeps working for scripts, without opening the
+    # database as a side effect of importing this module
+    if name == "db":
+        return get_db()
+    raise AttributeError(f"module 'database' has no attribute {name!r}")
@@ -0,0 +1,69 @@
+# records.py
+from collections import namedtuple
+from types import MappingProxyType
+
+ASSESSMENT_COLUMNS = (
+    'id', 'username', 'name', 'age', 'bmi', 'tsh_level', 'blood_sugar',
+    'irregular_periods', 'excess_hair_growth', 'acne', 'tiredness', 'hair_fall',
+    'frequent_urination', 'family_diabetes',
+    'pcos_risk', 'thyroid_risk', 'diabetes_risk',
+    'overall_risk', 'primary_disease', 'confidence', 'timestamp'
+)
+ASSESSMENT_SELECT = f"SELECT {', '.join(ASSESSMENT_COLUMNS)} FROM assessment_history"
+
+
+class Assessment(namedtuple('AssessmentRow', ASSESSMENT_COLUMNS)):
+    """One assessment_history row as a compact, immutable tuple.
+
+    The nested views the app works with are built from the row on access
+    instead of being stored alongside it.
+    """
+
+    __slots__ = ()
+
+    @property
+    def input_data(self):
+        return MappingProxyType({
+            'Age': self.age,
+            'BMI': self.bmi,
+            'TSH_Level': self.tsh_level,
+            'Blood_Sugar': self.blood_sugar,
+            'Irregular_Periods': self.irregular_periods,
+            'Excess_Hair_Growth': self.excess_hair_growth,
+            'Acne': self.acne,
+            'Tiredness': self.tiredness,
+            'Hair_Fall': self.hair_fall,
+            'Frequent_Urination': self.frequent_urination,
+            'Family_Diabetes': self.family_diabetes
+        })
+
+    @property
+    def predictions(self):
+        return MappingProxyType({
+            'pcos_risk': self.pcos_risk,
+            'thyroid_risk': self.thyroid_risk,
+            'diabetes_risk': self.diabetes_risk
+        })
+
+    @property
+    def diagnosis(self):
+        return MappingProxyType({
+            'primary_disease': self.primary_disease,
+            'confidence': self.confidence
+        })
+
+    # Name used by freshly built assessment dicts
+    disease_diagnosis = diagnosis
+
+    def to_dict(self):
+        """Flat columns plus the nested views, for exports"""
+        data = self._asdict()
+        data['input_data'] = dict(self.input_data)
+        data['predictions'] = dict(self.predictions)
+        data['disease_diagnosis'] = dict(self.diagnosis)
+        return data
+
+
+def assessment_row_factory(cursor, row):
+    """sqlite3 row factory for queries selecting ASSESSMENT_COLUMNS"""
+    return Assessment._make(row)
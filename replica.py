@@ -0,0 +1,149 @@
+# replica.py
+import os
+import time
+import sqlite3
+import argparse
+import threading
+from storage import SingleFileStorage
+
+
+class ReplicaStorage(SingleFileStorage):
+    """Read-only copies of another storage's catalog and shard files"""
+
+    def __init__(self, primary, directory):
+        self.primary = primary
+        self.directory = directory
+        self.paths = {
+            path: os.path.join(directory, f"replica-{i:02d}-{os.path.basename(path)}")
+            for i, path in enumerate(dict.fromkeys([primary.catalog_path] + primary.shard_paths))
+        }
+        self.db_path = self.paths[primary.catalog_path]
+        self.catalog_path = self.db_path
+        self.shard_paths = [self.paths[path] for path in primary.shard_paths]
+
+    def connect(self, path):
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+
+    def shard_index(self, username):
+        return self.primary.shard_index(username)
+
+
+class SnapshotReplica:
+    """A point-in-time copy of the database for read-heavy admin queries.
+
+    refresh() copies every primary file with SQLite's online backup API,
+    staged in memory so the primary is read-locked only briefly, then writes a
+    temporary file and swaps it in with os.replace. Readers always see a
+    complete copy and never hold locks on the primary. start() repeats that
+    on a background thread every ``interval`` seconds.
+    """
+
+    def __init__(self, primary, directory="replica", interval=60, pages=-1):
+        self.primary = primary
+        self.storage = ReplicaStorage(primary.storage, directory)
+        self.interval = interval
+        # Pages copied per backup step; -1 copies each file in one step
+        self.pages = pages
+        self.refreshes = 0
+        self.last_duration = None
+        self._database = None
+        self._thread = None
+        self._stop = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+
+    def refresh(self):
+        """Copy every primary file to the replica; returns the seconds it took"""
+        start = time.perf_counter()
+        for source_path, replica_path in self.storage.paths.items():
+            tmp_path = replica_path + ".tmp"
+            # Copy into memory first so the primary is only read-locked for a memory copy
+            source = self.primary.storage.connect(source_path)
+            staged = sqlite3.connect(":memory:")
+            try:
+                source.backup(staged, pages=self.pages)
+            finally:
+                source.close()
+
+            target = sqlite3.connect(tmp_path)
+            try:
+                target.execute("PRAGMA synchronous=OFF")
+                staged.backup(target)
+                # WAL shards copy over in WAL mode; a plain journal lets read-only connections open them
+                target.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                target.close()
+                staged.close()
+            os.replace(tmp_path, replica_path)
+
+        self.refreshes += 1
+        self.last_duration = time.perf_counter() - start
+        return self.last_duration
+
+    def is_ready(self):
+        return all(os.path.exists(path) for path in self.storage.paths.values())
+
+    def refreshed_at(self):
+        """When the oldest replica file was copied (epoch seconds), or None before the first refresh"""
+        if not self.is_ready():
+            return None
+        return min(os.path.getmtime(path) for path in self.storage.paths.values())
+
+    def staleness(self):
+        """Seconds since the replica was last refreshed, or None before the first refresh"""
+        refreshed_at = self.refreshed_at()
+        return None if refreshed_at is None else max(time.time() - refreshed_at, 0.0)
+
+    @property
+    def database(self):
+        """A read-only UserDatabase over the replica files"""
+        if self._database is None:
+            from database import UserDatabase
+            if not self.is_ready():
+                self.refresh()
+            self._database = UserDatabase(storage=self.storage, read_only=True)
+        return self._database
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing replica: {e}")
+
+    def start(self):
+        """Refresh now and then every interval on a daemon thread; interval 0 leaves refreshing to another process"""
+        if self._thread is None and self.interval > 0:
+            if not self.is_ready() or self.staleness() > self.interval:
+                self.refresh()
+            self._thread = threading.Thread(target=self.run, name="replica-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def replica_from_env(primary):
+    """A started SnapshotReplica when MEDWISE_REPLICA_DIR is set, else None"""
+    directory = os.environ.get("MEDWISE_REPLICA_DIR")
+    if not directory:
+        return None
+    interval = float(os.environ.get("MEDWISE_REPLICA_INTERVAL", "60") or 0)
+    return SnapshotReplica(primary, directory, interval).start()
+
+
+if __name__ == "__main__":
+    from database import get_db
+
+    parser = argparse.ArgumentParser(description="Keep a read replica of the database for admin analytics")
+    parser.add_argument("--dir", default=os.environ.get("MEDWISE_REPLICA_DIR", "replica"))
+    parser.add_argument("--interval", type=float, default=60, help="Seconds between refreshes")
+    parser.add_argument("--once", action="store_true", help="Refresh once and exit")
+    args = parser.parse_args()
+
+    replica = SnapshotReplica(get_db(), args.dir, args.interval)
+    while True:
+        print(f"Replica refreshed in {replica.refresh() * 1000:.1f} ms")
+        if args.once:
+            break
+        time.sleep(args.interval)
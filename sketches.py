@@ -0,0 +1,255 @@
+# sketches.py
+import math
+import random
+import hashlib
+import struct
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+# Population metrics tracked per shard: sketch name -> (assessment section, key).
+# Sketch names match the assessment_history columns they summarise.
+METRICS = {
+    'blood_sugar': ('input_data', 'Blood_Sugar'),
+    'tsh_level': ('input_data', 'TSH_Level'),
+    'bmi': ('input_data', 'BMI'),
+    'pcos_risk': ('predictions', 'pcos_risk'),
+    'thyroid_risk': ('predictions', 'thyroid_risk'),
+    'diabetes_risk': ('predictions', 'diabetes_risk'),
+}
+
+DEFAULT_K = 200
+# Normalised rank error of a KLL sketch with k=200, at 99% confidence
+RANK_ERROR = 0.0165
+
+
+def metric_values(assessment_data):
+    """The sketched metric values of one assessment, keyed by sketch name"""
+    return {metric: assessment_data[section].get(key) for metric, (section, key) in METRICS.items()}
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang & Liberty).
+
+    Keeps levels of sampled values; an item on level h stands for 2**h
+    inputs. When the sketch is full, the lowest over-capacity level is sorted
+    and every other item (from a random offset) is promoted a level. It keeps
+    about 3k values however many it has seen. With k=200, rank() and
+    quantile() are within RANK_ERROR (about 1.7 percentile points) of the exact
+    answer with 99% confidence. Sketches built on different shards merge with
+    the same guarantee.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [[]]
+        self._rng = random.Random(seed)
+        self._sorted = None
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def retained(self):
+        return sum(len(items) for items in self.levels)
+
+    def is_full(self):
+        return self.retained() >= sum(self.capacity(h) for h in range(len(self.levels)))
+
+    def update(self, value):
+        if value is None or value != value:
+            return
+        self.levels[0].append(float(value))
+        self.n += 1
+        self._sorted = None
+        while self.is_full():
+            self.compact()
+
+    def compact(self):
+        for h, items in enumerate(self.levels):
+            if len(items) >= self.capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                items.sort()
+                keep = [items.pop()] if len(items) % 2 else []
+                self.levels[h + 1].extend(items[self._rng.randint(0, 1)::2])
+                self.levels[h] = keep
+                return
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        self._sorted = None
+        while self.is_full():
+            self.compact()
+        return self
+
+    def sorted_view(self):
+        """Retained values in order with their cumulative weights"""
+        if self._sorted is None:
+            weighted = sorted((value, 1 << h) for h, items in enumerate(self.levels) for value in items)
+            values, cumulative, total = [], [], 0
+            for value, weight in weighted:
+                total += weight
+                values.append(value)
+                cumulative.append(total)
+            self._sorted = (values, cumulative)
+        return self._sorted
+
+    def rank(self, value):
+        """Estimated share of inputs below value, counting ties as half"""
+        if not self.n:
+            return None
+        values, cumulative = self.sorted_view()
+        lo, hi = bisect_left(values, value), bisect_right(values, value)
+        below = cumulative[lo - 1] if lo else 0
+        at_or_below = cumulative[hi - 1] if hi else 0
+        return (below + at_or_below) / 2 / cumulative[-1]
+
+    def quantile(self, q):
+        if not self.n:
+            return None
+        values, cumulative = self.sorted_view()
+        index = bisect_left(cumulative, q * cumulative[-1])
+        return values[min(index, len(values) - 1)]
+
+    def to_bytes(self):
+        sizes = [len(items) for items in self.levels]
+        return (struct.pack(f"<3q{len(sizes)}q", self.k, self.n, len(sizes), *sizes)
+                + array('d', [value for items in self.levels for value in items]).tobytes())
+
+    @classmethod
+    def from_bytes(cls, blob):
+        k, n, num_levels = struct.unpack_from("<3q", blob)
+        sizes = struct.unpack_from(f"<{num_levels}q", blob, 24)
+        values = array('d')
+        values.frombytes(blob[24 + 8 * num_levels:])
+        sketch = cls(k)
+        sketch.n = n
+        sketch.levels, start = [], 0
+        for size in sizes:
+            sketch.levels.append(values[start:start + size].tolist())
+            start += size
+        return sketch
+
+
+HLL_PRECISION = 14
+HLL_REGISTERS = 1 << HLL_PRECISION
+# Standard error of a HyperLogLog estimate with 2**14 registers: 1.04 / sqrt(16384)
+HLL_ERROR = 1.04 / math.sqrt(HLL_REGISTERS)
+
+
+class HyperLogLog:
+    """Distinct-count sketch (Flajolet et al.) over one byte per register.
+
+    A value's 64-bit hash picks a register (its top HLL_PRECISION bits) and
+    a rank (leading zeros of the remaining bits, plus one); each register
+    keeps the highest rank it has seen. Merging is a register-wise max, so
+    daily sketches combine into any window. Estimates have a standard error
+    of HLL_ERROR (0.8%) across the whole range.
+    """
+
+    def __init__(self, registers=None):
+        self.registers = bytearray(registers) if registers is not None else bytearray(HLL_REGISTERS)
+
+    @staticmethod
+    def position(value):
+        """(register index, rank) of a value"""
+        digest = int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+        bits = 64 - HLL_PRECISION
+        return digest >> bits, bits - (digest & ((1 << bits) - 1)).bit_length() + 1
+
+    def add(self, value):
+        index, rank = self.position(value)
+        if self.registers[index] < rank:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        # numpy is imported here, not at module level, to keep database imports light
+        import numpy as np
+        merged = np.maximum(np.frombuffer(self.registers, np.uint8), np.frombuffer(bytes(other.registers), np.uint8))
+        self.registers = bytearray(merged.tobytes())
+        return self
+
+    def estimate(self):
+        # Ertl's improved raw estimator: unbiased from small to large counts without
+        # switching to linear counting or bias-correction tables
+        m = HLL_REGISTERS
+        q = 64 - HLL_PRECISION
+        counts = Counter(self.registers)
+        z = m * _hll_tau(1 - counts[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + counts[k])
+        z += m * _hll_sigma(counts[0] / m)
+        return int(round(m * m / (2 * math.log(2)) / z)) if z != math.inf else 0
+
+    def to_bytes(self):
+        return bytes(self.registers)
+
+
+def _hll_sigma(x):
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous, z = z, z + x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _hll_tau(x):
+    if x in (0, 1):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        y *= 0.5
+        previous, z = z, z - (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+def population_percentiles(sketches, assessment_data, min_population=20):
+    """Percentile (0-100) of each metric of an assessment against the sketched population.
+
+    Metrics with fewer than min_population recorded values are left out.
+    """
+    percentiles = {}
+    for metric, value in metric_values(assessment_data).items():
+        sketch = sketches.get(metric)
+        if value is None or sketch is None or sketch.n < min_population:
+            continue
+        percentiles[metric] = sketch.rank(float(value)) * 100
+    return percentiles
+
+
+if __name__ == "__main__":
+    from database import get_db, ACTIVE_WINDOWS
+
+    parser = argparse.ArgumentParser(description="Percentile and distinct-user sketches over the history tables")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every shard's sketches from history")
+    parser.add_argument("--exact", action="store_true", help="Also count active users exactly, for auditing")
+    args = parser.parse_args()
+
+    db = get_db()
+    if args.rebuild:
+        counts = db.rebuild_metric_sketches()
+        print(f"Rebuilt sketches from {sum(counts)} assessment(s) across {len(counts)} shard(s)")
+        days = db.rebuild_login_sketches()
+        print(f"Rebuilt {sum(days)} daily login sketch(es)")
+    for metric, sketch in db.get_metric_sketches().items():
+        median, p90 = sketch.quantile(0.5), sketch.quantile(0.9)
+        print(f"{metric:<14} n={sketch.n:<9} retained={sketch.retained():<5} "
+              f"median={median if median is None else round(median, 3)} p90={p90 if p90 is None else round(p90, 3)}")
+    for days in ACTIVE_WINDOWS:
+        line = f"active users, {days:>2} day(s): ~{db.get_active_users(days)}"
+        if args.exact:
+            line += f" (exact {db.get_active_users(days, exact=True)})"
+        print(line)
@@ -0,0 +1,131 @@
+# storage.py
+import os
+import uuid
+import sqlite3
+import hashlib
+
+# Ids in shard k start at k * SHARD_ID_SPAN, so every id is globally unique
+# and id // SHARD_ID_SPAN tells which shard a row came from
+SHARD_ID_SPAN = 10 ** 12
+USER_SCOPED_TABLES = ('assessment_history', 'login_history', 'assessment_changes')
+
+
+class SingleFileStorage:
+    """Every table in one SQLite file"""
+
+    def __init__(self, db_path="feminine.db"):
+        self.db_path = db_path
+        self.catalog_path = db_path
+        self.shard_paths = [db_path]
+
+    @property
+    def shard_count(self):
+        return len(self.shard_paths)
+
+    def connect(self, path):
+        return sqlite3.connect(path, timeout=30)
+
+    def shard_index(self, username):
+        return 0
+
+    def shard_path(self, username):
+        return self.shard_paths[self.shard_index(username)]
+
+    def shard_of_id(self, row_id):
+        return min(row_id // SHARD_ID_SPAN, self.shard_count - 1)
+
+    def init_shard(self, conn, index):
+        """Prepare a freshly created shard file"""
+
+
+class ShardedStorage(SingleFileStorage):
+    """users and doctors in a shared catalog file, user-scoped tables split by username hash.
+
+    Each shard is its own SQLite file with its own write lock, so writers for
+    users on different shards never wait on each other.
+    """
+
+    def __init__(self, directory, num_shards=4):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.db_path = os.path.join(directory, "catalog.db")
+        self.catalog_path = self.db_path
+        self.shard_paths = [os.path.join(directory, f"shard-{i:02d}.db") for i in range(num_shards)]
+
+    def shard_index(self, username):
+        # hash() is salted per process, so use a stable digest
+        digest = hashlib.md5(username.encode()).digest()
+        return int.from_bytes(digest[:8], 'big') % self.shard_count
+
+    def init_shard(self, conn, index):
+        conn.execute("PRAGMA journal_mode=WAL")
+        self.init_id_range(conn, index)
+
+    def init_id_range(self, conn, index):
+        for table in USER_SCOPED_TABLES:
+            exists = conn.execute("SELECT 1 FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+            if not exists:
+                conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                             (table, index * SHARD_ID_SPAN))
+
+
+class MemoryStorage(ShardedStorage):
+    """The same layout held in memory, for tests and benchmarks.
+
+    Uses SQLite's memdb VFS: every connection to the same name sees one
+    database, and writers wait on the busy timeout like they do on files.
+    (Shared-cache :memory: databases fail at once with "table is locked"
+    instead.) An unnamed storage gets a private name. A named one is shared
+    by every MemoryStorage with that name in the process. The data lives
+    until close() drops the last connection.
+    """
+
+    def __init__(self, name=None, num_shards=1):
+        self.name = name or f"medwise-{uuid.uuid4().hex}"
+        self.directory = None
+        if num_shards > 1:
+            self.catalog_path = self.uri("catalog")
+            self.shard_paths = [self.uri(f"shard-{i:02d}") for i in range(num_shards)]
+        else:
+            self.catalog_path = self.uri("main")
+            self.shard_paths = [self.catalog_path]
+        self.db_path = self.catalog_path
+        # A memdb database is freed when its last connection closes
+        self._keepalive = [self.connect(path) for path in dict.fromkeys([self.catalog_path] + self.shard_paths)]
+
+    def uri(self, part):
+        return f"file:/{self.name}-{part}?vfs=memdb"
+
+    def connect(self, path):
+        return sqlite3.connect(path, uri=True, timeout=30, check_same_thread=False)
+
+    def init_shard(self, conn, index):
+        self.init_id_range(conn, index)
+
+    def load(self, snapshot):
+        """Replace the contents with a snapshot storage of the same layout, via the backup API"""
+        if snapshot.shard_count != self.shard_count:
+            raise ValueError(f"Snapshot has {snapshot.shard_count} shard(s), this storage has {self.shard_count}")
+        pairs = dict(zip([snapshot.catalog_path] + snapshot.shard_paths, [self.catalog_path] + self.shard_paths))
+        for source_path, target_path in pairs.items():
+            source, target = snapshot.connect(source_path), self.connect(target_path)
+            try:
+                source.backup(target)
+            finally:
+                source.close()
+                target.close()
+        return self
+
+    def close(self):
+        for conn in self._keepalive:
+            conn.close()
+        self._keepalive = []
+
+
+def make_storage(target="feminine.db", num_shards=0, directory="shards"):
+    """Storage for a target: a file path, ':memory:' (private) or 'memory:<name>' (shared by name in this process)"""
+    if target == ":memory:" or target.startswith("memory:"):
+        return MemoryStorage(target[len("memory:"):] if target.startswith("memory:") else None, max(num_shards, 1))
+    if num_shards > 1:
+        return ShardedStorage(directory, num_shards)
+    return SingleFileStorage(target)
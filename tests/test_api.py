@@ -0,0 +1,82 @@
+# tests/test_api.py
+import os
+import sys
+import json
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import open_database
+from api import API_USERNAME, ScoringService
+
+RECORD = {'name': '', 'Age': 30, 'BMI': 27, 'TSH_Level': 5.1, 'Blood_Sugar': 130, 'Tiredness': 1}
+
+
+class FakeRequest:
+    def __init__(self, body):
+        self.body = body
+
+    async def json(self):
+        return self.body
+
+
+def call(db, handler, body):
+    async def run():
+        service = ScoringService(persist=True, database=db)
+        async with service.lifespan(None):
+            response = await getattr(service, handler)(FakeRequest(body))
+        return json.loads(response.body)
+    return asyncio.run(run())
+
+
+def api_rows(db):
+    return len(db.get_user_assessments(API_USERNAME))
+
+
+def test_identical_records_from_different_patients_are_all_saved():
+    db = open_database(':memory:', seed='')
+    response = call(db, 'assess_batch', {'records': [dict(RECORD), dict(RECORD)]})
+    assert response['duplicates'] == 0
+    assert api_rows(db) == 2
+
+    call(db, 'assess', dict(RECORD))
+    assert api_rows(db) == 3
+
+
+def test_retried_record_id_is_reported_as_duplicate():
+    db = open_database(':memory:', seed='')
+    first = call(db, 'assess', dict(RECORD, record_id='lab-17'))
+    retry = call(db, 'assess_batch', {'records': [dict(RECORD, record_id='lab-17'), dict(RECORD, record_id='lab-18')]})
+
+    assert first['duplicate'] is False
+    assert [result['duplicate'] for result in retry['results']] == [True, False]
+    assert retry['results'][0]['assessment_id'] == first['assessment_id']
+    assert retry['duplicates'] == 1
+    assert api_rows(db) == 2
+
+
+def test_save_assessments_reports_created_per_item():
+    db = open_database(':memory:', seed='')
+    assessment = call(open_database(':memory:', seed=''), 'assess', dict(RECORD))
+    items = [(API_USERNAME, dict(assessment, submission_id='a')), (API_USERNAME, dict(assessment, submission_id='b')),
+             (API_USERNAME, dict(assessment, submission_id='a'))]
+
+    results = db.save_assessments(items)
+    assert [created for _, created in results] == [True, True, False]
+    assert results[2][0] == results[0][0]
+    assert api_rows(db) == 2
+
+
+def test_concurrent_requests_share_micro_batches():
+    async def run():
+        service = ScoringService()
+        async with service.lifespan(None):
+            responses = await asyncio.gather(*[
+                service.assess(FakeRequest(dict(RECORD, Age=20 + i))) for i in range(50)
+            ])
+        return service, [json.loads(response.body) for response in responses]
+
+    service, results = asyncio.run(run())
+    assert [result['input_data']['Age'] for result in results] == [20 + i for i in range(50)]
+    assert service.batcher.records == 50
+    assert service.batcher.batches < 50
@@ -0,0 +1,40 @@
+# tests/test_breakpoints.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from utils.data_processor import BMI_BREAKPOINTS, TSH_BREAKPOINTS, SUGAR_BREAKPOINTS, AGE_BREAKPOINTS
+
+
+def assert_scalar_matches_array(breakpoints, values):
+    array = list(breakpoints.categorize_array(values))
+    scalar = [breakpoints.categorize(value) for value in values]
+    # Categorical returns NaN for a missing category where the scalar path returns None
+    assert [None if label != label else label for label in array] == scalar
+    return scalar
+
+
+def around(edges):
+    return [value for edge in edges for value in (np.nextafter(edge, -np.inf), edge, np.nextafter(edge, np.inf))]
+
+
+def test_tsh_boundaries():
+    labels = assert_scalar_matches_array(TSH_BREAKPOINTS, [0.4, 4.0, np.nextafter(4.0, np.inf)])
+    assert labels == ['Normal', 'Normal', 'High (Hypothyroidism)']
+    assert_scalar_matches_array(TSH_BREAKPOINTS, around(TSH_BREAKPOINTS.edges))
+
+
+def test_sugar_boundaries():
+    labels = assert_scalar_matches_array(SUGAR_BREAKPOINTS, [70, 100, 100.5, 125, 125.5])
+    assert labels == ['Normal', 'Normal', 'Pre-diabetes', 'Pre-diabetes', 'Diabetes']
+    assert_scalar_matches_array(SUGAR_BREAKPOINTS, around(SUGAR_BREAKPOINTS.edges))
+
+
+def test_exclusive_edges_and_missing_values():
+    for breakpoints in (BMI_BREAKPOINTS, AGE_BREAKPOINTS):
+        assert_scalar_matches_array(breakpoints, around(breakpoints.edges))
+    assert BMI_BREAKPOINTS.categorize(25) == 'Overweight'
+    assert assert_scalar_matches_array(TSH_BREAKPOINTS, [np.nan]) == [None]
+    assert list(TSH_BREAKPOINTS.codes([np.nan, 1.0])) == [-1, 1]
@@ -0,0 +1,51 @@
+# tests/test_doctor_loader.py
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+from database import open_database
+from utils.doctor_loader import load_doctors, normalize_doctors
+
+CSV_PATH = os.path.join(ROOT, 'data', 'doctor_patient.csv')
+
+
+def test_doctor_name_wins_over_patient_name():
+    df = normalize_doctors(pd.DataFrame({
+        'Name': ['Shreya Gupta'], 'DoctorName': ['Dr. Nazneen'], 'Recommended_Specialist': ['General Physician'],
+        'HospitalName': ['Deepan Hospitals'], 'HospitalLocation': ['Coimbatore'],
+    }))
+    assert list(df['name']) == ['Dr. Nazneen']
+    assert list(df['hospital']) == ['Deepan Hospitals']
+    assert list(df['location']) == ['Coimbatore']
+
+
+def test_bundled_csv_loads_only_rated_doctors():
+    db = open_database(':memory:', seed='')
+    before = len(db.get_doctors_by_specialty())
+
+    summary = load_doctors(CSV_PATH, db)
+    assert summary['inserted'] == 0
+    assert summary['unrated'] > 0
+    assert len(db.get_doctors_by_specialty()) == before
+
+    summary = load_doctors(CSV_PATH, db, default_rating=4.0)
+    assert summary['inserted'] > 0
+    doctors = db.get_doctors_by_specialty()
+    assert all(doctor['rating'] is not None for doctor in doctors)
+
+    csv_doctors = set(pd.read_csv(CSV_PATH)['DoctorName'].str.strip())
+    patients = set(pd.read_csv(CSV_PATH)['Name'])
+    names = {doctor['name'] for doctor in doctors}
+    assert csv_doctors <= names
+    assert not names & patients
+
+
+def test_reload_keeps_stored_ratings():
+    db = open_database(':memory:', seed='')
+    load_doctors(CSV_PATH, db, default_rating=4.0)
+    summary = load_doctors(CSV_PATH, db, default_rating=3.0)
+    assert summary['inserted'] == 0 and summary['updated'] == 0
+    assert {doctor['rating'] for doctor in db.get_doctors_by_specialty() if doctor['specialty'] == 'General Physician'} >= {4.0}
@@ -0,0 +1,13 @@
+# tests/test_import_budget.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from import_budget import check_budgets
+
+
+def test_entry_points_import_within_budget():
+    """Every entry point imports within its cold-start budget, without eager heavy modules"""
+    failures = check_budgets(runs=3, report=lambda line: None)
+    assert not failures, "\n".join(failures)
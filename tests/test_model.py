@@ -0,0 +1,44 @@
+# tests/test_model.py
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from utils.model import HealthPredictor, TrainedHealthPredictor
+from utils.evaluation import load_labelled_data
+
+# Ragged records: each leaves out some features, which predict() treats as 0
+RECORDS = [
+    {'Age': 30, 'BMI': 27.0, 'TSH_Level': 5.1, 'Blood_Sugar': 130, 'Tiredness': 1},
+    {'Age': 45, 'BMI': 31.0, 'Blood_Sugar': 99, 'Irregular_Periods': 1, 'Acne': 1},
+    {'BMI': 22.0, 'TSH_Level': 0.3},
+    {'Age': 60, 'Frequent_Urination': 1, 'Family_Diabetes': 1, 'Blood_Sugar': 140},
+    {},
+]
+
+
+def assert_batch_matches_scalar(predictor):
+    batch = predictor.predict_batch(RECORDS)
+    for i, record in enumerate(RECORDS):
+        scalar = predictor.predict(record)
+        for risk, value in scalar.items():
+            assert abs(batch[risk][i] - value) < 1e-9, (i, risk, batch[risk][i], value)
+
+
+def test_rule_predict_batch_matches_predict_on_missing_keys():
+    assert_batch_matches_scalar(HealthPredictor())
+
+
+def test_forest_predict_batch_matches_predict_on_missing_keys():
+    predictor = TrainedHealthPredictor(n_estimators=10, max_depth=6, n_jobs=1, random_state=0)
+    predictor.fit(load_labelled_data(os.path.join(ROOT, 'data', 'doctor_patient.csv')))
+    assert_batch_matches_scalar(predictor)
+    assert_batch_matches_scalar(predictor.compile())
+
+
+def test_missing_features_are_zero_not_nan():
+    arrays = HealthPredictor().feature_arrays(RECORDS)
+    assert not any(np.isnan(values).any() for values in arrays.values())
+    assert arrays['TSH_Level'][1] == 0
@@ -0,0 +1,43 @@
+# tests/test_precompute.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import open_database
+from utils.precompute import Precomputer, register_default_jobs
+
+DOCTOR = ('Dr. Meera Rao', 'Endocrinologist', 'City Hospital', 'Madurai', 4.6, None)
+
+
+def test_doctor_version_moves_only_when_doctors_change():
+    db = open_database(':memory:', seed='')
+    version = db.get_table_version('doctors')
+
+    db.upsert_doctors([DOCTOR])
+    assert db.get_table_version('doctors') == version + 1
+    db.upsert_doctors([DOCTOR])
+    assert db.get_table_version('doctors') == version + 1
+    db.upsert_doctors([DOCTOR[:4] + (4.9, None)])
+    assert db.get_table_version('doctors') == version + 2
+
+
+def test_doctor_jobs_rerun_after_upsert():
+    db = open_database(':memory:', seed='')
+    precomputer = register_default_jobs(Precomputer(), db)
+    precomputer.run_due()
+    assert precomputer.run_due() == []
+
+    db.upsert_doctors([DOCTOR[:1] + ('Zoologist',) + DOCTOR[2:]])
+    assert set(precomputer.run_due()) == {'specialties', 'locations', 'doctor_directory'}
+    assert 'Zoologist' in precomputer.get('specialties')
+
+
+def test_trigger_interval_spaces_out_trigger_reads():
+    reads = []
+    precomputer = Precomputer().register('job', lambda: None, trigger=lambda: reads.append(1) or len(reads),
+                                         trigger_interval=60)
+    precomputer.run_due()
+    precomputer.run_due()
+    precomputer.run_due()
+    assert len(reads) == 1
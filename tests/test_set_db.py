@@ -0,0 +1,37 @@
+# tests/test_set_db.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import database
+from database import open_database, set_db
+from utils.precompute import get_precomputer, precomputed
+from utils.session_cache import get_assessment
+from utils.assessment import build_assessment
+from utils.model import HealthPredictor
+
+INPUT = {'Age': 30, 'BMI': 27.0, 'TSH_Level': 5.1, 'Blood_Sugar': 130.0, 'Irregular_Periods': 0,
+         'Excess_Hair_Growth': 0, 'Acne': 0, 'Tiredness': 1, 'Hair_Fall': 0, 'Frequent_Urination': 0,
+         'Family_Diabetes': 0}
+
+
+def teardown_function():
+    set_db(None)
+
+
+def test_set_db_replaces_database_and_resets_singletons():
+    first = open_database(':memory:', seed='')
+    set_db(first)
+    first.upsert_doctors([('Dr. Only First', 'Zoologist', 'First Hospital', 'Pune', 4.5, None)])
+    assessment_id, _ = first.save_assessment('jane', build_assessment('Jane', INPUT, HealthPredictor().predict(INPUT)))
+    assert get_assessment(assessment_id) is not None
+    scheduler = get_precomputer()
+    assert 'Zoologist' in precomputed('specialties')
+
+    second = open_database(':memory:', seed='')
+    set_db(second)
+    assert database.get_db() is second
+    assert get_precomputer() is not scheduler
+    assert get_assessment(assessment_id) is None
+    assert 'Zoologist' not in precomputed('specialties')
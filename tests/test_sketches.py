@@ -0,0 +1,32 @@
+# tests/test_sketches.py
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sketches import KLLSketch, HyperLogLog, HLL_ERROR
+
+
+def test_kll_ranks_within_bounds_after_merge_and_round_trip():
+    rng = random.Random(0)
+    left, right = KLLSketch(seed=1), KLLSketch(seed=2)
+    for _ in range(20000):
+        left.update(rng.random())
+        right.update(rng.random())
+    sketch = KLLSketch.from_bytes(left.merge(right).to_bytes())
+
+    assert sketch.n == 40000
+    for value in (0.1, 0.25, 0.5, 0.9):
+        assert abs(sketch.rank(value) - value) < 0.02
+    assert abs(sketch.quantile(0.5) - 0.5) < 0.02
+
+
+def test_hll_estimate_and_merge():
+    left, right = HyperLogLog(), HyperLogLog()
+    for i in range(30000):
+        left.add(f"user{i}")
+        right.add(f"user{i + 20000}")
+    assert abs(left.estimate() - 30000) < 30000 * 4 * HLL_ERROR
+    assert abs(left.merge(right).estimate() - 50000) < 50000 * 4 * HLL_ERROR
+    assert HyperLogLog().estimate() == 0
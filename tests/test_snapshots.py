@@ -0,0 +1,51 @@
+# tests/test_snapshots.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import open_database
+from utils.assessment import build_assessment
+from utils.model import HealthPredictor
+from utils.snapshots import AssessmentSnapshot
+
+
+def save(db, count):
+    predictor = HealthPredictor()
+    for i in range(count):
+        input_data = {'Age': 20 + i, 'BMI': 24.0, 'TSH_Level': 2.0, 'Blood_Sugar': 90.0, 'Irregular_Periods': 0,
+                      'Excess_Hair_Growth': 0, 'Acne': 0, 'Tiredness': 0, 'Hair_Fall': 0,
+                      'Frequent_Urination': 0, 'Family_Diabetes': 0}
+        db.save_assessment(f"user{i}", build_assessment(f"Patient {i}", input_data, predictor.predict(input_data)))
+
+
+def test_run_without_new_rows_keeps_version(tmp_path):
+    db = open_database(':memory:', seed='')
+    save(db, 3)
+    snapshot = AssessmentSnapshot(str(tmp_path), db)
+    assert snapshot.run() == 3
+    version = snapshot.version()
+
+    assert snapshot.run() == 0
+    assert snapshot.version() == version
+    assert sum(row['count'] for row in snapshot.diagnosis_distribution()) == 3
+
+
+def test_deleted_assessments_rebuild_the_snapshot(tmp_path):
+    db = open_database(':memory:', seed='')
+    save(db, 3)
+    snapshot = AssessmentSnapshot(str(tmp_path), db)
+    snapshot.run()
+    removed = int(snapshot.load()['id'].iloc[0])
+
+    # What the dedup migration does for each duplicate it removes
+    conn = db.storage.connect(db.storage.shard_paths[0])
+    conn.execute("INSERT INTO assessment_changes (op, assessment_id, username, payload) VALUES ('delete', ?, 'user0', '{}')",
+                 (removed,))
+    conn.execute("DELETE FROM assessment_history WHERE id = ?", (removed,))
+    conn.commit()
+    conn.close()
+
+    assert snapshot.run() == 2
+    assert removed not in set(snapshot.load()['id'])
+    assert snapshot.run() == 0
@@ -0,0 +1,53 @@
+# tests/test_storage.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import open_database
+from storage import SHARD_ID_SPAN
+from utils.assessment import build_assessment
+from utils.change_feed import ChangeFeedConsumer
+from utils.model import HealthPredictor
+
+INPUT = {'Age': 30, 'BMI': 27.0, 'TSH_Level': 5.1, 'Blood_Sugar': 130.0, 'Irregular_Periods': 0,
+         'Excess_Hair_Growth': 0, 'Acne': 0, 'Tiredness': 1, 'Hair_Fall': 0, 'Frequent_Urination': 0,
+         'Family_Diabetes': 0}
+ASSESSMENT = build_assessment('Jane', INPUT, HealthPredictor().predict(INPUT))
+
+
+def test_sharded_ids_fall_in_their_shards_range():
+    db = open_database(':memory:', seed='', num_shards=4)
+    for i in range(20):
+        username = f"user{i}"
+        assessment_id, created = db.save_assessment(username, ASSESSMENT)
+        assert created
+        assert assessment_id // SHARD_ID_SPAN == db.storage.shard_index(username)
+        assert db.storage.shard_of_id(assessment_id) == db.storage.shard_index(username)
+    assert len({db.storage.shard_index(f"user{i}") for i in range(20)}) > 1
+
+
+def test_resubmission_is_deduplicated_but_another_patient_is_not():
+    db = open_database(':memory:', seed='')
+    first = db.save_assessment('demo', ASSESSMENT)
+    assert first[1]
+    assert db.save_assessment('demo', dict(ASSESSMENT)) == (first[0], False)
+
+    other_id, created = db.save_assessment('demo', dict(ASSESSMENT, name='Priya'))
+    assert created and other_id != first[0]
+    assert len(db.get_user_assessments('demo')) == 2
+
+
+def test_change_feed_delivers_each_created_assessment_once():
+    db = open_database(':memory:', seed='', num_shards=2)
+    consumer = ChangeFeedConsumer('test', db)
+    consumer.run(lambda events: None, once=True)
+
+    ids = [db.save_assessment(f"user{i}", ASSESSMENT)[0] for i in range(6)]
+    db.save_assessment('user0', ASSESSMENT)
+    events = consumer.poll()
+    assert sorted(event['assessment_id'] for event in events) == sorted(ids)
+    assert {event['op'] for event in events} == {'insert'}
+
+    consumer.commit()
+    assert ChangeFeedConsumer('test', db).poll() == []
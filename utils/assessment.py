@@ -0,0 +1,144 @@
+# utils/assessment.py
+from datetime import datetime
+
+# Shared scoring logic used by the Streamlit app and the scoring API
+
+
+def get_disease_diagnosis(predictions, input_data):
+    """Score symptoms and risks to find the most likely condition"""
+    diagnosis = {
+        'primary_disease': None, 'confidence': 0, 'symptoms_matched': [], 'recommendations': []
+    }
+
+    pcos_score = 0
+    thyroid_score = 0
+    diabetes_score = 0
+
+    if input_data['Irregular_Periods']:
+        pcos_score += 3
+        diagnosis['symptoms_matched'].append("Irregular Periods - Strong indicator of PCOS")
+    if input_data['Excess_Hair_Growth']:
+        pcos_score += 2
+        diagnosis['symptoms_matched'].append("Excess Hair Growth - Common in PCOS")
+    if input_data['Acne']:
+        pcos_score += 1
+        diagnosis['symptoms_matched'].append("Acne - Can be related to PCOS")
+
+    if input_data['TSH_Level'] < 0.4 or input_data['TSH_Level'] > 4.0:
+        thyroid_score += 3
+        diagnosis['symptoms_matched'].append(f"TSH Level {input_data['TSH_Level']} - Outside normal range (0.4-4.0)")
+    if input_data['Tiredness']:
+        thyroid_score += 2
+        diagnosis['symptoms_matched'].append("Fatigue - Common thyroid symptom")
+    if input_data['Hair_Fall']:
+        thyroid_score += 1
+        diagnosis['symptoms_matched'].append("Hair Fall - Thyroid-related symptom")
+
+    if input_data['Blood_Sugar'] > 126:
+        diabetes_score += 3
+        diagnosis['symptoms_matched'].append(f"Blood Sugar {input_data['Blood_Sugar']} mg/dL - High (Normal: <100 mg/dL)")
+    if input_data['Frequent_Urination']:
+        diabetes_score += 2
+        diagnosis['symptoms_matched'].append("Frequent Urination - Classic diabetes symptom")
+    if input_data['Family_Diabetes']:
+        diabetes_score += 1
+        diagnosis['symptoms_matched'].append("Family History of Diabetes - Increases risk")
+
+    scores = {
+        'PCOS': pcos_score + predictions['pcos_risk'] * 10,
+        'Thyroid': thyroid_score + predictions['thyroid_risk'] * 10,
+        'Diabetes': diabetes_score + predictions['diabetes_risk'] * 10
+    }
+
+    diagnosis['primary_disease'] = max(scores, key=scores.get)
+    diagnosis['confidence'] = scores[diagnosis['primary_disease']] / 13 * 100
+
+    if diagnosis['primary_disease'] == 'PCOS':
+        diagnosis['recommendations'] = [
+            "Consult a Gynecologist for proper diagnosis",
+            "Consider lifestyle changes including diet and exercise",
+            "Monitor menstrual cycles regularly"
+        ]
+    elif diagnosis['primary_disease'] == 'Thyroid':
+        diagnosis['recommendations'] = [
+            "Consult an Endocrinologist for TSH level evaluation",
+            "Regular thyroid function tests recommended",
+            "Discuss medication options if needed"
+        ]
+    else:
+        diagnosis['recommendations'] = [
+            "Consult a Diabetologist for blood sugar management",
+            "Monitor blood glucose levels regularly",
+            "Follow a diabetic diet and exercise regimen"
+        ]
+
+    return diagnosis
+
+
+def calculate_overall_risk(predictions):
+    """Overall risk level from the highest individual risk"""
+    max_risk = max(
+        predictions.get('pcos_risk', 0),
+        predictions.get('thyroid_risk', 0),
+        predictions.get('diabetes_risk', 0)
+    )
+
+    if max_risk > 0.7:
+        return "High"
+    elif max_risk > 0.4:
+        return "Medium"
+    else:
+        return "Low"
+
+
+def get_recommended_specialists(predictions):
+    """Specialists to consult, ordered by priority"""
+    pcos_risk = predictions.get('pcos_risk', 0)
+    thyroid_risk = predictions.get('thyroid_risk', 0)
+    diabetes_risk = predictions.get('diabetes_risk', 0)
+
+    specialists = []
+
+    if pcos_risk >= 0.4:
+        priority = 1 if pcos_risk >= 0.7 else 2
+        specialists.append({
+            'specialty': 'Gynecologist',
+            'priority': priority,
+            'reason': f'PCOS risk: {pcos_risk*100:.1f}%'
+        })
+
+    if thyroid_risk >= 0.4:
+        priority = 1 if thyroid_risk >= 0.7 else 2
+        specialists.append({
+            'specialty': 'Endocrinologist',
+            'priority': priority,
+            'reason': f'Thyroid risk: {thyroid_risk*100:.1f}%'
+        })
+
+    if diabetes_risk >= 0.4:
+        priority = 1 if diabetes_risk >= 0.7 else 2
+        specialists.append({
+            'specialty': 'Diabetologist',
+            'priority': priority,
+            'reason': f'Diabetes risk: {diabetes_risk*100:.1f}%'
+        })
+
+    if not specialists:
+        specialists.append({
+            'specialty': 'General Physician',
+            'priority': 3,
+            'reason': 'All risk levels are low. General check-up recommended.'
+        })
+
+    specialists.sort(key=lambda x: x['priority'])
+    return specialists
+
+
+def build_assessment(name, input_data, predictions):
+    """Assemble the full assessment record for a set of inputs and predictions"""
+    return {
+        'name': name, 'predictions': predictions, 'input_data': input_data,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'overall_risk': calculate_overall_risk(predictions),
+        'disease_diagnosis': get_disease_diagnosis(predictions, input_data)
+    }
@@ -0,0 +1,119 @@
+# utils/change_feed.py
+import time
+import argparse
+from database import get_db
+from utils.retention import database_size, incremental_vacuum
+
+
+class ChangeFeedConsumer:
+    """Named reader of the assessment change feed.
+
+    poll() returns the events past the consumer's committed offset, and
+    commit() moves that offset past them. Each poll is a primary-key range read
+    of at most ``batch_size`` events per shard, however large assessment_history
+    grows. Events are delivered at least once: anything polled but not yet
+    committed comes back after a restart.
+    """
+
+    def __init__(self, name, database=None, batch_size=500):
+        self.name = name
+        self.db = database or get_db()
+        self.batch_size = batch_size
+        self.offset = self.db.get_change_offset(name)
+        self.pending = self.offset
+
+    def poll(self):
+        events, self.pending = self.db.read_changes_since(self.offset, self.batch_size)
+        return events
+
+    def commit(self):
+        self.db.commit_change_offset(self.name, self.pending)
+        self.offset = self.pending
+
+    def run(self, handler, interval=5, once=False):
+        """Pass each batch of new events to handler and commit once it returns"""
+        while True:
+            events = self.poll()
+            if events:
+                handler(events)
+                self.commit()
+                continue
+            if once:
+                return
+            time.sleep(interval)
+
+
+class ChangeFeedCompactor:
+    """Deletes change-feed events every registered consumer has committed.
+
+    Works in short batched transactions and returns the space with
+    incremental VACUUM, like the login retention job. Events are only kept
+    for consumers that have committed an offset, so register a consumer
+    (one commit) before relying on the feed's history.
+    """
+
+    def __init__(self, database=None, batch_size=5000, vacuum_pages=256, pause_seconds=0.01):
+        self.db = database or get_db()
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.pause_seconds = pause_seconds
+
+    def compact_shard(self, conn, floor):
+        """Delete events up to floor on one shard; returns events deleted"""
+        deleted = 0
+        while True:
+            with conn:
+                count = conn.execute('''
+                    DELETE FROM assessment_changes WHERE id IN (
+                        SELECT id FROM assessment_changes WHERE id <= ? ORDER BY id LIMIT ?
+                    )
+                ''', (floor, self.batch_size)).rowcount
+            deleted += count
+            if count < self.batch_size:
+                return deleted
+            time.sleep(self.pause_seconds)
+
+    def run(self):
+        """Compact and vacuum every shard; returns a summary dict"""
+        offsets = list(self.db.get_change_offsets().values())
+        if not offsets:
+            return {'deleted': 0, 'pages_released': 0, 'bytes_before': 0, 'bytes_after': 0, 'consumers': 0}
+
+        # The slowest consumer bounds what can go on each shard
+        floors = [min(column) for column in zip(*offsets)]
+
+        def compact(conn, index):
+            before = database_size(conn)
+            deleted = self.compact_shard(conn, floors[index])
+            released = incremental_vacuum(conn, self.vacuum_pages, self.pause_seconds)
+            return {'deleted': deleted, 'pages_released': released,
+                    'bytes_before': before, 'bytes_after': database_size(conn)}
+
+        shards = self.db.fan_out(compact)
+        summary = {key: sum(shard[key] for shard in shards) for key in shards[0]}
+        summary['consumers'] = len(offsets)
+        return summary
+
+
+def print_events(events):
+    for event in events:
+        data = event['data']
+        print(f"{event['offset']:>8} {event['op']:<7} #{event['assessment_id']} {event['username']:<12} "
+              f"{data.get('overall_risk', '-'):<7} {data.get('primary_disease', data.get('reason', ''))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read or compact the assessment change feed")
+    parser.add_argument("--consumer", help="Print this consumer's new events and commit its offset")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--compact", action="store_true", help="Delete events every consumer has committed")
+    args = parser.parse_args()
+
+    if args.consumer:
+        ChangeFeedConsumer(args.consumer, batch_size=args.batch_size).run(print_events, once=True)
+    if args.compact:
+        summary = ChangeFeedCompactor().run()
+        print(f"Deleted {summary['deleted']} event(s) committed by all {summary['consumers']} consumer(s)")
+        if summary['consumers']:
+            print(f"Database size: {summary['bytes_before'] / 1e6:.2f} MB -> {summary['bytes_after'] / 1e6:.2f} MB "
+                  f"({summary['pages_released']} page(s) released)")
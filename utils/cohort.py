@@ -0,0 +1,101 @@
+# utils/cohort.py
+import threading
+import numpy as np
+import pandas as pd
+from database import get_analytics_db
+from utils.data_processor import AGE_BREAKPOINTS, BMI_BREAKPOINTS, TSH_BREAKPOINTS, SUGAR_BREAKPOINTS
+
+RISK_LEVELS = ['Low', 'Medium', 'High']
+SYMPTOM_COLUMNS = {
+    'irregular_periods': 'Irregular Periods',
+    'excess_hair_growth': 'Excess Hair Growth',
+    'acne': 'Acne',
+    'tiredness': 'Tiredness',
+    'hair_fall': 'Hair Fall',
+    'frequent_urination': 'Frequent Urination',
+    'family_diabetes': 'Family History of Diabetes',
+}
+DIMENSIONS = {
+    'Age Band': ('age', AGE_BREAKPOINTS),
+    'BMI Category': ('bmi', BMI_BREAKPOINTS),
+    'TSH Category': ('tsh_level', TSH_BREAKPOINTS),
+    'Sugar Category': ('blood_sugar', SUGAR_BREAKPOINTS),
+}
+
+
+class CohortAnalytics:
+    """Population risk cross-tabs over assessment_history, maintained incrementally.
+
+    Counts are plain integer arrays, so a refresh only aggregates rows past
+    the last seen assessment watermark and adds them to the running totals.
+    """
+
+    def __init__(self, database=None, batch_size=100000):
+        self.db = database or get_analytics_db()
+        self.batch_size = batch_size
+        self.watermark = self.db.normalize_watermark(0)
+        self.total = 0
+        self.risk_counts = {
+            dimension: np.zeros((len(breakpoints.labels), len(RISK_LEVELS)), dtype=np.int64)
+            for dimension, (_, breakpoints) in DIMENSIONS.items()
+        }
+        self.disease_counts = pd.Series(dtype=np.int64)
+        self.symptom_counts = pd.DataFrame(columns=list(SYMPTOM_COLUMNS), dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Fold in assessments newer than the cache key; returns True if anything changed"""
+        with self._lock:
+            if self.db.get_assessment_watermark() == self.watermark:
+                return False
+
+            while True:
+                columns, rows = self.db.fetch_assessment_rows(self.watermark, self.batch_size)
+                if not rows:
+                    break
+                self.add_rows(pd.DataFrame.from_records(rows, columns=columns))
+            return True
+
+    def add_rows(self, df):
+        """Aggregate a batch of assessment rows into the running totals in one pass"""
+        if df.empty:
+            return
+
+        risk_codes = pd.Categorical(df['overall_risk'], categories=RISK_LEVELS).codes
+        known = risk_codes >= 0
+
+        for dimension, (column, breakpoints) in DIMENSIONS.items():
+            codes = breakpoints.codes(df[column].to_numpy(dtype=float))
+            counted = known & (codes >= 0)
+            flat = codes[counted] * len(RISK_LEVELS) + risk_codes[counted]
+            counts = np.bincount(flat, minlength=self.risk_counts[dimension].size)
+            self.risk_counts[dimension] += counts.reshape(self.risk_counts[dimension].shape)
+
+        diseases = df['primary_disease'].fillna('Unknown')
+        symptoms = df[list(SYMPTOM_COLUMNS)].fillna(0).astype(np.int64).groupby(diseases).sum()
+        self.symptom_counts = symptoms.add(self.symptom_counts, fill_value=0).astype(np.int64)
+        self.disease_counts = diseases.value_counts().add(self.disease_counts, fill_value=0).astype(np.int64)
+
+        self.total += len(df)
+        self.watermark = self.db.advance_watermark(self.watermark, df['id'])
+
+    def risk_distribution(self, dimension, normalize=False):
+        """Overall risk counts (or row shares) per category of a dimension"""
+        _, breakpoints = DIMENSIONS[dimension]
+        table = pd.DataFrame(self.risk_counts[dimension], index=breakpoints.labels, columns=RISK_LEVELS)
+        table.index.name = dimension
+
+        if normalize:
+            totals = table.sum(axis=1).replace(0, np.nan)
+            table = table.div(totals, axis=0).fillna(0)
+        return table
+
+    def symptom_prevalence(self):
+        """Share of assessments per primary disease reporting each symptom"""
+        if self.symptom_counts.empty:
+            return pd.DataFrame(columns=list(SYMPTOM_COLUMNS.values()))
+
+        prevalence = self.symptom_counts.div(self.disease_counts.reindex(self.symptom_counts.index), axis=0)
+        prevalence = prevalence.rename(columns=SYMPTOM_COLUMNS)
+        prevalence.index.name = 'Primary Disease'
+        return prevalence
@@ -0,0 +1,197 @@
+# utils/compiled_forest.py
+import numpy as np
+from utils.model import HealthPredictor, TrainedHealthPredictor
+
+# Fitted random forests flattened into plain NumPy node arrays, so scoring
+# needs neither sklearn nor its per-call input validation
+
+CHUNK_ROWS = 1024
+
+
+class CompiledForest:
+    """All trees of a fitted RandomForestClassifier as one set of flat node arrays.
+
+    Node i tests feature[i] <= threshold[i] and moves to left[i] or right[i];
+    a missing (NaN) value goes left where missing_left[i] is set, as sklearn
+    routes it. Leaves point back to themselves, so every row can be stepped
+    max_depth times over all trees at once. value[i] holds the leaf's class
+    probabilities.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes, missing_left=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes = classes
+        # Files saved before missing-value routing was stored send NaN left
+        self.missing_left = (np.ones(len(feature), dtype=bool) if missing_left is None
+                             else np.asarray(missing_left, dtype=bool))
+
+        # Children interleaved so one take() picks the branch: children[2 * node + went_right]
+        self.children = np.column_stack([left, right]).ravel()
+        # sklearn compares float32 inputs with float64 thresholds. Rounding each
+        # threshold down to the nearest float32 gives the same result for every
+        # float32 input and keeps the comparison in float32
+        threshold32 = threshold.astype(np.float32)
+        too_high = threshold32.astype(np.float64) > threshold
+        threshold32[too_high] = np.nextafter(threshold32[too_high], np.float32(-np.inf))
+        self.threshold32 = threshold32
+
+    @classmethod
+    def from_estimator(cls, forest):
+        features, thresholds, lefts, rights, values, roots, missing = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            # Older sklearn versions reject NaN input, so the direction never mattered
+            missing.append(getattr(tree, 'missing_go_to_left', np.ones(tree.node_count, dtype=np.uint8)))
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            # Normalised the same way DecisionTreeClassifier.predict_proba does
+            value = tree.value[:, 0, :]
+            totals = value.sum(axis=1, keepdims=True)
+            values.append(value / np.where(totals == 0, 1, totals))
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(forest.classes_),
+            missing_left=np.concatenate(missing).astype(bool),
+        )
+
+    def walk(self, X):
+        """Step every row down every tree; yields (nodes, flat feature index, next nodes) per level"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        nodes = np.tile(self.roots, (n_rows, 1))
+        # NaN > threshold is always False; only pay for the missing-value check when there are any
+        has_missing = np.isnan(flat).any()
+        for _ in range(self.max_depth):
+            features = row_offsets + self.feature.take(nodes)
+            values = flat.take(features)
+            went_right = values > self.threshold32.take(nodes)
+            if has_missing:
+                missing = np.isnan(values)
+                went_right[missing] = ~self.missing_left.take(nodes[missing])
+            next_nodes = self.children.take(2 * nodes + went_right)
+            yield nodes, features, next_nodes
+            nodes = next_nodes
+
+    def leaves(self, X):
+        """Leaf index reached in every tree, as a rows x trees array"""
+        nodes = np.tile(self.roots, (len(X), 1))
+        for _, _, nodes in self.walk(X):
+            pass
+        return nodes
+
+    def contributions(self, X, column):
+        """Path-based per-feature contributions to one class probability.
+
+        Each split adds the change in node probability to the feature it
+        tested, averaged over the trees. Returns (bias, rows x features);
+        bias plus a row's contributions equals its probability.
+        """
+        X = np.asarray(X)
+        node_value = np.ascontiguousarray(self.value[:, column])
+        bias = node_value.take(self.roots).mean()
+        result = np.zeros(X.shape)
+        for start in range(0, len(X), CHUNK_ROWS):
+            chunk = X[start:start + CHUNK_ROWS]
+            totals = np.zeros(chunk.size)
+            for nodes, features, next_nodes in self.walk(chunk):
+                change = node_value.take(next_nodes) - node_value.take(nodes)
+                totals += np.bincount(features.ravel(), weights=change.ravel(), minlength=chunk.size)
+            result[start:start + len(chunk)] = totals.reshape(chunk.shape) / len(self.roots)
+        return bias, result
+
+    def class_proba(self, X, column):
+        """Mean leaf probability of one class over the trees"""
+        X = np.asarray(X)
+        leaf_value = np.ascontiguousarray(self.value[:, column])
+        # Row chunks keep the rows x trees working arrays cache-sized
+        return np.concatenate([
+            leaf_value.take(self.leaves(X[start:start + CHUNK_ROWS])).mean(axis=1)
+            for start in range(0, len(X), CHUNK_ROWS)
+        ]) if len(X) else np.zeros(0)
+
+    def predict_proba(self, X):
+        """Class probabilities, like RandomForestClassifier.predict_proba"""
+        return np.column_stack([self.class_proba(X, column) for column in range(len(self.classes))])
+
+    def positive_proba(self, X):
+        """Probability of class 1, or zeros if the forest never saw it"""
+        matches = np.flatnonzero(self.classes == 1)
+        if not len(matches):
+            return np.zeros(len(X))
+        return self.class_proba(X, matches[0])
+
+    def arrays(self):
+        return {
+            'feature': self.feature, 'threshold': self.threshold, 'left': self.left,
+            'right': self.right, 'value': self.value, 'roots': self.roots,
+            'max_depth': np.array(self.max_depth), 'classes': self.classes,
+            'missing_left': self.missing_left,
+        }
+
+
+class CompiledHealthPredictor(HealthPredictor):
+    """Scores with compiled forests; needs no sklearn, so it can load from a saved file"""
+
+    LABELS = TrainedHealthPredictor.LABELS
+
+    def __init__(self, forests):
+        super().__init__()
+        self.forests = forests
+
+    @classmethod
+    def from_trained(cls, predictor):
+        return cls({disease: CompiledForest.from_estimator(predictor.models[disease])
+                    for disease in cls.LABELS})
+
+    def save(self, path):
+        arrays = {}
+        for disease, forest in self.forests.items():
+            for name, values in forest.arrays().items():
+                arrays[f'{disease}.{name}'] = values
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as saved:
+            forests = {}
+            for disease in cls.LABELS:
+                fields = {name: saved[f'{disease}.{name}'] for name in (
+                    'feature', 'threshold', 'left', 'right', 'value', 'roots', 'classes')}
+                missing_left = saved[f'{disease}.missing_left'] if f'{disease}.missing_left' in saved.files else None
+                forests[disease] = CompiledForest(max_depth=int(saved[f'{disease}.max_depth']),
+                                                  missing_left=missing_left, **fields)
+        return cls(forests)
+
+    # Matrix building is shared with the sklearn-backed predictor
+    feature_matrix = TrainedHealthPredictor.feature_matrix
+    predict = TrainedHealthPredictor.predict
+
+    def predict_batch(self, input_data):
+        return self.predict_matrix(self.feature_matrix(input_data))
+
+    def predict_matrix(self, X):
+        return {f'{disease}_risk': forest.positive_proba(X) for disease, forest in self.forests.items()}
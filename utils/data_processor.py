@@ -1,15 +1,79 @@
 # utils/data_processor.py
 import pandas as pd
 import numpy as np
-from database import db
+from database import get_db
+from utils.session_cache import get_doctor_directory
+
+
+class Breakpoints:
+    """Ordered category cut points shared by the scalar and array categorisers.
+
+    ``labels[i]`` applies to values below ``edges[i]`` (or equal to it when
+    ``inclusive[i]`` is set); the last label covers everything above. Missing
+    (NaN) values get no category.
+    """
+
+    def __init__(self, labels, edges, inclusive):
+        self.labels = list(labels)
+        self.edges = list(edges)
+        self.inclusive = list(inclusive)
+        # x <= e is exactly x < nextafter(e, inf), so every edge can be made strict
+        self.strict_edges = np.array(
+            [np.nextafter(edge, np.inf) if inc else edge for edge, inc in zip(self.edges, self.inclusive)],
+            dtype=float
+        )
+
+    def categorize(self, value):
+        """Categorize a single value; None when it is missing"""
+        if value is None or value != value:
+            return None
+        for label, edge, inclusive in zip(self.labels, self.edges, self.inclusive):
+            if value < edge or (inclusive and value == edge):
+                return label
+        return self.labels[-1]
+
+    def codes(self, values):
+        """Category index for each value in an array, -1 where the value is NaN"""
+        values = np.asarray(values, dtype=float)
+        codes = np.searchsorted(self.strict_edges, values, side='right')
+        codes[np.isnan(values)] = -1
+        return codes
+
+    def categorize_array(self, values):
+        """Categorize an array of values into an ordered Categorical"""
+        return pd.Categorical.from_codes(self.codes(values), categories=self.labels, ordered=True)
+
+
+BMI_BREAKPOINTS = Breakpoints(
+    ['Underweight', 'Normal', 'Overweight', 'Obese'],
+    [18.5, 25, 30],
+    [False, False, False]
+)
+TSH_BREAKPOINTS = Breakpoints(
+    ['Low (Hyperthyroidism)', 'Normal', 'High (Hypothyroidism)'],
+    [0.4, 4.0],
+    [False, True]
+)
+SUGAR_BREAKPOINTS = Breakpoints(
+    ['Low', 'Normal', 'Pre-diabetes', 'Diabetes'],
+    [70, 100, 125],
+    [False, True, True]
+)
+
+AGE_BREAKPOINTS = Breakpoints(
+    ['<18', '18-29', '30-39', '40-49', '50-59', '60+'],
+    [18, 30, 40, 50, 60],
+    [False, False, False, False, False]
+)
+
 
 class DataProcessor:
     def __init__(self):
         self.doctors_data = self.load_doctors_data()
     
     def load_doctors_data(self):
-        """Load doctors data from database"""
-        return db.get_doctors_by_specialty()
+        """Load doctors data from the process-wide directory cache"""
+        return get_doctor_directory()
     
     def get_recommended_doctors(self, predictions, max_doctors=5):
         """Get recommended doctors based on risk predictions"""
@@ -38,20 +102,20 @@ class DataProcessor:
             recommended_doctors.extend(specialty_doctors)
         
         # Sort by rating and return top doctors
-        recommended_doctors.sort(key=lambda x: x['rating'], reverse=True)
+        recommended_doctors.sort(key=lambda x: x['rating'] or 0, reverse=True)
         return recommended_doctors[:max_doctors]
     
     def get_doctors_data(self, specialty=None, location=None):
         """Get doctors data filtered by specialty and location"""
-        return db.get_doctors_by_specialty(specialty, location)
+        return get_db().get_doctors_by_specialty(specialty, location)
     
     def get_all_specialties(self):
         """Get all available specialties"""
-        return db.get_all_specialties()
+        return get_db().get_all_specialties()
     
     def get_all_locations(self):
         """Get all available locations"""
-        return db.get_all_locations()
+        return get_db().get_all_locations()
     
     def process_health_data(self, input_data):
         """Process health data for analysis"""
@@ -69,33 +133,41 @@ class DataProcessor:
         
         return processed_data
     
+    def process_health_data_batch(self, data):
+        """Process a whole cohort of health data, adding categorical columns"""
+        processed_data = pd.DataFrame(data).copy()
+
+        if 'BMI' in processed_data:
+            processed_data['BMI Category'] = self.categorize_bmi_array(processed_data['BMI'])
+
+        if 'TSH_Level' in processed_data:
+            processed_data['TSH Category'] = self.categorize_tsh_array(processed_data['TSH_Level'])
+
+        if 'Blood_Sugar' in processed_data:
+            processed_data['Sugar Category'] = self.categorize_blood_sugar_array(processed_data['Blood_Sugar'])
+
+        return processed_data
+
     def categorize_bmi(self, bmi):
         """Categorize BMI values"""
-        if bmi < 18.5:
-            return 'Underweight'
-        elif bmi < 25:
-            return 'Normal'
-        elif bmi < 30:
-            return 'Overweight'
-        else:
-            return 'Obese'
-    
+        return BMI_BREAKPOINTS.categorize(bmi)
+
     def categorize_tsh(self, tsh):
         """Categorize TSH values"""
-        if tsh < 0.4:
-            return 'Low (Hyperthyroidism)'
-        elif tsh <= 4.0:
-            return 'Normal'
-        else:
-            return 'High (Hypothyroidism)'
-    
+        return TSH_BREAKPOINTS.categorize(tsh)
+
     def categorize_blood_sugar(self, sugar):
         """Categorize blood sugar values"""
-        if sugar < 70:
-            return 'Low'
-        elif sugar <= 100:
-            return 'Normal'
-        elif sugar <= 125:
-            return 'Pre-diabetes'
-        else:
-            return 'Diabetes'
\ No newline at end of file
+        return SUGAR_BREAKPOINTS.categorize(sugar)
+
+    def categorize_bmi_array(self, bmi):
+        """Categorize an array of BMI values"""
+        return BMI_BREAKPOINTS.categorize_array(bmi)
+
+    def categorize_tsh_array(self, tsh):
+        """Categorize an array of TSH values"""
+        return TSH_BREAKPOINTS.categorize_array(tsh)
+
+    def categorize_blood_sugar_array(self, sugar):
+        """Categorize an array of blood sugar values"""
+        return SUGAR_BREAKPOINTS.categorize_array(sugar)
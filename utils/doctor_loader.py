@@ -0,0 +1,97 @@
+# utils/doctor_loader.py
+import time
+import argparse
+import pandas as pd
+from database import get_db, DOCTOR_COLUMNS
+
+# doctors column -> CSV headers that can fill it, most specific first (matched
+# case-insensitively). data/doctor_patient.csv has both a patient "Name" and a
+# "DoctorName", so the doctor-specific header has to win
+COLUMN_ALIASES = {
+    'name': ('doctorname', 'doctor', 'name'),
+    'specialty': ('specialty', 'speciality', 'recommended_specialist'),
+    'hospital': ('hospitalname', 'hospital'),
+    'location': ('hospitallocation', 'location', 'city'),
+    'rating': ('rating',),
+    'contact': ('contact', 'phone'),
+}
+
+
+def normalize_doctors(df):
+    """Map CSV headers onto doctors columns, tidy values and drop rows without a name or specialty"""
+    headers = {column.strip().lower(): column for column in df.columns}
+    renamed = {}
+    for target, aliases in COLUMN_ALIASES.items():
+        matches = [headers[alias] for alias in aliases if alias in headers]
+        if matches:
+            renamed[matches[0]] = target
+    df = df[list(renamed)].rename(columns=renamed)
+    for column in DOCTOR_COLUMNS:
+        if column not in df.columns:
+            df[column] = None
+
+    for column in ('name', 'specialty', 'hospital', 'location', 'contact'):
+        # Collapse whitespace so "Dr.  Meera Rao " and "Dr. Meera Rao" share a natural key
+        df[column] = df[column].astype('string').str.strip().str.replace(r'\s+', ' ', regex=True)
+    # Key columns must not be NULL: the unique index treats NULLs as distinct
+    df['hospital'] = df['hospital'].fillna('')
+    df['location'] = df['location'].fillna('')
+    df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+    df = df[df['name'].fillna('').ne('') & df['specialty'].fillna('').ne('')]
+    return df[list(DOCTOR_COLUMNS)]
+
+
+def doctor_rows(df):
+    """Plain tuples with None for missing values, ready for executemany"""
+    df = df.astype(object).where(df.notna(), None)
+    return list(df.itertuples(index=False, name=None))
+
+
+def load_doctors(source, database=None, default_rating=None):
+    """Upsert the doctors in a CSV path (or DataFrame).
+
+    Rows repeating a natural key within the file keep the last one. New
+    doctors without a rating are skipped unless default_rating is given.
+    Returns row / inserted / updated / skipped / unrated counts and the
+    seconds it took.
+    """
+    start = time.perf_counter()
+    db = database or get_db()
+    df = source if isinstance(source, pd.DataFrame) else pd.read_csv(source, dtype=str, keep_default_na=False,
+                                                                      na_values=[''])
+    total = len(df)
+    df = normalize_doctors(df)
+    invalid = total - len(df)
+    df = df.drop_duplicates(subset=['name', 'specialty', 'hospital', 'location'], keep='last')
+    duplicates = total - invalid - len(df)
+
+    summary = db.upsert_doctors(doctor_rows(df), default_rating=default_rating)
+    summary['skipped'] += invalid + duplicates
+    summary.update(rows=total, invalid=invalid, duplicates=duplicates, seconds=time.perf_counter() - start)
+
+    # The doctors row-hash checksum trigger catches this too; invalidating just skips the poll wait
+    if database is None and (summary['inserted'] or summary['updated']):
+        from utils.precompute import get_precomputer
+        precomputer = get_precomputer()
+        for job in ('specialties', 'locations', 'doctor_directory'):
+            precomputer.invalidate(job)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk load or refresh the doctor directory from CSV")
+    parser.add_argument("paths", nargs='+', help="CSV files, e.g. data/doctor_patient.csv")
+    parser.add_argument("--default-rating", type=float, default=None,
+                        help="Rating for new doctors the file does not rate; without it they are skipped")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        try:
+            summary = load_doctors(path, default_rating=args.default_rating)
+        except Exception as e:
+            print(f"Error loading doctors from {path}: {e}")
+            continue
+        print(f"{path}: {summary['rows']} row(s) in {summary['seconds']:.2f} s — {summary['inserted']} inserted, "
+              f"{summary['updated']} updated, {summary['skipped']} skipped "
+              f"({summary['duplicates']} repeated in file, {summary['invalid']} without a name or specialty, "
+              f"{summary['unrated']} new without a rating)")
@@ -0,0 +1,218 @@
+# utils/evaluation.py
+import json
+import hashlib
+import argparse
+import functools
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.calibration import calibration_curve
+from sklearn.metrics import brier_score_loss, confusion_matrix, roc_auc_score
+from sklearn.model_selection import StratifiedGroupKFold
+from utils.model import HealthPredictor, TrainedHealthPredictor
+
+DATA_PATH = "data/doctor_patient.csv"
+DISEASES = {'PCOS': 'pcos_risk', 'Thyroid': 'thyroid_risk', 'Diabetes': 'diabetes_risk'}
+# Specialist per disease, in the order get_recommended_specialists checks them
+SPECIALISTS = ['Gynecologist', 'Endocrinologist', 'Diabetologist']
+GENERAL_PHYSICIAN = 'General Physician'
+CANDIDATES = {
+    'rules': HealthPredictor,
+    'forest': TrainedHealthPredictor,
+}
+
+
+def load_labelled_data(path=DATA_PATH):
+    return pd.read_csv(path)
+
+
+def route_specialists(predictions):
+    """Vectorised top choice of get_recommended_specialists for each row"""
+    risks = np.stack([np.asarray(predictions[column], dtype=float) for column in DISEASES.values()])
+    # Priority 1 at >= 0.7, 2 at >= 0.4, not recommended below; ties keep disease order
+    priority = np.where(risks >= 0.7, 1, np.where(risks >= 0.4, 2, 3))
+    best = priority.argmin(axis=0)
+    routed = np.array(SPECIALISTS, dtype=object)[best]
+    routed[priority.min(axis=0) == 3] = GENERAL_PHYSICIAN
+    return routed
+
+
+def calibration_error(labels, risks, n_bins=5):
+    """Expected calibration error over equal-width risk bins"""
+    bins = np.minimum((risks * n_bins).astype(int), n_bins - 1)
+    error = 0.0
+    for b in range(n_bins):
+        in_bin = bins == b
+        if in_bin.any():
+            error += in_bin.mean() * abs(risks[in_bin].mean() - labels[in_bin].mean())
+    return error
+
+
+def safe_auc(labels, risks):
+    # AUC is undefined when only one class is present
+    if len(np.unique(labels)) < 2:
+        return None
+    return float(roc_auc_score(labels, risks))
+
+
+def disease_metrics(labels, risks, threshold, n_bins=5):
+    tn, fp, fn, tp = confusion_matrix(labels, risks >= threshold, labels=[0, 1]).ravel()
+    observed, predicted = calibration_curve(labels, risks, n_bins=n_bins, strategy='uniform')
+    return {
+        'positives': int(labels.sum()),
+        'roc_auc': safe_auc(labels, risks),
+        'brier': float(brier_score_loss(labels, risks)),
+        'ece': float(calibration_error(labels, risks, n_bins)),
+        'calibration': {'predicted': predicted.round(4).tolist(), 'observed': observed.round(4).tolist()},
+        'confusion': {'tn': int(tn), 'fp': int(fp), 'fn': int(fn), 'tp': int(tp)},
+        'sensitivity': float(tp / (tp + fn)) if tp + fn else None,
+        'specificity': float(tn / (tn + fp)) if tn + fp else None,
+    }
+
+
+def routing_metrics(expected, routed):
+    labels = [GENERAL_PHYSICIAN] + SPECIALISTS
+    matrix = confusion_matrix(expected, routed, labels=labels)
+    return {
+        'accuracy': float((expected == routed).mean()),
+        'labels': labels,
+        'confusion': matrix.tolist(),
+    }
+
+
+def evaluate_fold(candidate_factory, data, train_index, test_index):
+    """Fit (when the candidate is trainable) on one fold and score its held-out rows"""
+    model = candidate_factory()
+    if hasattr(model, 'fit'):
+        model.fit(data.iloc[train_index])
+    predictions = model.predict_batch(data.iloc[test_index])
+    return test_index, {column: np.asarray(values, dtype=float) for column, values in predictions.items()}
+
+
+class ModelEvaluator:
+    """Cross-validated evaluation of a risk model against labelled patient data.
+
+    Folds are stratified on the recommended specialist and grouped by
+    patient (the dataset repeats patients, one row per doctor), so no patient
+    is in both the training and the held-out rows. They run in parallel with
+    joblib. Metrics are computed on the pooled out-of-fold predictions,
+    with per-fold values kept to show their spread.
+    """
+
+    def __init__(self, data=None, n_splits=5, n_jobs=-1, threshold=0.4, random_state=42):
+        self.data = load_labelled_data() if data is None else data.reset_index(drop=True)
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+        self.threshold = threshold
+        self.random_state = random_state
+
+    def folds(self):
+        splitter = StratifiedGroupKFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+        groups = self.data['PatientID'] if 'PatientID' in self.data else np.arange(len(self.data))
+        return list(splitter.split(self.data, self.data['Recommended_Specialist'], groups))
+
+    def out_of_fold_predictions(self, candidate_factory):
+        """Held-out predictions for every row, and the row indices of each fold"""
+        folds = self.folds()
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(evaluate_fold)(candidate_factory, self.data, train_index, test_index)
+            for train_index, test_index in folds
+        )
+
+        predictions = {column: np.zeros(len(self.data)) for column in DISEASES.values()}
+        for test_index, fold_predictions in results:
+            for column in predictions:
+                predictions[column][test_index] = fold_predictions[column]
+        return predictions, [test_index for _, test_index in folds]
+
+    def evaluate(self, candidate_factory, name=None):
+        """JSON-serialisable report for one candidate"""
+        predictions, fold_indices = self.out_of_fold_predictions(candidate_factory)
+        expected_routes = self.data['Recommended_Specialist'].to_numpy(dtype=object)
+        routed = route_specialists(predictions)
+
+        report = {
+            'model': name or getattr(candidate_factory, '__name__', repr(candidate_factory)),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'dataset': {
+                'rows': len(self.data),
+                'sha256': hashlib.sha256(pd.util.hash_pandas_object(self.data, index=False).values).hexdigest(),
+            },
+            'n_splits': self.n_splits,
+            'threshold': self.threshold,
+            'diseases': {},
+            'routing': routing_metrics(expected_routes, routed),
+        }
+        report['routing']['fold_accuracy'] = [
+            float((expected_routes[index] == routed[index]).mean()) for index in fold_indices
+        ]
+
+        for disease, column in DISEASES.items():
+            labels = self.data[disease].to_numpy()
+            metrics = disease_metrics(labels, predictions[column], self.threshold)
+            metrics['fold_roc_auc'] = [safe_auc(labels[index], predictions[column][index]) for index in fold_indices]
+            report['diseases'][disease] = metrics
+        return report
+
+
+def headline_metrics(report):
+    """Flat metric -> value mapping used to compare reports"""
+    metrics = {'routing.accuracy': report['routing']['accuracy']}
+    for disease, values in report['diseases'].items():
+        for key in ('roc_auc', 'brier', 'ece', 'sensitivity', 'specificity'):
+            metrics[f'{disease}.{key}'] = values[key]
+    return metrics
+
+
+def compare_reports(baseline, candidate):
+    """Per-metric (baseline, candidate, delta) for two reports"""
+    old, new = headline_metrics(baseline), headline_metrics(candidate)
+    return {
+        key: (old.get(key), new[key], None if old.get(key) is None or new[key] is None else new[key] - old[key])
+        for key in new
+    }
+
+
+def print_report(report, baseline=None):
+    print(f"{report['model']}: {report['dataset']['rows']} rows, {report['n_splits']}-fold")
+    rows = compare_reports(baseline, report) if baseline else {
+        key: (None, value, None) for key, value in headline_metrics(report).items()
+    }
+    for key, (old, new, delta) in rows.items():
+        fmt = lambda value: "   n/a" if value is None else f"{value:6.3f}"
+        line = f"  {key:<24} {fmt(new)}"
+        if baseline:
+            line += f"   was {fmt(old)}   {'' if delta is None else f'{delta:+.3f}'}"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validate a risk model against labelled patient data")
+    parser.add_argument("--model", choices=list(CANDIDATES), default="rules")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--threshold", type=float, default=0.4, help="Risk at which a case counts as positive")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to diff against")
+    args = parser.parse_args()
+
+    evaluator = ModelEvaluator(load_labelled_data(args.data), n_splits=args.folds,
+                               n_jobs=args.n_jobs, threshold=args.threshold)
+    factory = CANDIDATES[args.model]
+    if args.model == 'forest':
+        # Folds already run in parallel, so each forest stays single-threaded
+        factory = functools.partial(TrainedHealthPredictor, n_jobs=1)
+    report = evaluator.evaluate(factory, name=args.model)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
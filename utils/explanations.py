@@ -0,0 +1,64 @@
+# utils/explanations.py
+import numpy as np
+from utils.model import TrainedHealthPredictor
+
+# How much each input moved each risk score. The rule model is additive, so
+# its explanation is exact; forests get path-based contributions. Either way
+# base + sum(contributions) is the risk, for every row of a batch
+
+
+def rule_explanation(predictor, input_data):
+    f = predictor.feature_arrays(input_data)
+    n = len(f['BMI'])
+    explanation = {}
+    for risk, parts in predictor.rule_contributions(f).items():
+        contributions = {feature: np.zeros(n) for feature in predictor.features}
+        contributions.update(parts)
+        total = sum(parts.values())
+        # The 1.0 cap is shared out in proportion so the parts still add up
+        scale = np.where(total > 1.0, 1.0 / np.where(total > 0, total, 1.0), 1.0)
+        explanation[risk] = {
+            'base': np.zeros(n),
+            'contributions': {feature: values * scale for feature, values in contributions.items()},
+        }
+    return explanation
+
+
+def forest_explanation(predictor, input_data):
+    X = predictor.feature_matrix(input_data)
+    explanation = {}
+    for disease, forest in predictor.forests.items():
+        matches = np.flatnonzero(forest.classes == 1)
+        if len(matches):
+            bias, values = forest.contributions(X, matches[0])
+        else:
+            bias, values = 0.0, np.zeros(X.shape)
+        explanation[f'{disease}_risk'] = {
+            'base': np.full(len(X), bias),
+            'contributions': {feature: values[:, i] for i, feature in enumerate(predictor.features)},
+        }
+    return explanation
+
+
+def explain_batch(predictor, input_data):
+    """Per-feature contributions to each risk for a batch of inputs.
+
+    Returns {risk: {'base': array, 'contributions': {feature: array}}}.
+    """
+    if isinstance(predictor, TrainedHealthPredictor):
+        # Compiled once per fit and reused by every call
+        predictor = predictor.compile()
+    if hasattr(predictor, 'forests'):
+        return forest_explanation(predictor, input_data)
+    return rule_explanation(predictor, input_data)
+
+
+def top_factors(explanation, row, limit=None):
+    """Non-zero contributions for one row of a batch explanation, largest first"""
+    factors = {}
+    for risk, parts in explanation.items():
+        items = [(feature, float(values[row])) for feature, values in parts['contributions'].items()
+                 if abs(values[row]) > 1e-12]
+        items.sort(key=lambda item: -abs(item[1]))
+        factors[risk] = items[:limit]
+    return factors
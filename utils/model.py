@@ -1,47 +1,64 @@
 # utils/model.py
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 
 class HealthPredictor:
     def __init__(self):
-        self.models = {}
-        self.scalers = {}
+        self._models = None
+        self._scalers = None
         self.features = [
             'Age', 'BMI', 'Irregular_Periods', 'Excess_Hair_Growth', 'Acne',
             'TSH_Level', 'Tiredness', 'Hair_Fall', 'Blood_Sugar', 
             'Frequent_Urination', 'Family_Diabetes'
         ]
-        self.init_models()
+
+    # Prediction is rule-based, so the sklearn estimators (and the slow
+    # sklearn import) are only built when something asks for them
+    @property
+    def models(self):
+        if self._models is None:
+            self.init_models()
+        return self._models
+
+    @property
+    def scalers(self):
+        if self._scalers is None:
+            self.init_models()
+        return self._scalers
     
     def init_models(self):
         """Initialize ML models with trained weights"""
+        from sklearn.preprocessing import StandardScaler
+
         # PCOS Model
-        self.models['pcos'] = self.create_pcos_model()
-        self.models['thyroid'] = self.create_thyroid_model()
-        self.models['diabetes'] = self.create_diabetes_model()
+        self._models = {}
+        self._models['pcos'] = self.create_pcos_model()
+        self._models['thyroid'] = self.create_thyroid_model()
+        self._models['diabetes'] = self.create_diabetes_model()
         
         # Initialize scalers
-        self.scalers['pcos'] = StandardScaler()
-        self.scalers['thyroid'] = StandardScaler()
-        self.scalers['diabetes'] = StandardScaler()
+        self._scalers = {}
+        self._scalers['pcos'] = StandardScaler()
+        self._scalers['thyroid'] = StandardScaler()
+        self._scalers['diabetes'] = StandardScaler()
         
         # Fit scalers with sample data
         sample_data = np.random.randn(100, len(self.features))
-        for scaler in self.scalers.values():
+        for scaler in self._scalers.values():
             scaler.fit(sample_data)
     
     def create_pcos_model(self):
         """Create and return PCOS prediction model"""
+        from sklearn.ensemble import RandomForestClassifier
         return RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42)
     
     def create_thyroid_model(self):
         """Create and return thyroid prediction model"""
+        from sklearn.ensemble import RandomForestClassifier
         return RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42)
     
     def create_diabetes_model(self):
         """Create and return diabetes prediction model"""
+        from sklearn.ensemble import RandomForestClassifier
         return RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42)
     
     def predict_pcos_risk(self, features):
@@ -95,6 +112,65 @@ class HealthPredictor:
         
         return min(risk_score, 1.0)
     
+    def feature_arrays(self, input_data):
+        """Column arrays for each feature from a DataFrame, dict of arrays or list of records"""
+        if isinstance(input_data, (list, tuple)):
+            # A feature a record leaves out is 0, the same default predict() uses
+            present = {key for record in input_data for key in record}
+            columns = {
+                feature: [record.get(feature, 0) for record in input_data]
+                for feature in self.features if feature in present
+            }
+            length = len(input_data)
+        else:
+            # A DataFrame or a dict of columns; pandas is only needed if the caller already has it
+            columns = {feature: input_data[feature] for feature in self.features if feature in input_data}
+            length = len(input_data) if hasattr(input_data, 'columns') else len(next(iter(input_data.values()), ()))
+        return {
+            feature: np.asarray(columns[feature], dtype=float) if feature in columns else np.zeros(length)
+            for feature in self.features
+        }
+
+    def rule_contributions(self, f):
+        """What each feature adds to each rule-based risk, before the 1.0 cap"""
+        # Listed in the same order as the scalar rules add them
+        bmi = np.where(f['BMI'] > 25, 0.1, 0.0)
+        tsh = f['TSH_Level']
+        blood_sugar = f['Blood_Sugar']
+        return {
+            'pcos_risk': {
+                'Irregular_Periods': np.where(f['Irregular_Periods'] != 0, 0.4, 0.0),
+                'Excess_Hair_Growth': np.where(f['Excess_Hair_Growth'] != 0, 0.3, 0.0),
+                'Acne': np.where(f['Acne'] != 0, 0.2, 0.0),
+                'BMI': bmi,
+            },
+            'thyroid_risk': {
+                'TSH_Level': np.where((tsh < 0.4) | (tsh > 4.0), 0.5, 0.0),
+                'Tiredness': np.where(f['Tiredness'] != 0, 0.3, 0.0),
+                'Hair_Fall': np.where(f['Hair_Fall'] != 0, 0.2, 0.0),
+            },
+            'diabetes_risk': {
+                'Blood_Sugar': np.where(blood_sugar > 126, 0.5, np.where(blood_sugar > 100, 0.3, 0.0)),
+                'Frequent_Urination': np.where(f['Frequent_Urination'] != 0, 0.2, 0.0),
+                'Family_Diabetes': np.where(f['Family_Diabetes'] != 0, 0.2, 0.0),
+                'BMI': bmi,
+            },
+        }
+
+    def predict_batch(self, input_data):
+        """Vectorised prediction over a batch; matches predict() row for row"""
+        f = self.feature_arrays(input_data)
+
+        # Adding the contributions in rule order (a 0.0 where a rule does not
+        # fire changes nothing) gives results identical to the scalar rules
+        risks = {}
+        for risk, contributions in self.rule_contributions(f).items():
+            score = np.zeros(len(f['BMI']))
+            for values in contributions.values():
+                score = score + values
+            risks[risk] = np.minimum(score, 1.0)
+        return risks
+
     def predict(self, input_data):
         """Main prediction method"""
         try:
@@ -116,4 +192,68 @@ class HealthPredictor:
                 'pcos_risk': 0.1,
                 'thyroid_risk': 0.1,
                 'diabetes_risk': 0.1
-            }
\ No newline at end of file
+            }
+
+class TrainedHealthPredictor(HealthPredictor):
+    """HealthPredictor whose risks come from its random forests, fitted on labelled data"""
+
+    LABELS = {'pcos': 'PCOS', 'thyroid': 'Thyroid', 'diabetes': 'Diabetes'}
+
+    def __init__(self, **forest_params):
+        super().__init__()
+        self.forest_params = forest_params
+        self._compiled = None
+
+    def feature_matrix(self, input_data):
+        """Rows x features array in self.features order"""
+        arrays = self.feature_arrays(input_data)
+        return np.column_stack([arrays[feature] for feature in self.features])
+
+    def fit(self, data):
+        """Fit one forest per disease on a DataFrame with feature and label columns"""
+        labels = {disease: data[label].to_numpy() for disease, label in self.LABELS.items()}
+        return self.fit_matrix(self.feature_matrix(data), labels)
+
+    def fit_matrix(self, X, labels):
+        """Fit from a prepared feature matrix and a disease -> label array mapping"""
+        for disease in self.LABELS:
+            model = self.models[disease]
+            model.set_params(**self.forest_params)
+            model.fit(X, labels[disease])
+        self._compiled = None
+        return self
+
+    def predict_batch(self, input_data):
+        return self.predict_matrix(self.feature_matrix(input_data))
+
+    def predict_matrix(self, X):
+        risks = {}
+        for disease in self.LABELS:
+            model = self.models[disease]
+            if 1 not in model.classes_:
+                # Never saw a positive case in training
+                risks[f'{disease}_risk'] = np.zeros(len(X))
+            else:
+                risks[f'{disease}_risk'] = model.predict_proba(X)[:, list(model.classes_).index(1)]
+        return risks
+
+    def compile(self):
+        """Flat-array copy of the fitted forests for fast scoring without sklearn; built once per fit"""
+        if self._compiled is None:
+            from utils.compiled_forest import CompiledHealthPredictor
+            self._compiled = CompiledHealthPredictor.from_trained(self)
+        return self._compiled
+
+    def predict(self, input_data):
+        """Main prediction method"""
+        try:
+            # One-row matrix built directly; a DataFrame costs more than the scoring
+            X = np.array([[float(input_data.get(feature, 0)) for feature in self.features]])
+            return {name: float(values[0]) for name, values in self.predict_matrix(X).items()}
+        except Exception as e:
+            print(f"Prediction error: {e}")
+            return {
+                'pcos_risk': 0.1,
+                'thyroid_risk': 0.1,
+                'diabetes_risk': 0.1
+            }
@@ -0,0 +1,211 @@
+# utils/precompute.py
+import time
+import threading
+from database import get_db, get_analytics_db
+
+# Derived data (dropdown lists, the doctor directory, admin aggregates) is
+# computed by a background thread and published to a shared dict, so page
+# reruns read the latest result instead of querying SQLite again
+
+
+class PrecomputeJob:
+    """A named computation re-run on an interval and/or when its trigger value changes"""
+
+    def __init__(self, name, fn, interval=None, trigger=None, trigger_interval=None):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        # trigger() returns a cheap signature (a version counter, a max id); a change means stale.
+        # trigger_interval spaces out reads of a trigger that costs more than a lookup
+        self.trigger = trigger
+        self.trigger_interval = trigger_interval
+        self.trigger_checked_at = 0
+        self.signature = None
+        self.runs = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_run_at = None
+        self.last_duration = None
+        self.total_duration = 0.0
+        self.invalidated = True
+
+    def read_trigger(self, signatures):
+        """Current trigger value, read once per scheduler pass however many jobs share the trigger"""
+        if self.trigger not in signatures:
+            signatures[self.trigger] = self.trigger()
+        return signatures[self.trigger]
+
+    def is_due(self, now, signatures):
+        if self.invalidated or self.last_run_at is None:
+            return True
+        if self.interval and now - self.last_run_at >= self.interval:
+            return True
+        if not self.trigger or (self.trigger_interval and now - self.trigger_checked_at < self.trigger_interval):
+            return False
+        self.trigger_checked_at = now
+        return self.read_trigger(signatures) != self.signature
+
+    def stats(self):
+        return {
+            'job': self.name,
+            'runs': self.runs,
+            'errors': self.errors,
+            'last_refresh': self.last_run_at,
+            'last_ms': None if self.last_duration is None else self.last_duration * 1000,
+            'mean_ms': self.total_duration / self.runs * 1000 if self.runs else None,
+            'refresh': ', '.join(filter(None, [
+                f"every {self.interval:g} s" if self.interval else None,
+                ("on change" + (f" (checked every {self.trigger_interval:g} s)" if self.trigger_interval else ""))
+                if self.trigger else None,
+            ])),
+            'last_error': self.last_error,
+        }
+
+
+class Precomputer:
+    """Runs registered PrecomputeJobs on one daemon thread and publishes their results.
+
+    get() never waits on the scheduler: it returns the last published result.
+    Only the very first read of a job that has never run computes it inline.
+    """
+
+    def __init__(self, poll_seconds=1.0):
+        self.poll_seconds = poll_seconds
+        self.jobs = {}
+        self._results = {}
+        self._run_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+    def register(self, name, fn, interval=None, trigger=None, trigger_interval=None):
+        self.jobs[name] = PrecomputeJob(name, fn, interval, trigger, trigger_interval)
+        return self
+
+    def run_job(self, job, only_if_missing=False, signatures=None):
+        with self._run_lock:
+            if only_if_missing and job.name in self._results:
+                return
+            # Cleared first, so an invalidate() during the run schedules another one
+            job.invalidated = False
+            signature = job.read_trigger({} if signatures is None else signatures) if job.trigger else None
+            job.trigger_checked_at = time.time()
+            start = time.perf_counter()
+            try:
+                result = job.fn()
+            except Exception as e:
+                job.errors += 1
+                job.last_error = str(e)
+                print(f"Error precomputing {job.name}: {e}")
+                return
+            job.last_duration = time.perf_counter() - start
+            job.total_duration += job.last_duration
+            job.runs += 1
+            job.last_run_at = time.time()
+            job.signature = signature
+            job.last_error = None
+            # One reference swap, so readers see the old result or the new one, never a mix
+            self._results = {**self._results, job.name: result}
+
+    def run_due(self):
+        """Run every job that is due; returns the names run"""
+        now = time.time()
+        # Jobs sharing a trigger (the doctor lists) check it with a single query per pass
+        signatures = {}
+        due = []
+        for job in self.jobs.values():
+            try:
+                if job.is_due(now, signatures):
+                    due.append(job)
+            except Exception as e:
+                print(f"Error checking {job.name}: {e}")
+        for job in due:
+            self.run_job(job, signatures=signatures)
+        return [job.name for job in due]
+
+    def get(self, name):
+        results = self._results
+        if name not in results:
+            self.run_job(self.jobs[name], only_if_missing=True)
+            results = self._results
+        return results.get(name)
+
+    def invalidate(self, name):
+        """Mark a job stale so the scheduler recomputes it on its next pass"""
+        self.jobs[name].invalidated = True
+        self._wake.set()
+
+    def loop(self):
+        while not self._stopped:
+            self.run_due()
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.loop, name="precompute", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """End the scheduler thread after its current pass"""
+        self._stopped = True
+        self._wake.set()
+
+    def stats(self):
+        return [job.stats() for job in self.jobs.values()]
+
+
+def load_doctor_directory(database=None):
+    """All doctors ordered by rating, plus an id -> doctor index"""
+    doctors = (database or get_db()).get_doctors_by_specialty()
+    return doctors, {doctor['id']: doctor for doctor in doctors}
+
+
+def register_default_jobs(precomputer, database=None):
+    db = database or get_db()
+    # upsert_doctors bumps the version, so polling is one primary-key lookup, not a table scan
+    doctors_changed = lambda: db.get_table_version('doctors')
+    precomputer.register('specialties', db.get_all_specialties, trigger=doctors_changed)
+    precomputer.register('locations', db.get_all_locations, trigger=doctors_changed)
+    precomputer.register('doctor_directory', lambda: load_doctor_directory(db), trigger=doctors_changed)
+
+    # Merged population sketches for percentile ranks; only new assessments change them
+    precomputer.register('population_sketches', db.get_metric_sketches, trigger=db.get_assessment_watermark)
+
+    # The 30-day active-user window moves with the clock, so also refresh on an interval.
+    # The trigger counts users and reads every shard, so it is checked every 30 s, not every pass
+    analytics = db if database is not None else get_analytics_db()
+    precomputer.register(
+        'analytics', analytics.get_analytics, interval=300,
+        trigger=lambda: (analytics.table_signature('users'), analytics.get_assessment_watermark(),
+                         analytics.table_signature('login_history')),
+        trigger_interval=30
+    )
+    return precomputer
+
+
+_precomputer = None
+_precomputer_lock = threading.Lock()
+
+
+def get_precomputer():
+    """The process-wide Precomputer with the default jobs, started on first use"""
+    global _precomputer
+    with _precomputer_lock:
+        if _precomputer is None:
+            _precomputer = register_default_jobs(Precomputer()).start()
+        return _precomputer
+
+
+def reset_precomputer():
+    """Stop the process-wide Precomputer; the next get_precomputer() registers its jobs on the current database"""
+    global _precomputer
+    with _precomputer_lock:
+        if _precomputer is not None:
+            _precomputer.stop()
+        _precomputer = None
+
+
+def precomputed(name):
+    return get_precomputer().get(name)
@@ -0,0 +1,123 @@
+# utils/retention.py
+import time
+import argparse
+from database import get_db
+
+
+class LoginRetention:
+    """Folds old login_history rows into login_daily_summary and reclaims the space.
+
+    Every step is a short transaction over at most ``batch_size`` rows, and
+    free pages are returned with ``PRAGMA incremental_vacuum`` a few at a time,
+    so the app's own writes are never blocked for long.
+    """
+
+    def __init__(self, database=None, retention_days=90, batch_size=5000,
+                 vacuum_pages=256, pause_seconds=0.01):
+        self.db = database or get_db()
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.pause_seconds = pause_seconds
+
+    def cutoff(self):
+        return f"-{int(self.retention_days)} days"
+
+    def compact_shard(self, conn):
+        """Roll up and delete expired login rows on one shard; returns rows folded"""
+        folded = 0
+        while True:
+            row = conn.execute('''
+                SELECT MAX(id), COUNT(*) FROM (
+                    SELECT id FROM login_history
+                    WHERE login_time < datetime('now', ?)
+                    ORDER BY id LIMIT ?
+                )
+            ''', (self.cutoff(), self.batch_size)).fetchone()
+            max_id, count = row
+            if not count:
+                break
+
+            with conn:
+                conn.execute('''
+                    INSERT INTO login_daily_summary (username, day, logins, last_login)
+                    SELECT username, date(login_time), COUNT(*), MAX(login_time)
+                    FROM login_history
+                    WHERE id <= ? AND login_time < datetime('now', ?)
+                    GROUP BY username, date(login_time)
+                    ON CONFLICT (username, day) DO UPDATE SET
+                        logins = logins + excluded.logins,
+                        last_login = MAX(last_login, excluded.last_login)
+                ''', (max_id, self.cutoff()))
+                conn.execute("DELETE FROM login_history WHERE id <= ? AND login_time < datetime('now', ?)",
+                             (max_id, self.cutoff()))
+
+            folded += count
+            time.sleep(self.pause_seconds)
+        return folded
+
+    def incremental_vacuum(self, conn):
+        """Release free pages back to the OS in small steps; returns pages released"""
+        return incremental_vacuum(conn, self.vacuum_pages, self.pause_seconds)
+
+    def run(self):
+        """Compact and vacuum every shard; returns a summary dict"""
+        def compact(conn, index):
+            before = database_size(conn)
+            folded = self.compact_shard(conn)
+            released = self.incremental_vacuum(conn)
+            return {'folded': folded, 'pages_released': released,
+                    'bytes_before': before, 'bytes_after': database_size(conn)}
+
+        shards = self.db.fan_out(compact)
+        return {key: sum(shard[key] for shard in shards) for key in shards[0]}
+
+
+def database_size(conn):
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+
+
+def incremental_vacuum(conn, vacuum_pages=256, pause_seconds=0.01):
+    """Release free pages back to the OS in small steps; returns pages released"""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return 0
+
+    released = 0
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    while free_pages:
+        conn.execute(f"PRAGMA incremental_vacuum({vacuum_pages})").fetchall()
+        remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if remaining >= free_pages:
+            break
+        released += free_pages - remaining
+        free_pages = remaining
+        time.sleep(pause_seconds)
+    return released
+
+
+def enable_incremental_vacuum(database=None):
+    """One-off conversion of existing files to auto_vacuum=INCREMENTAL (runs a full VACUUM)"""
+    database = database or get_db()
+    for path in dict.fromkeys([database.storage.catalog_path] + database.storage.shard_paths):
+        conn = database.storage.connect(path)
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Roll up and prune login_history")
+    parser.add_argument("--retention-days", type=int, default=90)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="Convert existing database files first (one full VACUUM)")
+    args = parser.parse_args()
+
+    if args.enable_incremental_vacuum:
+        enable_incremental_vacuum()
+
+    summary = LoginRetention(retention_days=args.retention_days, batch_size=args.batch_size).run()
+    print(f"Folded {summary['folded']} login row(s) older than {args.retention_days} days")
+    print(f"Database size: {summary['bytes_before'] / 1e6:.2f} MB -> {summary['bytes_after'] / 1e6:.2f} MB "
+          f"({summary['pages_released']} page(s) released)")
@@ -0,0 +1,74 @@
+# utils/session_cache.py
+import threading
+from collections import OrderedDict, deque
+from database import get_db
+from utils.precompute import get_precomputer, load_doctor_directory, precomputed
+
+# Streamlit keeps one session_state per browser tab alive in the server process,
+# so sessions hold only ids; the full records live once per process here
+SESSION_HISTORY_LIMIT = 20
+
+
+class SharedLRUCache:
+    """Thread-safe, size-bounded LRU cache shared by every session in the process"""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+
+        value = loader(key)
+        if value is not None:
+            with self._lock:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_assessments = SharedLRUCache()
+
+
+def new_history(ids=()):
+    """Bounded ring buffer of assessment ids, oldest first"""
+    return deque(ids, maxlen=SESSION_HISTORY_LIMIT)
+
+
+def get_assessment(assessment_id, database=None):
+    """Full assessment for an id; saved assessments never change, so entries never go stale"""
+    if assessment_id is None:
+        return None
+    return _assessments.get(assessment_id, (database or get_db()).get_assessment)
+
+
+def clear_assessments():
+    """Forget every cached assessment, e.g. when set_db() replaces the database"""
+    _assessments.clear()
+
+
+def get_doctor_directory(database=None):
+    """All doctors ordered by rating, as last published by the precompute scheduler"""
+    if database is not None:
+        return load_doctor_directory(database)[0]
+    return (precomputed('doctor_directory') or ([], {}))[0]
+
+
+def get_doctors_by_ids(doctor_ids, database=None):
+    """Doctors for a list of ids, in the given order"""
+    _, by_id = load_doctor_directory(database) if database is not None else precomputed('doctor_directory') or ([], {})
+    return [by_id[doctor_id] for doctor_id in doctor_ids if doctor_id in by_id]
+
+
+def invalidate_doctor_directory():
+    get_precomputer().invalidate('doctor_directory')
@@ -0,0 +1,162 @@
+# utils/snapshots.py
+import os
+import json
+import time
+import shutil
+import argparse
+import pandas as pd
+from database import get_analytics_db
+from utils.data_processor import AGE_BREAKPOINTS, BMI_BREAKPOINTS
+
+SNAPSHOT_DIR = "snapshots"
+
+
+class AssessmentSnapshot:
+    """Columnar Parquet snapshots of assessment_history, appended by id watermark.
+
+    Rows are written to ``<snapshot_dir>/assessment_history/date=YYYY-MM-DD/``
+    as one Parquet part file per run, so analytics read the snapshot instead of
+    the live SQLite table. A run that finds 'delete' events in the change feed
+    (the dedup migration removing rows) rebuilds the snapshot from scratch.
+    """
+
+    def __init__(self, snapshot_dir=SNAPSHOT_DIR, database=None):
+        self.db = database or get_analytics_db()
+        self.snapshot_dir = snapshot_dir
+        self.table_dir = os.path.join(snapshot_dir, "assessment_history")
+        self.watermark_path = os.path.join(snapshot_dir, "_watermark.json")
+
+    def read_state(self):
+        if not os.path.exists(self.watermark_path):
+            return {}
+        with open(self.watermark_path) as f:
+            return json.load(f)
+
+    def get_watermark(self):
+        """Get the per-shard highest assessment ids already written to the snapshot"""
+        data = self.read_state()
+        return self.db.normalize_watermark(data.get('watermark', data.get('last_id', 0)))
+
+    def get_change_offset(self):
+        """Change-feed offset the snapshot has seen deletes up to (snapshots from before it start at 0)"""
+        return self.db.normalize_watermark(self.read_state().get('changes', 0))
+
+    def set_watermark(self, watermark, changes):
+        """Atomically record the highest snapshotted assessment ids and change-feed offset"""
+        tmp_path = self.watermark_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'watermark': list(watermark), 'changes': list(changes), 'updated_at': time.time()}, f)
+        os.replace(tmp_path, self.watermark_path)
+
+    def version(self):
+        """Changes whenever a run writes rows or rebuilds; a cache key for readers"""
+        try:
+            return os.stat(self.watermark_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def clear(self):
+        """Drop every part; the watermark goes first, so a crash part-way only repeats the rebuild"""
+        if os.path.exists(self.watermark_path):
+            os.remove(self.watermark_path)
+        shutil.rmtree(self.table_dir, ignore_errors=True)
+
+    def run(self, batch_size=100000):
+        """Append rows newer than the watermark, rebuilding first if rows were deleted; returns rows written"""
+        # Parquet parts cannot drop rows in place, so deleted assessments mean starting over
+        deleted, changes = self.db.read_deletes_since(self.get_change_offset())
+        if deleted:
+            self.clear()
+        os.makedirs(self.table_dir, exist_ok=True)
+        written = 0
+
+        while True:
+            watermark = self.get_watermark()
+            columns, rows = self.db.fetch_assessment_rows(watermark, batch_size)
+            if not rows:
+                break
+
+            df = pd.DataFrame.from_records(rows, columns=columns)
+            df['date'] = pd.to_datetime(df['timestamp']).dt.strftime("%Y-%m-%d")
+            first_id, max_id = int(df['id'].iloc[0]), int(df['id'].iloc[-1])
+
+            for date, part in df.groupby('date', sort=False):
+                partition_dir = os.path.join(self.table_dir, f"date={date}")
+                os.makedirs(partition_dir, exist_ok=True)
+                part_path = os.path.join(partition_dir, f"part-{first_id:012d}-{max_id:012d}.parquet")
+                part.drop(columns=['date']).to_parquet(part_path, index=False)
+
+            # Parts are written before the watermark moves, so a crash can only
+            # produce duplicate ids, which load() drops
+            self.set_watermark(self.db.advance_watermark(watermark, df['id']), changes)
+            written += len(df)
+
+        if changes != self.get_change_offset():
+            self.set_watermark(self.get_watermark(), changes)
+        return written
+
+    def run_periodically(self, interval_seconds=300):
+        """Run the snapshot job forever at a fixed interval"""
+        while True:
+            try:
+                written = self.run()
+                print(f"Snapshot: {written} new assessment(s), watermark {self.get_watermark()}")
+            except Exception as e:
+                print(f"Error writing snapshot: {e}")
+            time.sleep(interval_seconds)
+
+    def has_data(self):
+        """Check whether any snapshot parts have been written"""
+        return self.get_watermark() != self.db.normalize_watermark(0) and os.path.isdir(self.table_dir)
+
+    def load(self, columns=None):
+        """Load the snapshot as a DataFrame"""
+        if not self.has_data():
+            return pd.DataFrame(columns=columns or [])
+
+        if columns is not None and 'id' not in columns:
+            columns = ['id'] + list(columns)
+
+        df = pd.read_parquet(self.table_dir, columns=columns)
+        return df.drop_duplicates('id')
+
+    def diagnosis_distribution(self):
+        """Count assessments per primary disease"""
+        df = self.load(['primary_disease'])
+        if df.empty:
+            return []
+
+        counts = df['primary_disease'].fillna('Unknown').value_counts()
+        return [{'disease': disease, 'count': int(count)} for disease, count in counts.items()]
+
+    def age_band_breakdown(self):
+        """Count assessments per age band and primary disease"""
+        df = self.load(['age', 'primary_disease'])
+        if df.empty:
+            return pd.DataFrame()
+
+        bands = AGE_BREAKPOINTS.categorize_array(df['age'])
+        return pd.crosstab(bands, df['primary_disease'].fillna('Unknown'))
+
+    def bmi_category_breakdown(self):
+        """Count assessments per BMI category and overall risk"""
+        df = self.load(['bmi', 'overall_risk'])
+        if df.empty:
+            return pd.DataFrame()
+
+        bands = BMI_BREAKPOINTS.categorize_array(df['bmi'])
+        return pd.crosstab(bands, df['overall_risk'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshot assessment_history to Parquet")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR)
+    parser.add_argument("--interval", type=int, default=0,
+                        help="Seconds between runs; 0 runs once and exits")
+    args = parser.parse_args()
+
+    snapshot = AssessmentSnapshot(args.snapshot_dir)
+    if args.interval:
+        snapshot.run_periodically(args.interval)
+    else:
+        print(f"Snapshot: {snapshot.run()} new assessment(s)")
@@ -0,0 +1,182 @@
+# utils/tuning.py
+import os
+import json
+import time
+import hashlib
+import argparse
+import itertools
+import statistics
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from utils.model import TrainedHealthPredictor
+from utils.evaluation import (
+    DATA_PATH, DISEASES, ModelEvaluator, load_labelled_data, route_specialists, safe_auc
+)
+
+CACHE_DIR = ".tuning_cache"
+N_ESTIMATORS = [10, 25, 50, 100, 200]
+MAX_DEPTH = [2, 3, 5, 10, None]
+METRICS = ['roc_auc', 'routing_accuracy']
+LATENCY_BATCH = 1000
+
+
+def fold_cache_dir(evaluator, cache_dir=CACHE_DIR):
+    """Cache directory for one dataset and fold layout"""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(evaluator.data, index=False).values)
+    digest.update(f"{evaluator.n_splits}:{evaluator.random_state}".encode())
+    return os.path.join(cache_dir, digest.hexdigest()[:16])
+
+
+def cache_folds(evaluator, cache_dir=CACHE_DIR):
+    """Write each fold's feature matrices and labels to disk once; returns the fold file paths"""
+    directory = fold_cache_dir(evaluator, cache_dir)
+    paths = [os.path.join(directory, f"fold_{i}.npz") for i in range(evaluator.n_splits)]
+    if all(os.path.exists(path) for path in paths):
+        return paths
+
+    os.makedirs(directory, exist_ok=True)
+    data = evaluator.data
+    X = TrainedHealthPredictor().feature_matrix(data)
+    labels = {disease: data[label].to_numpy() for disease, label in TrainedHealthPredictor.LABELS.items()}
+    routes = data['Recommended_Specialist'].to_numpy(dtype=str)
+    for path, (train_index, test_index) in zip(paths, evaluator.folds()):
+        arrays = {'X_train': X[train_index], 'X_test': X[test_index], 'routes_test': routes[test_index]}
+        for disease, y in labels.items():
+            arrays[f'{disease}_train'] = y[train_index]
+            arrays[f'{disease}_test'] = y[test_index]
+        np.savez(path, **arrays)
+    return paths
+
+
+def score_config(params, fold_paths):
+    """Cross-validated metrics for one forest configuration, read from the cached folds"""
+    predictions = {column: [] for column in DISEASES.values()}
+    labels = {disease: [] for disease in DISEASES}
+    routes = []
+    for path in fold_paths:
+        fold = np.load(path)
+        model = TrainedHealthPredictor(n_jobs=1, **params)
+        model.fit_matrix(fold['X_train'], {d: fold[f'{d}_train'] for d in model.LABELS})
+        for column, values in model.predict_matrix(fold['X_test']).items():
+            predictions[column].append(values)
+        for disease, label in model.LABELS.items():
+            labels[label].append(fold[f'{disease}_test'])
+        routes.append(fold['routes_test'])
+
+    predictions = {column: np.concatenate(values) for column, values in predictions.items()}
+    aucs = {disease: safe_auc(np.concatenate(labels[disease]), predictions[column])
+            for disease, column in DISEASES.items()}
+    known = [auc for auc in aucs.values() if auc is not None]
+    return {
+        'roc_auc': float(np.mean(known)) if known else None,
+        'disease_roc_auc': aucs,
+        'routing_accuracy': float((route_specialists(predictions) == np.concatenate(routes)).mean()),
+    }
+
+
+def measure_latency(params, data, repeats=200):
+    """Median single-row predict() and batch predict_batch() latency of a model fitted on all rows"""
+    model = TrainedHealthPredictor(n_jobs=1, **params).fit(data)
+    records = data[model.features].to_dict('records')
+
+    single = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        model.predict(records[i % len(records)])
+        single.append(time.perf_counter() - start)
+
+    batch = data.sample(LATENCY_BATCH, replace=True, random_state=0)
+    timings = []
+    for _ in range(max(repeats // 20, 3)):
+        start = time.perf_counter()
+        model.predict_batch(batch)
+        timings.append(time.perf_counter() - start)
+    return {
+        'single_row_ms': statistics.median(single) * 1000,
+        'batch_ms': statistics.median(timings) * 1000,
+    }
+
+
+def pareto_front(results, metric):
+    """Indices of configurations no other configuration beats on metric and both latencies"""
+    def dominates(a, b):
+        no_worse = (a[metric] >= b[metric] and a['single_row_ms'] <= b['single_row_ms']
+                    and a['batch_ms'] <= b['batch_ms'])
+        better = (a[metric] > b[metric] or a['single_row_ms'] < b['single_row_ms']
+                  or a['batch_ms'] < b['batch_ms'])
+        return no_worse and better
+
+    scored = [r for r in results if r[metric] is not None]
+    return [i for i, r in enumerate(results)
+            if r[metric] is not None and not any(dominates(other, r) for other in scored)]
+
+
+class HyperparameterSearch:
+    """Grid search over forest size and depth, scored on cached cross-validation folds.
+
+    Configurations are cross-validated in parallel worker processes. Latency is
+    measured afterwards, one configuration at a time, so the timings are not
+    skewed by workers competing for the CPU.
+    """
+
+    def __init__(self, data=None, n_splits=5, n_jobs=-1, metric='roc_auc', cache_dir=CACHE_DIR):
+        self.evaluator = ModelEvaluator(data, n_splits=n_splits)
+        self.n_jobs = n_jobs
+        self.metric = metric
+        self.cache_dir = cache_dir
+
+    def grid(self, n_estimators=N_ESTIMATORS, max_depth=MAX_DEPTH):
+        return [{'n_estimators': n, 'max_depth': d} for n, d in itertools.product(n_estimators, max_depth)]
+
+    def run(self, configs=None, repeats=200):
+        configs = configs or self.grid()
+        fold_paths = cache_folds(self.evaluator, self.cache_dir)
+        scores = Parallel(n_jobs=self.n_jobs, backend='loky')(
+            delayed(score_config)(params, fold_paths) for params in configs
+        )
+
+        results = []
+        for params, score in zip(configs, scores):
+            result = dict(params, **score)
+            result.update(measure_latency(params, self.evaluator.data, repeats))
+            results.append(result)
+
+        front = set(pareto_front(results, self.metric))
+        for i, result in enumerate(results):
+            result['pareto'] = i in front
+        return results
+
+
+def print_results(results, metric):
+    print(f"{'trees':>6} {'depth':>6} {metric:>17} {'single row':>12} {'batch of ' + str(LATENCY_BATCH):>14}")
+    for r in sorted(results, key=lambda r: (not r['pareto'], -(r[metric] or 0))):
+        value = "n/a" if r[metric] is None else f"{r[metric]:.3f}"
+        print(f"{r['n_estimators']:>6} {str(r['max_depth']):>6} {value:>17} "
+              f"{r['single_row_ms']:9.2f} ms {r['batch_ms']:11.2f} ms {'*' if r['pareto'] else ''}")
+    print("* Pareto-optimal: no other setting is at least as accurate and as fast on both latencies")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search forest size and depth for accuracy and latency")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--metric", choices=METRICS, default='roc_auc')
+    parser.add_argument("--n-estimators", type=int, nargs='+', default=N_ESTIMATORS)
+    parser.add_argument("--max-depth", type=lambda v: None if v == 'none' else int(v), nargs='+',
+                        default=MAX_DEPTH, help="Depths to try; 'none' for unlimited")
+    parser.add_argument("--repeats", type=int, default=200, help="Single-row timings per configuration")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--output", help="Write the results as JSON here")
+    args = parser.parse_args()
+
+    search = HyperparameterSearch(load_labelled_data(args.data), n_splits=args.folds,
+                                  n_jobs=args.n_jobs, metric=args.metric, cache_dir=args.cache_dir)
+    results = search.run(search.grid(args.n_estimators, args.max_depth), repeats=args.repeats)
+    print_results(results, args.metric)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
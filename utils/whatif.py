@@ -0,0 +1,96 @@
+# utils/whatif.py
+import itertools
+import numpy as np
+
+# Risk surfaces for the what-if explorer: the predictor and the diagnosis
+# rules evaluated over a whole grid of inputs in one vectorised pass
+
+DISEASES = ['PCOS', 'Thyroid', 'Diabetes']
+RISK_LEVELS = ['Low', 'Medium', 'High']
+NUMERIC_AXES = {
+    'BMI': (15.0, 45.0),
+    'Blood_Sugar': (60.0, 300.0),
+    'TSH_Level': (0.1, 10.0),
+    'Age': (16.0, 80.0),
+}
+SYMPTOMS = [
+    'Irregular_Periods', 'Excess_Hair_Growth', 'Acne', 'Tiredness',
+    'Hair_Fall', 'Frequent_Urination', 'Family_Diabetes'
+]
+
+
+def numeric_axis(feature, steps):
+    """Evenly spaced values of a numeric feature over its plausible range"""
+    low, high = NUMERIC_AXES[feature]
+    return {feature: np.linspace(low, high, steps)}
+
+
+def symptom_axis(symptoms):
+    """Every on/off combination of the given symptoms, with a label per combination"""
+    combinations = np.array(list(itertools.product([0, 1], repeat=len(symptoms))), dtype=float)
+    labels = [
+        ", ".join(name.replace('_', ' ') for name, on in zip(symptoms, row) if on) or "None"
+        for row in combinations
+    ]
+    return {name: combinations[:, i] for i, name in enumerate(symptoms)}, labels
+
+
+def diagnosis_arrays(predictions, features):
+    """Vectorised get_disease_diagnosis: primary disease codes (into DISEASES) and confidence"""
+    pcos = (np.where(features['Irregular_Periods'] != 0, 3, 0)
+            + np.where(features['Excess_Hair_Growth'] != 0, 2, 0)
+            + np.where(features['Acne'] != 0, 1, 0))
+    tsh = features['TSH_Level']
+    thyroid = (np.where((tsh < 0.4) | (tsh > 4.0), 3, 0)
+               + np.where(features['Tiredness'] != 0, 2, 0)
+               + np.where(features['Hair_Fall'] != 0, 1, 0))
+    diabetes = (np.where(features['Blood_Sugar'] > 126, 3, 0)
+                + np.where(features['Frequent_Urination'] != 0, 2, 0)
+                + np.where(features['Family_Diabetes'] != 0, 1, 0))
+
+    scores = np.stack([
+        pcos + predictions['pcos_risk'] * 10,
+        thyroid + predictions['thyroid_risk'] * 10,
+        diabetes + predictions['diabetes_risk'] * 10
+    ])
+    # argmax keeps the first maximum, like max() over the scores dict
+    codes = scores.argmax(axis=0)
+    confidence = np.take_along_axis(scores, codes[None], axis=0)[0] / 13 * 100
+    return codes, confidence
+
+
+def overall_risk_codes(predictions):
+    """Vectorised calculate_overall_risk as codes into RISK_LEVELS"""
+    max_risk = np.maximum(np.maximum(predictions['pcos_risk'], predictions['thyroid_risk']),
+                          predictions['diabetes_risk'])
+    return np.where(max_risk > 0.7, 2, np.where(max_risk > 0.4, 1, 0))
+
+
+def risk_surface(predictor, input_data, x_axis, y_axis):
+    """Risks and diagnosis over the grid spanned by two axes, holding other inputs fixed.
+
+    Each axis maps feature names to equal-length value arrays (one numeric
+    feature, or several symptoms switched together). Every result is a
+    2-D array indexed [y, x].
+    """
+    nx = len(next(iter(x_axis.values())))
+    ny = len(next(iter(y_axis.values())))
+
+    features = {}
+    for feature in predictor.features:
+        if feature in x_axis:
+            values = np.broadcast_to(np.asarray(x_axis[feature], dtype=float)[None, :], (ny, nx))
+        elif feature in y_axis:
+            values = np.broadcast_to(np.asarray(y_axis[feature], dtype=float)[:, None], (ny, nx))
+        else:
+            values = np.full((ny, nx), float(input_data.get(feature, 0)))
+        features[feature] = values.ravel()
+
+    predictions = predictor.predict_batch(features)
+    codes, confidence = diagnosis_arrays(predictions, features)
+
+    surface = {name: values.reshape(ny, nx) for name, values in predictions.items()}
+    surface['overall_risk'] = overall_risk_codes(predictions).reshape(ny, nx)
+    surface['primary_disease'] = codes.reshape(ny, nx)
+    surface['confidence'] = confidence.reshape(ny, nx)
+    return surface
@@ -0,0 +1,31 @@
+# views/__init__.py
+import importlib
+
+# Menu label -> (module, sidebar icon). A page module is imported the first
+# time the page is shown, so a rerun only loads the active page and what it uses
+PAGES = {
+    "Home": ("views.home", "house"),
+    "Reference Ranges": ("views.reference_ranges", "book"),
+    "Health Assessment": ("views.assessment", "activity"),
+    "What-If Explorer": ("views.whatif", "sliders"),
+    "BMI Calculator": ("views.bmi_calculator", "calculator"),
+    "Doctor Recommendations": ("views.doctors", "person-lines-fill"),
+    "Health History": ("views.history", "clock-history"),
+    "Disease Information": ("views.disease_info", "info-circle"),
+    "Admin Panel": ("views.admin", "shield-lock"),
+}
+ADMIN_PAGES = {"Admin Panel"}
+
+
+def page_names(username):
+    """Menu entries visible to a user, in menu order"""
+    return [name for name in PAGES if name not in ADMIN_PAGES or username == "admin"]
+
+
+def load_page(name):
+    """The module rendering a page; each module exposes render(app)"""
+    return importlib.import_module(PAGES[name][0])
+
+
+def render_page(name, app):
+    load_page(name).render(app)
@@ -0,0 +1,270 @@
+# views/admin.py
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from utils.cohort import CohortAnalytics, DIMENSIONS
+from utils.snapshots import AssessmentSnapshot
+from database import get_analytics_db, get_replica
+from utils.precompute import get_precomputer, precomputed
+from anomalies import LAB_LABELS
+
+
+@st.cache_resource
+def get_cohort_analytics(database_key, _database):
+    # Shared across sessions and reruns; refresh() only reads rows past the last watermark.
+    # Keyed on the database, so a set_db() replacement starts fresh counts
+    return CohortAnalytics(_database)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def snapshot_distribution(snapshot_dir, version):
+    # Keyed on the snapshot's version, which every run that writes or rebuilds it changes
+    return AssessmentSnapshot(snapshot_dir).diagnosis_distribution()
+
+
+def render(app):
+    st.markdown('<div class="admin-header">Admin Dashboard</div>', unsafe_allow_html=True)
+    
+    # Published by the precompute scheduler; recomputed when the underlying tables change
+    data = precomputed('analytics') or get_analytics_db().get_analytics()
+    replica_status()
+
+    # 4 Big Metric Cards
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f"""
+        <div class='metric-card'>
+            <div class='metric-value'>{data['total_users']}</div>
+            <div class='metric-label'>Total Users</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class='metric-card'>
+            <div class='metric-value'>{data['total_assessments']}</div>
+            <div class='metric-label'>Total Assessments</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class='metric-card'>
+            <div class='metric-value'>{data['total_logins']}</div>
+            <div class='metric-label'>Total Logins</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class='metric-card'>
+            <div class='metric-value'>{data['active_users']}</div>
+            <div class='metric-label'>Active Users (30 days)</div>
+         </div>
+        """, unsafe_allow_html=True)
+
+
+    # User Growth Chart
+    st.subheader("User Growth Over Time")
+    if data['users_growth']:
+        df_growth = pd.DataFrame(data['users_growth'])
+        if not df_growth.empty:
+            df_growth['date'] = pd.to_datetime(df_growth['date'])
+            # Sort by date to ensure correct order
+            df_growth = df_growth.sort_values('date')
+
+            fig = px.line(
+                df_growth,
+                x='date',
+                y='count',
+                title='User Growth Over Time',
+                markers=True,                  # shows small circles on line
+            )
+
+            # Customize layout
+            fig.update_layout(
+                xaxis_title="Date",
+                yaxis_title="Users",
+                hovermode="x unified",        
+                template="plotly_white"
+            )
+
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No new users registered yet.")
+
+    active_users_section(data)
+
+    # Diagnosis Pie Chart
+    st.subheader("Diagnosis Distribution")
+    feminine_colors = ['#e91e63', '#2196f3', '#4caf50', '#ff9800', '#9c27b0', '#00bcd4']
+
+    # Prefer the columnar snapshot so the pie never scans the live table
+    snapshot = AssessmentSnapshot()
+    if snapshot.has_data():
+        distribution = snapshot_distribution(snapshot.snapshot_dir, snapshot.version())
+    else:
+        distribution = data['assessment_distribution']
+
+    if distribution:
+        df_pie = pd.DataFrame(distribution)
+        if not df_pie.empty and 'disease' in df_pie.columns and 'count' in df_pie.columns:
+            fig = px.pie(
+                df_pie,
+                values='count',
+                names='disease',
+                color_discrete_sequence=feminine_colors   
+            )
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No assessments recorded yet.")
+
+    # Tabs: All Users, Recent Activity & Cohorts
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["All Registered Users", "Recent Assessments", "Cohort Analytics",
+                                            "Background Jobs", "Lab Alerts"])
+
+    with tab1:
+        if data['all_users']:
+            df_users = pd.DataFrame(data['all_users'])
+            if not df_users.empty:
+                st.dataframe(df_users, use_container_width=True, hide_index=True)
+            else:
+                st.write("No users found.")
+        else:
+            st.write("No users found.")
+
+    with tab2:
+        if data['recent_assessments']:
+            df_assess = pd.DataFrame(data['recent_assessments'])
+            if not df_assess.empty:
+                st.dataframe(df_assess, use_container_width=True, hide_index=True)
+            else:
+                st.write("No recent assessments.")
+        else:
+            st.write("No recent assessments.")
+
+    with tab3:
+        cohort_analytics_tab()
+
+    with tab4:
+        precompute_jobs_tab()
+
+    with tab5:
+        lab_alerts_tab()
+
+
+@st.fragment
+def cohort_analytics_tab():
+    analytics_db = get_analytics_db()
+    cohort = get_cohort_analytics(id(analytics_db), analytics_db)
+    cohort.refresh()
+
+    if not cohort.total:
+        st.write("No assessments recorded yet.")
+        return
+
+    st.caption(f"Based on {cohort.total} assessment(s)")
+    risk_colors = {'Low': '#4caf50', 'Medium': '#ff9800', 'High': '#f44336'}
+
+    dimension = st.selectbox("Break down risk by", list(DIMENSIONS))
+    shares = cohort.risk_distribution(dimension, normalize=True) * 100
+    df_shares = shares.reset_index().melt(id_vars=dimension, var_name='Overall Risk', value_name='Share (%)')
+    fig = px.bar(
+        df_shares,
+        x=dimension,
+        y='Share (%)',
+        color='Overall Risk',
+        color_discrete_map=risk_colors,
+        title=f'Overall Risk by {dimension}'
+    )
+    fig.update_layout(template="plotly_white", yaxis=dict(range=[0, 100]))
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(cohort.risk_distribution(dimension), use_container_width=True)
+
+    st.subheader("Symptom Prevalence by Diagnosis")
+    prevalence = cohort.symptom_prevalence() * 100
+    fig = px.imshow(
+        prevalence,
+        text_auto='.0f',
+        aspect='auto',
+        color_continuous_scale='RdPu',
+        labels=dict(color='% of assessments')
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def active_users_section(data):
+    st.subheader("Active Users")
+    # Estimated from daily HyperLogLog sketches; the audit toggle recounts login rows
+    windows = data.get('active_users_by_window', {})
+    for col, (days, count) in zip(st.columns(len(windows) or 1), windows.items()):
+        col.metric(f"{days}-day actives", f"~{count:,}")
+
+    if data.get('daily_active_users'):
+        df_daily = pd.DataFrame(data['daily_active_users'])
+        df_daily['date'] = pd.to_datetime(df_daily['date'])
+        fig = px.bar(df_daily, x='date', y='count', title='Daily Active Users (last 30 days)')
+        fig.update_layout(xaxis_title="Date", yaxis_title="Distinct users", template="plotly_white")
+        st.plotly_chart(fig, use_container_width=True)
+
+    if st.checkbox("Audit with exact counts"):
+        db = get_analytics_db()
+        st.dataframe(pd.DataFrame([
+            {'Window (days)': days, 'Estimated': count, 'Exact': db.get_active_users(days, exact=True)}
+            for days, count in windows.items()
+        ]), use_container_width=True, hide_index=True)
+    st.caption("Counts are HyperLogLog estimates, typically within 1% of the exact value.")
+
+
+def replica_status():
+    replica = get_replica()
+    if not replica:
+        return
+
+    staleness = replica.staleness()
+    if staleness is None:
+        st.warning("Analytics replica has not been refreshed yet")
+        return
+    age = f"{staleness:.0f} s" if staleness < 120 else f"{staleness / 60:.0f} min"
+    message = f"Analytics read from a replica refreshed {age} ago"
+    if replica.interval and staleness > 3 * replica.interval:
+        st.warning(message + " — the refresher may have stopped")
+    else:
+        st.caption(message)
+
+
+def precompute_jobs_tab():
+    df_jobs = pd.DataFrame(get_precomputer().stats())
+    df_jobs['last_refresh'] = pd.to_datetime(df_jobs['last_refresh'], unit='s', utc=True)
+    st.dataframe(
+        df_jobs.rename(columns={
+            'job': 'Job', 'runs': 'Runs', 'errors': 'Errors', 'last_refresh': 'Last Refresh (UTC)',
+            'last_ms': 'Last Run (ms)', 'mean_ms': 'Mean Run (ms)', 'refresh': 'Refreshes', 'last_error': 'Last Error'
+        }),
+        use_container_width=True, hide_index=True,
+        column_config={'Last Run (ms)': st.column_config.NumberColumn(format="%.1f"),
+                       'Mean Run (ms)': st.column_config.NumberColumn(format="%.1f")}
+    )
+    st.caption("Derived data is recomputed in the background; pages read the last published result.")
+
+
+def lab_alerts_tab():
+    anomalies = get_analytics_db().get_recent_anomalies(100)
+    if not anomalies:
+        st.write("No sharp lab-value changes flagged yet.")
+        return
+
+    df_alerts = pd.DataFrame(anomalies)
+    df_alerts['metric'] = df_alerts['metric'].map(LAB_LABELS).fillna(df_alerts['metric'])
+    st.dataframe(
+        df_alerts[['created_at', 'username', 'metric', 'previous', 'value', 'change', 'expected', 'zscore', 'assessment_id']]
+        .rename(columns={'created_at': 'Flagged At', 'username': 'Username', 'metric': 'Lab Value',
+                         'previous': 'Previous', 'value': 'New', 'change': 'Change', 'expected': 'Usual (EWMA)',
+                         'zscore': 'Z-Score', 'assessment_id': 'Assessment'}),
+        use_container_width=True, hide_index=True,
+        column_config={'Usual (EWMA)': st.column_config.NumberColumn(format="%.1f"),
+                       'Z-Score': st.column_config.NumberColumn(format="%.1f")}
+    )
+    st.caption("Flagged when an assessment is saved: a change beyond the lab value's minimum that is also "
+               "3+ standard deviations from the user's usual level.")
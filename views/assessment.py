@@ -0,0 +1,110 @@
+# views/assessment.py
+import streamlit as st
+from utils.assessment import build_assessment
+from utils.session_cache import get_assessment
+from views.results import display_previous_results, display_results
+
+
+def render(app):
+    st.markdown('<div class="main-header">Health Risk Assessment</div>', unsafe_allow_html=True)
+    
+    st.info("🔍 Compare your results with normal ranges in the 'Reference Ranges' section for better understanding.")
+    
+    # Quick reference cards
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("""
+        <div style='background: #e8f5e9; padding: 15px; border-radius: 10px; border-left: 4px solid #4caf50;'>
+            <h4 style='color: #2e7d32; margin: 0;'>BMI Range</h4>
+            <p style='color: #555; margin: 5px 0 0 0;'>Normal: 18.5 - 24.9</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+        <div style='background: #e3f2fd; padding: 15px; border-radius: 10px; border-left: 4px solid #2196f3;'>
+            <h4 style='color: #1565c0; margin: 0;'>TSH Range</h4>
+            <p style='color: #555; margin: 5px 0 0 0;'>Normal: 0.4 - 4.0 mIU/L</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown("""
+        <div style='background: #fff3e0; padding: 15px; border-radius: 10px; border-left: 4px solid #ff9800;'>
+            <h4 style='color: #ef6c00; margin: 0;'>Sugar Range</h4>
+            <p style='color: #555; margin: 5px 0 0 0;'>Normal: 70 - 100 mg/dL</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    form_data = st.session_state.form_data
+    
+    with st.form("health_assessment", clear_on_submit=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Personal Information")
+            name = st.text_input("Full Name", value=form_data['name'] or st.session_state.current_user)
+            age = st.number_input("Age", min_value=10, max_value=100, value=form_data['age'])
+            bmi = st.number_input("BMI", min_value=10.0, max_value=50.0, value=form_data['bmi'], step=0.1)
+            tsh_level = st.number_input("TSH Level (mIU/L)", min_value=0.0, max_value=10.0, value=form_data['tsh_level'], step=0.1)
+            blood_sugar = st.number_input("Blood Sugar (mg/dL)", min_value=50, max_value=300, value=form_data['blood_sugar'])
+        
+        with col2:
+            st.subheader("Symptoms")
+            irregular_periods = st.checkbox("Irregular Periods", value=form_data['irregular_periods'])
+            excess_hair_growth = st.checkbox("Excess Hair Growth", value=form_data['excess_hair_growth'])
+            acne = st.checkbox("Acne", value=form_data['acne'])
+            tiredness = st.checkbox("Tiredness/Fatigue", value=form_data['tiredness'])
+            hair_fall = st.checkbox("Hair Fall", value=form_data['hair_fall'])
+            frequent_urination = st.checkbox("Frequent Urination", value=form_data['frequent_urination'])
+            
+            st.subheader("Family History")
+            family_diabetes = st.checkbox("Family History of Diabetes", value=form_data['family_diabetes'])
+        
+        submitted = st.form_submit_button("Assess My Health", type="primary")
+        
+        if submitted:
+            st.session_state.form_data = {
+                'name': name, 'age': age, 'bmi': bmi, 'tsh_level': tsh_level, 'blood_sugar': blood_sugar,
+                'irregular_periods': irregular_periods, 'excess_hair_growth': excess_hair_growth, 'acne': acne,
+                'tiredness': tiredness, 'hair_fall': hair_fall, 'frequent_urination': frequent_urination,
+                'family_diabetes': family_diabetes
+            }
+            
+            process_assessment(app, name, age, bmi, tsh_level, blood_sugar, irregular_periods, 
+                                  excess_hair_growth, acne, tiredness, hair_fall, frequent_urination, 
+                                  family_diabetes)
+    
+    last_assessment = get_assessment(st.session_state.last_assessment)
+    if last_assessment:
+        st.markdown("---")
+        st.subheader("Last Assessment Results")
+        display_previous_results(last_assessment)
+
+
+def process_assessment(app, name, age, bmi, tsh_level, blood_sugar, 
+                      irregular_periods, excess_hair_growth, acne, tiredness,
+                      hair_fall, frequent_urination, family_diabetes):
+    
+    with st.spinner("Analyzing your health data..."):
+        input_data = {
+            'Age': age, 'BMI': bmi, 'Irregular_Periods': int(irregular_periods),
+            'Excess_Hair_Growth': int(excess_hair_growth), 'Acne': int(acne),
+            'TSH_Level': tsh_level, 'Tiredness': int(tiredness), 'Hair_Fall': int(hair_fall),
+            'Blood_Sugar': blood_sugar, 'Frequent_Urination': int(frequent_urination),
+            'Family_Diabetes': int(family_diabetes)
+        }
+        
+        predictions = app.predictor.predict(input_data)
+        
+        assessment_data = build_assessment(name, input_data, predictions)
+        
+        assessment_id, created = app.db.save_assessment(st.session_state.current_user, assessment_data)
+        if assessment_id:
+            st.session_state.last_assessment = assessment_id
+        # A resubmission resolves to the assessment already in the history
+        if created:
+            st.session_state.assessment_history.append(assessment_id)
+        
+        display_results(predictions, name, input_data)
@@ -0,0 +1,152 @@
+# views/bmi_calculator.py
+import streamlit as st
+import plotly.graph_objects as go
+
+
+def render(app):
+    st.markdown('<div class="main-header">BMI Calculator</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("""
+        <div class="bmi-calculator-card">
+            <h3 style="color:#0d47a1;margin:0">BMI Calculator</h3>
+            <p>Calculate your Body Mass Index (BMI) to understand your weight category and health risks.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        bmi_calculator()
+    
+    with col2:
+        st.markdown("""
+        <div style="background:#e8f5e9;padding:20px;border-radius:12px;border-left:6px solid #4caf50;margin:15px 0;">
+            <h3 style="color:#2e7d32;margin:0;">BMI Reference Chart</h3>
+            <ul style="color:#1b5e20;">
+                <li><strong>&lt; 18.5</strong> → Underweight</li>
+                <li><strong>18.5 – 24.9</strong> → Normal</li>
+                <li><strong>25 – 29.9</strong> → Overweight</li>
+                <li><strong>≥ 30</strong> → Obese</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("""
+        <div class="health-implications-card">
+            <h4 style="color:#e65100;margin:0;">Health Implications</h4>
+            <p><strong>High BMI (≥25) may increase risk of:</strong></p>
+            <ul>
+                <li>Heart disease</li>
+                <li>Type 2 Diabetes</li>
+                <li>High blood pressure</li>
+                <li>Stroke</li>
+                <li>Certain cancers</li>
+                <li>Sleep apnea</li>
+            </ul>
+            <p><strong>Low BMI (&lt;18.5) may indicate:</strong></p>
+            <ul>
+                <li>Nutritional deficiencies</li>
+                <li>Weakened immune system</li>
+                <li>Osteoporosis risk</li>
+                <li>Anemia</li>
+                <li>Irregular periods</li>
+            </ul>
+            <p><em>Note: BMI is a screening tool. Consult a healthcare provider for personalized assessment.</em></p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+@st.fragment
+def bmi_calculator():
+    # Form submits and "Calculate New BMI" rerun only this fragment
+    if 'bmi_calc_done' not in st.session_state:
+        st.session_state.bmi_calc_done = False
+    
+    with st.form("bmi_calculator"):
+        st.subheader("Calculate Your BMI")
+        
+        col_a, col_b = st.columns(2)
+        
+        with col_a:
+            height_cm = st.number_input("Height (cm)", min_value=100.0, max_value=250.0, value=165.0, step=0.1, key="height_cm")
+        
+        with col_b:
+            weight_kg = st.number_input("Weight (kg)", min_value=30.0, max_value=200.0, value=60.0, step=0.1, key="weight_kg")
+        
+        calculate_bmi = st.form_submit_button("Calculate BMI", type="primary", use_container_width=True)
+        
+        if calculate_bmi:
+            height_m = height_cm / 100
+            bmi = weight_kg / (height_m ** 2)
+            
+            if bmi < 18.5:
+                category = "Underweight"
+                color = "#2196f3"
+                advice = "Consider consulting a nutritionist for healthy weight gain"
+            elif bmi < 25:
+                category = "Normal weight"
+                color = "#4caf50"
+                advice = "Maintain your healthy lifestyle with balanced diet and exercise"
+            elif bmi < 30:
+                category = "Overweight"
+                color = "#ff9800"
+                advice = "Consider lifestyle modifications for weight management"
+            else:
+                category = "Obese"
+                color = "#f44336"
+                advice = "Consult healthcare provider for comprehensive weight management"
+            
+            st.session_state.bmi_result = bmi
+            st.session_state.bmi_category = category
+            st.session_state.bmi_color = color
+            st.session_state.bmi_advice = advice
+            st.session_state.bmi_calc_done = True
+    
+    if st.session_state.bmi_calc_done and st.session_state.bmi_result is not None:
+        bmi = st.session_state.bmi_result
+        category = st.session_state.bmi_category
+        color = st.session_state.bmi_color
+        advice = st.session_state.bmi_advice
+        
+        st.markdown("---")
+        st.success(f"**Your BMI Result: {bmi:.1f}**")
+        st.markdown(f"""
+        <div style='background-color: {color}20; padding: 20px; border-radius: 10px; border-left: 5px solid {color}; margin: 15px 0;'>
+            <h4 style='color: {color}; margin: 0 0 10px 0;'>Category: {category}</h4>
+            <p style='color: #555; margin: 0;'>{advice}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # BMI Gauge
+        fig = go.Figure(go.Indicator(
+            mode = "gauge+number",
+            value = bmi,
+            domain = {'x': [0, 1], 'y': [0, 1]},
+            title = {'text': "BMI Score", 'font': {'size': 24}},
+            gauge = {
+                'axis': {'range': [None, 40], 'tickwidth': 1, 'tickcolor': "darkblue"},
+                'bar': {'color': color, 'thickness': 0.8},
+                'bgcolor': "white",
+                'borderwidth': 2,
+                'bordercolor': "gray",
+                'steps': [
+                    {'range': [0, 18.5], 'color': "#e3f2fd"},
+                    {'range': [18.5, 25], 'color': "#e8f5e9"},
+                    {'range': [25, 30], 'color': "#fff3e0"},
+                    {'range': [30, 40], 'color': "#ffebee"}
+                ],
+                'threshold': {
+                    'line': {'color': color, 'width': 4},
+                    'thickness': 0.75,
+                    'value': bmi
+                }
+            }
+        ))
+        fig.update_layout(height=300, margin=dict(l=20, r=20, t=50, b=20))
+        st.plotly_chart(fig, use_container_width=True)
+        
+        if st.button("Calculate New BMI", type="secondary"):
+            st.session_state.bmi_calc_done = False
+            st.session_state.bmi_result = None
+            st.session_state.bmi_category = None
+            st.rerun(scope="fragment")
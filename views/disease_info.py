@@ -0,0 +1,104 @@
+# views/disease_info.py
+import textwrap
+import streamlit as st
+
+# (tab, symptoms card, management card) for each condition
+CONDITIONS = [
+    ("PCOS",
+     """
+     <div style='background: #f3e5f5; padding: 20px; border-radius: 10px; border-left: 4px solid #9c27b0;'>
+     <h3 style='color: #7b1fa2;'>Symptoms</h3>
+     <ul style='color: #555;'>
+     <li>Irregular menstrual cycles</li>
+     <li>Excess hair growth</li>
+     <li>Acne and oily skin</li>
+     <li>Weight gain</li>
+     <li>Difficulty getting pregnant</li>
+     <li>Hair loss from head</li>
+     <li>Darkening of skin</li>
+     </ul>
+     </div>
+     """,
+     """
+     <div style='background: #e8f5e8; padding: 20px; border-radius: 10px; border-left: 4px solid #4caf50;'>
+     <h3 style='color: #2e7d32;'>Management</h3>
+     <ul style='color: #555;'>
+     <li>Lifestyle changes (diet & exercise)</li>
+     <li>Medications to regulate periods</li>
+     <li>Fertility treatments if needed</li>
+     <li>Anti-androgen medications</li>
+     <li>Regular monitoring</li>
+     </ul>
+     </div>
+     """),
+    ("Thyroid Disorders",
+     """
+     <div style='background: #e3f2fd; padding: 20px; border-radius: 10px; border-left: 4px solid #2196f3;'>
+     <h3 style='color: #1565c0;'>Symptoms (Hypothyroidism)</h3>
+     <ul style='color: #555;'>
+     <li>Fatigue and weakness</li>
+     <li>Weight gain</li>
+     <li>Depression</li>
+     <li>Hair loss</li>
+     <li>Cold intolerance</li>
+     <li>Constipation</li>
+     </ul>
+     </div>
+     """,
+     """
+     <div style='background: #fff3e0; padding: 20px; border-radius: 10px; border-left: 4px solid #ff9800;'>
+     <h3 style='color: #ef6c00;'>Management</h3>
+     <ul style='color: #555;'>
+     <li>Thyroid hormone replacement</li>
+     <li>Regular TSH monitoring</li>
+     <li>Balanced diet with iodine</li>
+     <li>Stress management</li>
+     <li>Regular exercise</li>
+     </ul>
+     </div>
+     """),
+    ("Diabetes",
+     """
+     <div style='background: #ffebee; padding: 20px; border-radius: 10px; border-left: 4px solid #f44336;'>
+     <h3 style='color: #c62828;'>Symptoms</h3>
+     <ul style='color: #555;'>
+     <li>Increased thirst and hunger</li>
+     <li>Frequent urination</li>
+     <li>Unexplained weight loss</li>
+     <li>Fatigue</li>
+     <li>Blurred vision</li>
+     <li>Slow healing wounds</li>
+     </ul>
+     </div>
+     """,
+     """
+     <div style='background: #e8f5e9; padding: 20px; border-radius: 10px; border-left: 4px solid #4caf50;'>
+     <h3 style='color: #2e7d32;'>Management</h3>
+     <ul style='color: #555;'>
+     <li>Blood sugar monitoring</li>
+     <li>Healthy diet</li>
+     <li>Regular exercise</li>
+     <li>Medications/Insulin</li>
+     <li>Regular check-ups</li>
+     <li>Foot care</li>
+     </ul>
+     </div>
+     """),
+]
+
+# Each tab's two cards side by side, prebuilt once per process
+TWO_COLUMNS = "<div style='display: flex; gap: 1rem; flex-wrap: wrap;'>{}</div>"
+COLUMN = "<div style='flex: 1 1 300px;'>{}</div>"
+CONDITION_HTML = {
+    tab: TWO_COLUMNS.format("".join(COLUMN.format(textwrap.dedent(card).strip()) for card in cards))
+    for tab, *cards in CONDITIONS
+}
+
+
+def render(app):
+    st.markdown('<div class="main-header">Women\'s Health Information</div>', unsafe_allow_html=True)
+
+    tabs = st.tabs([tab for tab, _, _ in CONDITIONS])
+    for tab, (name, _, _) in zip(tabs, CONDITIONS):
+        with tab:
+            st.markdown(CONDITION_HTML[name], unsafe_allow_html=True)
@@ -0,0 +1,68 @@
+# views/doctors.py
+import streamlit as st
+from utils.session_cache import get_doctor_directory, get_doctors_by_ids
+from utils.precompute import precomputed
+
+
+def render(app):
+    st.markdown('<div class="main-header">Find Specialists & Hospitals</div>', unsafe_allow_html=True)
+    st.info("👨‍⚕️ Search for doctors by specialty and location. Our database includes specialists across India.")
+    
+    all_specialties = ['All'] + (precomputed('specialties') or [])
+    all_locations = ['All'] + (precomputed('locations') or [])
+    
+    doctor_search(app, all_specialties, all_locations)
+
+
+@st.fragment
+def doctor_search(app, all_specialties, all_locations):
+    # Filter changes and searches rerun only the results, not the page
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        specialty = st.selectbox("Specialty", all_specialties, index=0)
+    
+    with col2:
+        location = st.selectbox("Location", all_locations, index=0)
+    
+    with col3:
+        st.write("")
+        st.write("")
+        search_btn = st.button("Search Doctors", type="primary", use_container_width=True)
+    
+    if search_btn:
+        doctors_data = app.db.get_doctors_by_specialty(
+            specialty if specialty != 'All' else None, 
+            location if location != 'All' else None
+        )
+        st.session_state.doctors = [doctor['id'] for doctor in doctors_data]
+        
+        if doctors_data:
+            st.success(f"✅ Found {len(doctors_data)} doctor(s) matching your criteria")
+        else:
+            st.warning("⚠️ No doctors found matching your criteria. Try adjusting your filters.")
+    
+    # Always show some doctors initially or after search
+    doctors_to_display = get_doctors_by_ids(st.session_state.doctors) if st.session_state.doctors else get_doctor_directory()
+    
+    if doctors_to_display:
+        st.subheader(f"Available Doctors ({len(doctors_to_display)})")
+        
+        for doctor in doctors_to_display[:20]:  # Limit to 20 for display
+            # Directories loaded before unrated doctors were skipped can hold NULL ratings
+            rating = doctor['rating']
+            rating_color = ("#9e9e9e" if rating is None else "#4caf50" if rating >= 4.5
+                            else "#ff9800" if rating >= 4.0 else "#f44336")
+            rating_text = "Not rated" if rating is None else f"{rating}/5 ⭐"
+            
+            st.markdown(f"""
+            <div class="doctor-card">
+                <h4 style="color: #e91e63; margin-bottom: 10px;">{doctor['name']}</h4>
+                <p><strong>Specialty:</strong> {doctor['specialty']}</p>
+                <p><strong>Hospital:</strong> {doctor['hospital']}, {doctor['location']}</p>
+                <p><strong>Rating:</strong> <span style='color: {rating_color}; font-weight: bold;'>{rating_text}</span></p>
+                <p><strong>Contact:</strong> {doctor['contact']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("👆 Use the filters above to search for doctors")
@@ -0,0 +1,55 @@
+# views/history.py
+import streamlit as st
+import pandas as pd
+from records import ASSESSMENT_COLUMNS
+from anomalies import describe
+from views.results import display_results
+
+
+def render(app):
+    st.markdown('<div class="main-header">Your Health History</div>', unsafe_allow_html=True)
+    
+    assessments = app.db.get_user_assessments(st.session_state.current_user)
+    
+    if assessments:
+        st.success(f"You have {len(assessments)} assessment(s) in your history")
+        export = pd.DataFrame.from_records(assessments, columns=ASSESSMENT_COLUMNS)
+        st.download_button("Download History (CSV)", export.to_csv(index=False),
+                           file_name="assessment_history.csv", mime="text/csv")
+        # Flagged when each assessment was saved, so this is one indexed read
+        anomalies = app.db.get_user_anomalies(st.session_state.current_user)
+        if anomalies:
+            st.warning(f"{sum(len(flags) for flags in anomalies.values())} sharp lab-value change(s) flagged "
+                       "in your history. Consider discussing them with a doctor.")
+        for i, assessment in enumerate(assessments):
+            history_item(i, assessment, anomalies.get(assessment.id, []))
+    else:
+        st.info("No assessment history found. Complete a health assessment to see your history here.")
+
+
+@st.fragment
+def history_item(i, assessment, anomalies):
+    # "View Full Report" reruns just this item instead of reloading the history
+    flag = " ⚠️" if anomalies else ""
+    with st.expander(f"Assessment {i+1} - {assessment.timestamp}{flag}", expanded=i==0):
+        for anomaly in anomalies:
+            st.warning(f"Sharp change: {describe(anomaly)}")
+
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write(f"**Name:** {assessment.name}")
+            st.write(f"**Date:** {assessment.timestamp}")
+            st.write(f"**Overall Risk:** {assessment.overall_risk}")
+            st.write(f"**Primary Diagnosis:** {assessment.primary_disease}")
+            st.write(f"**Confidence:** {assessment.confidence:.1f}%")
+        
+        with col2:
+            risks = assessment.predictions
+            st.write("**Risk Breakdown:**")
+            st.write(f"- PCOS: {risks.get('pcos_risk', 0)*100:.1f}%")
+            st.write(f"- Thyroid: {risks.get('thyroid_risk', 0)*100:.1f}%")
+            st.write(f"- Diabetes: {risks.get('diabetes_risk', 0)*100:.1f}%")
+        
+        if st.button(f"View Full Report", key=f"view_{i}"):
+            display_results(assessment.predictions, assessment.name, assessment.input_data)
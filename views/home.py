@@ -0,0 +1,48 @@
+# views/home.py
+import streamlit as st
+
+
+def render(app):
+    st.markdown('<div class="main-header">Medwise-Women</div>', unsafe_allow_html=True)
+    st.markdown('<div class="sub-header">Patient Health & Hospital Recommendation System</div>', unsafe_allow_html=True)
+    st.markdown('<div class="tagline">Empowering Women\'s Health Through AI</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("""
+        ### Welcome to Your Personal Health Companion
+        
+        Medwise-Women helps you assess your risk for common women's health conditions 
+        and connects you with the right specialists for your needs.
+        
+        **Key Features:**
+        - AI-powered health risk assessment
+        - BMI Calculator & Health Metrics
+        - Personalized doctor recommendations
+        - Prevention tips and exercises
+        - Health history tracking
+        - Condition-specific guidance
+        """)
+        
+        st.markdown("---")
+        st.info(" **Get Started**: Use the sidebar navigation on the left to access Health Assessment and other features!")
+    
+    with col2:
+        st.markdown("""
+        <div style='background: #e8f5e9; padding: 20px; border-radius: 10px; margin-top: 20px;'>
+            <h4 style='color: #2e7d32; text-align: center;'>Health Stats</h4>
+            <p style='text-align: center; color: #555; margin: 0;'>
+                Regular health assessments can help in early detection and prevention of diseases.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("""
+        <div style='background: #e3f2fd; padding: 20px; border-radius: 10px; margin-top: 20px;'>
+            <h4 style='color: #1565c0; text-align: center;'>Why Choose Medwise?</h4>
+            <p style='text-align: center; color: #555; margin: 0;'>
+                Personalized • Accurate • Secure • Women-Focused
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
@@ -0,0 +1,47 @@
+# views/reference_ranges.py
+import textwrap
+import streamlit as st
+
+RANGE_CARDS = [
+    """
+    <div style="background:#e8f5e9;padding:20px;border-radius:12px;border-left:6px solid #4caf50;margin:15px 0;">
+        <h3 style="color:#2e7d32;margin:0;">BMI Categories</h3>
+        <ul style="color:#1b5e20;">
+            <li><strong>Underweight:</strong> &lt; 18.5</li>
+            <li><strong>Normal:</strong> 18.5 – 24.9</li>
+            <li><strong>Overweight:</strong> 25 – 29.9</li>
+            <li><strong>Obese:</strong> ≥ 30</li>
+        </ul>
+    </div>
+    """,
+    """
+    <div style="background:#fff3e0;padding:20px;border-radius:12px;border-left:6px solid #ff9800;margin:15px 0;">
+        <h3 style="color:#ef6c00;margin:0;">Blood Sugar (mg/dL)</h3>
+        <ul style="color:#e65100;">
+            <li><strong>Normal:</strong> 70 – 99</li>
+            <li><strong>Pre-diabetes:</strong> 100 – 125</li>
+            <li><strong>Diabetes:</strong> ≥ 126</li>
+        </ul>
+    </div>
+    """,
+    """
+    <div style="background:#e3f2fd;padding:20px;border-radius:12px;border-left:6px solid #2196f3;margin:15px 0;">
+        <h3 style="color:#1565c0;margin:0;">TSH Level (mIU/L)</h3>
+        <ul style="color:#0d47a1;">
+            <li><strong>Normal:</strong> 0.4 – 4.0</li>
+            <li><strong>Low:</strong> &lt; 0.4 → Hyperthyroidism</li>
+            <li><strong>High:</strong> &gt; 4.0 → Hypothyroidism</li>
+        </ul>
+    </div>
+    """,
+]
+
+# Static page: the cards are joined into one HTML string once per process
+# and sent as a single element instead of one per card
+REFERENCE_RANGES_HTML = "\n".join(textwrap.dedent(card).strip() for card in RANGE_CARDS)
+
+
+def render(app):
+    st.markdown('<div class="main-header">Reference Ranges</div>', unsafe_allow_html=True)
+    st.markdown("### Normal Health Parameter Ranges for Women")
+    st.markdown(REFERENCE_RANGES_HTML, unsafe_allow_html=True)
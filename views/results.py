@@ -0,0 +1,204 @@
+# views/results.py
+# Assessment result views shared by the assessment and history pages
+import streamlit as st
+import plotly.graph_objects as go
+from utils.assessment import calculate_overall_risk, get_disease_diagnosis, get_recommended_specialists
+from utils.session_cache import get_doctor_directory
+from utils.precompute import precomputed
+from sketches import population_percentiles
+
+
+@st.fragment
+def display_previous_results(assessment):
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write(f"**Name:** {assessment.name}")
+        st.write(f"**Date:** {assessment.timestamp}")
+        st.write(f"**Overall Risk:** {assessment.overall_risk}")
+    
+    with col2:
+        risks = assessment.predictions
+        st.write("**Risk Breakdown:**")
+        st.write(f"- PCOS: {risks.get('pcos_risk', 0)*100:.1f}%")
+        st.write(f"- Thyroid: {risks.get('thyroid_risk', 0)*100:.1f}%")
+        st.write(f"- Diabetes: {risks.get('diabetes_risk', 0)*100:.1f}%")
+    
+    if st.button("View Full Details"):
+        display_results(assessment.predictions, assessment.name, assessment.input_data)
+
+
+def display_results(predictions, name, input_data):
+    st.success("Assessment Complete!")
+    
+    overall_risk = calculate_overall_risk(predictions)
+    risk_class = "risk-high" if overall_risk == "High" else "risk-medium" if overall_risk == "Medium" else "risk-low"
+    
+    # Set text color based on risk level
+    if overall_risk == "High":
+        text_color = "#c62828"  # Dark red for high risk
+    elif overall_risk == "Medium":
+        text_color = "#ef6c00"  # Dark orange for medium risk
+    else:
+        text_color = "#2e7d32"  # Dark green for low risk
+
+
+    st.markdown(f"""
+    <div class="{risk_class}">
+        <h3 style = color:{text_color};margin:0;>Overall Health Risk: {overall_risk}</h3>
+        <p>Based on your inputs, we've assessed your risk for common women's health conditions.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    diagnosis = get_disease_diagnosis(predictions, input_data)
+    
+    st.subheader("Disease Diagnosis")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.info(f"""
+        **Most Likely Condition:** {diagnosis['primary_disease']}
+        **Confidence Level:** {diagnosis['confidence']:.1f}%
+        """)
+    
+    with col2:
+        st.info(f"""
+        **Key Symptoms Matched:**
+        {len(diagnosis['symptoms_matched'])} symptoms identified
+        """)
+    
+    st.subheader("Disease Risk Analysis")
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        diseases = ['PCOS', 'Thyroid', 'Diabetes']
+        risks = [
+            predictions.get('pcos_risk', 0) * 100,
+            predictions.get('thyroid_risk', 0) * 100,
+            predictions.get('diabetes_risk', 0) * 100
+        ]
+        
+        fig = go.Figure(data=[
+            go.Bar(name='Risk Level', x=diseases, y=risks, 
+                  marker_color=['#e91e63', '#ff9800', '#f44336'],
+                  text=[f'{risk:.1f}%' for risk in risks],
+                  textposition='auto')
+        ])
+        fig.update_layout(
+            title='Disease Risk Assessment',
+            yaxis_title='Risk Percentage (%)',
+            showlegend=False,
+            yaxis=dict(range=[0, 100])
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.write("**Risk Levels:**")
+        for disease, risk in zip(diseases, risks):
+            risk_level = "High" if risk > 60 else "Medium" if risk > 30 else "Low"
+            color = "🔴" if risk > 60 else "🟡" if risk > 30 else "🟢"
+            st.write(f"{color} **{disease}:** {risk:.1f}% ({risk_level})")
+    
+    show_percentiles(predictions, input_data)
+    show_explanation(input_data)
+    show_recommendations(predictions, diagnosis)
+
+
+PERCENTILE_LABELS = [
+    ('blood_sugar', 'Blood Sugar'), ('tsh_level', 'TSH Level'), ('bmi', 'BMI'),
+    ('pcos_risk', 'PCOS Risk'), ('thyroid_risk', 'Thyroid Risk'), ('diabetes_risk', 'Diabetes Risk'),
+]
+
+
+def ordinal(n):
+    suffix = 'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+
+def show_percentiles(predictions, input_data):
+    # Ranked against sketches kept current by the precompute scheduler, never a scan of history
+    sketches = precomputed('population_sketches') or {}
+    percentiles = population_percentiles(sketches, {'input_data': input_data, 'predictions': predictions})
+    if not percentiles:
+        return
+
+    st.subheader("How You Compare")
+    shown = [(metric, label) for metric, label in PERCENTILE_LABELS if metric in percentiles]
+    for col, (metric, label) in zip(st.columns(len(shown)), shown):
+        col.metric(label, f"{ordinal(round(percentiles[metric]))} pct")
+    population = max(sketches[metric].n for metric, _ in shown)
+    st.caption(f"Percentile among {population:,} assessments (higher means a higher value than most). "
+               "Estimated from quantile sketches, accurate to about ±2 percentile points.")
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def explain_inputs(inputs):
+    # Keyed on the input signature (sorted feature/value pairs)
+    from utils.model import HealthPredictor
+    from utils.explanations import explain_batch, top_factors
+    return top_factors(explain_batch(HealthPredictor(), [dict(inputs)]), 0)
+
+
+def show_explanation(input_data):
+    factors = explain_inputs(tuple(sorted(input_data.items())))
+    with st.expander("What drove these scores?"):
+        fig = go.Figure()
+        for disease, risk, color in [('PCOS', 'pcos_risk', '#e91e63'), ('Thyroid', 'thyroid_risk', '#ff9800'),
+                                     ('Diabetes', 'diabetes_risk', '#f44336')]:
+            fig.add_trace(go.Bar(
+                name=disease, orientation='h', marker_color=color,
+                y=[feature.replace('_', ' ') for feature, _ in factors[risk]],
+                x=[value * 100 for _, value in factors[risk]],
+                hovertemplate="%{y}: %{x:+.0f} points<extra>" + disease + "</extra>"
+            ))
+        fig.update_layout(barmode='group', xaxis_title='Contribution to risk (%)', height=350,
+                          template="plotly_white", yaxis=dict(autorange='reversed'))
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("Each bar is how many percentage points that input added to the risk score.")
+
+
+def show_recommendations(predictions, diagnosis):
+    st.markdown('<div class="sub-header">Personalized Recommendations</div>', unsafe_allow_html=True)
+    
+    specialists = get_recommended_specialists(predictions)
+    
+    if specialists:
+        st.subheader(" Recommended Specialists")
+        
+        for specialist in specialists:
+            priority_text = "High Priority" if specialist['priority'] == 1 else "Medium Priority"
+            color = "#e91e63" if specialist['priority'] == 1 else "#ff9800"
+            
+            st.markdown(f"""
+            <div style='background-color: {color}20; padding: 15px; border-radius: 10px; border-left: 5px solid {color}; margin: 10px 0;'>
+                <h4 style='color: {color}; margin: 0 0 5px 0;'>{specialist['specialty']} - {priority_text}</h4>
+                <p style='color: #555; margin: 0;'>{specialist['reason']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Show doctors from database
+    doctors = get_doctor_directory()
+    if doctors:
+        st.subheader("Available Doctors in Database")
+        
+        for doctor in doctors[:5]:
+            # Directories loaded before unrated doctors were skipped can hold NULL ratings
+            rating = doctor['rating']
+            rating_color = ("#9e9e9e" if rating is None else "#4caf50" if rating >= 4.5
+                            else "#ff9800" if rating >= 4.0 else "#f44336")
+            rating_text = "Not rated" if rating is None else f"{rating}/5 ⭐"
+            
+            st.markdown(f"""
+            <div class="doctor-card">
+                <h4 style="color: #e91e63; margin-bottom: 10px;">👩‍⚕️ {doctor['name']}</h4>
+                <p><strong>Specialty:</strong> {doctor['specialty']}</p>
+                <p><strong>Hospital:</strong> {doctor['hospital']}, {doctor['location']}</p>
+                <p><strong>Rating:</strong> <span style='color: {rating_color}; font-weight: bold;'>{rating_text}</span></p>
+                <p><strong>Contact:</strong> {doctor['contact']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.subheader("🎯 Specific Recommendations")
+    if diagnosis['recommendations']:
+        for rec in diagnosis['recommendations']:
+            st.write(f"• {rec}")
@@ -0,0 +1,125 @@
+# views/whatif.py
+import time
+import streamlit as st
+import plotly.graph_objects as go
+from utils.whatif import DISEASES, NUMERIC_AXES, RISK_LEVELS, SYMPTOMS, numeric_axis, symptom_axis, risk_surface
+
+OUTPUTS = {
+    'PCOS Risk': 'pcos_risk',
+    'Thyroid Risk': 'thyroid_risk',
+    'Diabetes Risk': 'diabetes_risk',
+    'Overall Risk': 'overall_risk',
+    'Primary Diagnosis': 'primary_disease',
+}
+CATEGORIES = {
+    'overall_risk': (RISK_LEVELS, ['#4caf50', '#ff9800', '#f44336']),
+    'primary_disease': (DISEASES, ['#e91e63', '#2196f3', '#ff9800']),
+}
+AXIS_LABELS = {'BMI': 'BMI', 'Blood_Sugar': 'Blood Sugar (mg/dL)', 'TSH_Level': 'TSH Level (mIU/L)', 'Age': 'Age'}
+SYMPTOMS_AXIS = 'Symptoms'
+
+
+def current_inputs():
+    """The user's latest assessment form values as model features"""
+    form_data = st.session_state.form_data
+    return {
+        'Age': form_data['age'], 'BMI': form_data['bmi'], 'TSH_Level': form_data['tsh_level'],
+        'Blood_Sugar': form_data['blood_sugar'],
+        'Irregular_Periods': int(form_data['irregular_periods']),
+        'Excess_Hair_Growth': int(form_data['excess_hair_growth']), 'Acne': int(form_data['acne']),
+        'Tiredness': int(form_data['tiredness']), 'Hair_Fall': int(form_data['hair_fall']),
+        'Frequent_Urination': int(form_data['frequent_urination']),
+        'Family_Diabetes': int(form_data['family_diabetes'])
+    }
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_surface(_predictor, inputs, x_feature, y_feature, symptoms, steps):
+    # Keyed on the input signature (sorted feature/value pairs plus the axis
+    # choices); _predictor is excluded from the key
+    x_axis = numeric_axis(x_feature, steps)
+    if y_feature == SYMPTOMS_AXIS:
+        y_axis, y_labels = symptom_axis(list(symptoms))
+    else:
+        y_axis = numeric_axis(y_feature, steps)
+        y_labels = y_axis[y_feature]
+
+    start = time.perf_counter()
+    surface = risk_surface(_predictor, dict(inputs), x_axis, y_axis)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return x_axis[x_feature], y_labels, surface, elapsed_ms
+
+
+def render(app):
+    st.markdown('<div class="main-header">What-If Explorer</div>', unsafe_allow_html=True)
+    st.info("See how changing one or two of your inputs would move your risks. "
+            "Everything else stays at the values from your last health assessment.")
+
+    explorer(app, current_inputs())
+
+
+@st.fragment
+def explorer(app, inputs):
+    # Control changes rerun only the explorer
+    numeric = list(NUMERIC_AXES)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        x_feature = st.selectbox("Horizontal axis", numeric, index=0, format_func=AXIS_LABELS.get)
+    with col2:
+        y_options = [feature for feature in numeric if feature != x_feature] + [SYMPTOMS_AXIS]
+        y_feature = st.selectbox("Vertical axis", y_options, index=0, format_func=lambda f: AXIS_LABELS.get(f, f))
+    with col3:
+        output = st.selectbox("Show", list(OUTPUTS))
+
+    symptoms = ()
+    if y_feature == SYMPTOMS_AXIS:
+        symptoms = tuple(st.multiselect(
+            "Symptoms to switch on and off", SYMPTOMS, default=['Tiredness', 'Hair_Fall', 'Acne'],
+            format_func=lambda name: name.replace('_', ' '), max_selections=5
+        ))
+        if not symptoms:
+            st.warning("Pick at least one symptom")
+            return
+    steps = st.slider("Grid resolution (points per axis)", 50, 400, 200, step=10)
+
+    x_values, y_values, surface, elapsed_ms = cached_surface(
+        app.predictor, tuple(sorted(inputs.items())), x_feature, y_feature, symptoms, steps
+    )
+    key = OUTPUTS[output]
+    cells = surface[key].size
+
+    if key in CATEGORIES:
+        labels, colors = CATEGORIES[key]
+        # Stepped colour scale so each category code gets a flat colour band
+        n = len(labels)
+        colorscale = [[bound / n, color] for i, color in enumerate(colors) for bound in (i, i + 1)]
+        heatmap = go.Heatmap(
+            z=surface[key], x=x_values, y=y_values, zmin=-0.5, zmax=n - 0.5, colorscale=colorscale,
+            colorbar=dict(tickvals=list(range(n)), ticktext=labels),
+            customdata=surface['confidence'],
+            hovertemplate="%{x:.1f}, %{y}<br>" + output + ": %{z}<br>Confidence: %{customdata:.0f}%<extra></extra>"
+        )
+    else:
+        heatmap = go.Heatmap(
+            z=surface[key] * 100, x=x_values, y=y_values, zmin=0, zmax=100, colorscale='RdPu',
+            colorbar=dict(title='%'),
+            hovertemplate="%{x:.1f}, %{y}<br>" + output + ": %{z:.0f}%<extra></extra>"
+        )
+
+    fig = go.Figure(heatmap)
+    if y_feature == SYMPTOMS_AXIS:
+        current_y = ", ".join(name.replace('_', ' ') for name in symptoms if inputs[name]) or "None"
+    else:
+        current_y = inputs[y_feature]
+    fig.add_trace(go.Scatter(
+        x=[inputs[x_feature]], y=[current_y], mode='markers', name='You',
+        marker=dict(symbol='x', size=14, color='black'), hovertemplate="Your current inputs<extra></extra>"
+    ))
+    fig.update_layout(
+        xaxis_title=AXIS_LABELS[x_feature],
+        yaxis_title=AXIS_LABELS.get(y_feature, y_feature),
+        height=550, template="plotly_white", showlegend=False
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{cells:,} scenarios evaluated in {elapsed_ms:.1f} ms")